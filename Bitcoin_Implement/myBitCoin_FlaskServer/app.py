@@ -1,16 +1,26 @@
-from flask import Flask, request, jsonify,render_template, render_template_string, redirect, url_for, session, flash
+from flask import Flask, request, jsonify,render_template, render_template_string, redirect, url_for, session, flash, Response, stream_with_context, g
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 import json
 import os
-from typing import Dict, List, Optional
+import atexit
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
 from functools import wraps
 
 # Bitcoin 클래스들 import (위에서 작성한 코드)
 from bitcoin_utxo import (
     Wallet, Transaction, Blockchain, UTXO, 
-    TransactionInput, TransactionOutput, UTXOPool
+    TransactionInput, TransactionOutput, UTXOPool, ParallelMiner, SignatureVerifier,
+    verification_cache, COIN_SELECTION_STRATEGIES, DEFAULT_COIN_SELECTION, check_wallet_keys
 )
+from mining_service import MiningService
+from key_pool import KeyPool
+from journal import Journal
+from chain_verifier import ChainVerifier
+from metrics import registry
+from sqlite_store import SQLiteStore, StoredWallets
 
 from datetime import datetime
 import base64
@@ -26,20 +36,77 @@ if secret_key_env is None:
     raise RuntimeError("SECRET_KEY environment variable is not set.")
 app.secret_key = secret_key_env
 
-# 전역 블록체인 인스턴스
-blockchain = Blockchain()
+# 저장소: json(기본, 단일 프로세스, 저널 + 체크포인트) 또는 sqlite(WAL, 여러 워커 프로세스가 공유)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'blockchain.db')
+if STORAGE_BACKEND not in ('json', 'sqlite'):
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+store = SQLiteStore(SQLITE_PATH) if STORAGE_BACKEND == 'sqlite' else None
+
+# 전역 블록체인 인스턴스 (MINING_WORKERS > 1 이면 병렬 작업 증명,
+# SIGNATURE_WORKERS > 1 이면 입력이 많은 트랜잭션의 서명 병렬 검증)
+MINING_WORKERS = int(os.environ.get('MINING_WORKERS', os.cpu_count() or 1))
+SIGNATURE_WORKERS = int(os.environ.get('SIGNATURE_WORKERS', os.cpu_count() or 1))
+# VERIFY_WALLETS=1 이면 시작 후 저장된 지갑 키를 백그라운드에서 검증
+VERIFY_WALLETS = os.environ.get('VERIFY_WALLETS') == '1'
+# VERIFY_CHAIN=1 이면 시작 후 체인 전체(연결, 작업 증명, UTXO 재생, 서명)를 백그라운드에서 검증
+VERIFY_CHAIN = os.environ.get('VERIFY_CHAIN') == '1'
+blockchain = Blockchain(miner=ParallelMiner(workers=MINING_WORKERS),
+                        verifier=SignatureVerifier(workers=SIGNATURE_WORKERS),
+                        store=store)
 
 # 지갑 저장소 (실제 운영에서는 데이터베이스 사용)
 wallets: Dict[str, Wallet] = {}
 
+# 미리 생성해 둔 지갑 키 (KEY_POOL_SIZE=0 이면 요청마다 생성, KEY_POOL_WORKERS > 1 이면 프로세스로 생성)
+KEY_POOL_SIZE = int(os.environ.get('KEY_POOL_SIZE', 100))
+KEY_POOL_WORKERS = int(os.environ.get('KEY_POOL_WORKERS', 1))
+key_pool = KeyPool(size=KEY_POOL_SIZE, workers=KEY_POOL_WORKERS)
+
+# /api/blockchain 페이지 크기
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+# /api/transaction/batch 제한 (요청당 수신자 수, 트랜잭션당 출력 수)
+MAX_BATCH_PAYMENTS = 1000
+MAX_BATCH_OUTPUTS = 100
+
 # 데이터 영속성을 위한 파일 경로
-BLOCKCHAIN_FILE = "blockchain_data.json"
+BLOCKCHAIN_FILE = "blockchain_data.json"  # 레거시 전체 저장 파일 (최초 실행 시 이전용)
 WALLETS_FILE = "wallets_data.json"
 USERS_FILE = "users.json"
+JOURNAL_FILE = "blockchain_journal.log"
+CHECKPOINT_FILE = "blockchain_checkpoint.json"
+CHAIN_VERIFY_PROGRESS_FILE = "chain_verify_progress.json"  # 중단된 체인 검증을 이어서 하기 위한 진행 상황
+
+# 블록/지갑 변경분만 추가 기록하는 저널 (주기적으로 체크포인트로 압축)
+journal = Journal(JOURNAL_FILE, CHECKPOINT_FILE)
+atexit.register(journal.close)
+
+# /metrics 지표 (요청 지연 시간, 저장 시간, 수집 시점에 계산하는 상태 크기)
+http_request_seconds = registry.histogram("bitcoin_http_request_seconds", "HTTP request latency in seconds",
+                                          ("method", "route", "status"))
+save_data_seconds = registry.histogram("bitcoin_save_data_seconds", "Checkpoint write time in seconds")
+registry.gauge("bitcoin_chain_height", "Number of blocks in the chain", lambda: len(blockchain.chain))
+registry.gauge("bitcoin_utxo_set_size", "Number of unspent outputs", lambda: len(blockchain.utxo_pool))
+registry.gauge("bitcoin_mempool_transactions", "Pending transactions", lambda: len(blockchain.pending_transactions))
+registry.gauge("bitcoin_mempool_bytes", "Serialized size of pending transactions",
+               lambda: blockchain.mempool.total_bytes)
+registry.gauge("bitcoin_wallets", "Registered wallets", lambda: len(wallets))
+registry.gauge("bitcoin_key_pool_size", "Pre-generated wallet keys ready", lambda: key_pool.stats()["size"])
+
+# 저널 추가/체크포인트 순서 보호 (블록은 높이 순서대로, 체크포인트와 겹치지 않게)
+persist_lock = threading.RLock()
+journaled_height = 0  # 저널/체크포인트에 기록된 마지막 블록 높이
 
 
 def load_users():
     """사용자 데이터 로드"""
+    if store is not None:
+        return store.load_users()
+    return _load_users_file()
+
+def _load_users_file():
     if os.path.exists(USERS_FILE):
         try:
             with open(USERS_FILE, 'r', encoding='utf-8') as f:
@@ -51,6 +118,11 @@ def load_users():
 
 def save_users(users):
     """사용자 데이터 저장"""
+    if store is not None:
+        # 다른 워커가 추가한 사용자를 덮어쓰지 않도록 행 단위로 추가
+        for user in users:
+            store.add_user(user['username'], user['hashed_password'])
+        return
     try:
         with open(USERS_FILE, 'w', encoding='utf-8') as f:
             json.dump(users, f, indent=2, ensure_ascii=False)
@@ -66,17 +138,52 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def load_data():
-    """서버 시작 시 데이터 로드"""
-    global blockchain, wallets
-    
+def _restore_wallet(address: str, entry) -> Wallet:
+    """저장된 키로 지갑 복원 (타원 곡선 연산 없이, 서명 키는 첫 서명 때 생성)"""
+    if isinstance(entry, str):
+        # 이전 형식: 개인키만 저장됨 (공개키는 처음 필요할 때 계산)
+        return Wallet.from_keys(entry, address=address)
+    return Wallet.from_keys(entry['private_key'], entry.get('public_key'), address)
+
+def _wallet_entry(wallet: Wallet) -> dict:
+    """저장용 지갑 항목 (개인키 + 공개키, 주소는 키로 사용)"""
+    return {'private_key': wallet.get_private_key_hex(), 'public_key': wallet.get_public_key_hex()}
+
+def _verify_wallets():
+    """저장된 공개키/주소가 개인키와 일치하는지 백그라운드에서 병렬 확인 (VERIFY_WALLETS=1)"""
+    start_time = time.perf_counter()
+    mismatched = check_wallet_keys(list(wallets.values()), workers=SIGNATURE_WORKERS)
+    elapsed = time.perf_counter() - start_time
+    if mismatched:
+        print(f"Wallet key mismatch for {len(mismatched)} wallets: {', '.join(mismatched[:10])}")
+    else:
+        print(f"Verified {len(wallets)} wallet keys in {elapsed:.2f}s")
+
+def _verify_chain():
+    """불러온 체인 전체를 백그라운드에서 검증 (VERIFY_CHAIN=1, 이전에 검증한 높이부터 이어서)"""
+    verifier = ChainVerifier(workers=SIGNATURE_WORKERS, progress_path=CHAIN_VERIFY_PROGRESS_FILE)
+    try:
+        reason = verifier.verify(blockchain.chain)
+    finally:
+        verifier.shutdown()
+    stats = verifier.last_stats
+    if reason is not None:
+        print(f"Chain verification failed: {reason}")
+    else:
+        print(f"Verified {stats['blocks']} blocks ({stats['signatures']} signatures) in {stats['elapsed']:.2f}s "
+              f"({stats['blocks_per_second']:.0f} blocks/s, resumed from {stats['resumed_from']})")
+
+if store is not None:
+    wallets = StoredWallets(store, _restore_wallet)
+
+def _load_legacy_data(target: Blockchain, target_wallets: dict):
+    """레거시 전체 저장 파일에서 데이터 로드"""
     # 블록체인 데이터 로드
     if os.path.exists(BLOCKCHAIN_FILE):
         try:
             with open(BLOCKCHAIN_FILE, 'r') as f:
                 data = json.load(f)
-                blockchain.chain = data.get('chain', [])
-                # UTXO 풀 재구성 (실제로는 더 복잡한 로직 필요)
+                target.chain = data.get('chain', [])
         except Exception as e:
             print(f"Failed to load blockchain data: {e}")
     
@@ -85,33 +192,164 @@ def load_data():
         try:
             with open(WALLETS_FILE, 'r') as f:
                 wallet_data = json.load(f)
-                for address, private_key_hex in wallet_data.items():
-                    wallet = Wallet()
-                    wallet.private_key = bytes.fromhex(private_key_hex)
-                    wallet.public_key = wallet._generate_public_key(wallet.private_key)
-                    wallet.address = wallet._generate_address(wallet.public_key)
-                    wallets[address] = wallet
+                for address, entry in wallet_data.items():
+                    target_wallets[address] = _restore_wallet(address, entry)
         except Exception as e:
             print(f"Failed to load wallet data: {e}")
 
+def _apply_event(event: dict, target: Blockchain, target_wallets: dict):
+    """저널 이벤트 재적용"""
+    if event["type"] == "block":
+        target.replay_block(event["block"])
+    elif event["type"] == "wallet":
+        target_wallets[event["address"]] = _restore_wallet(event["address"], event)
+
+def _load_files(target: Blockchain, target_wallets: dict) -> Tuple[bool, str, int]:
+    """체크포인트 + UTXO 스냅샷 + 저널 재생 (체크포인트 유무, UTXO 복원 방식, 저널 이벤트 수)"""
+    checkpoint, events = journal.recover()
+    
+    if checkpoint is None:
+        # 체크포인트가 없으면 레거시 파일에서 가져옴
+        _load_legacy_data(target, target_wallets)
+        snapshot = None
+    else:
+        target.chain = checkpoint.get('chain', [])
+        for address, entry in checkpoint.get('wallets', {}).items():
+            target_wallets[address] = _restore_wallet(address, entry)
+        snapshot = checkpoint.get('utxo_snapshot')
+    
+    # UTXO 풀: 스냅샷 이후 블록만 재생, 스냅샷이 없거나 맞지 않으면 블록 단위 전체 재구성
+    if snapshot is not None and target.load_utxo_snapshot(snapshot):
+        utxo_mode = f"snapshot@{snapshot['height']}"
+    else:
+        target.rebuild_utxo_pool()
+        utxo_mode = "full rebuild"
+    
+    for event in events:
+        _apply_event(event, target, target_wallets)
+    return checkpoint is not None, utxo_mode, len(events)
+
+def _migrate_to_store():
+    """SQLite 저장소를 처음 사용할 때 기존 파일 데이터를 한 번 가져옴 (여러 워커가 동시에 시작해도 한 번)"""
+    with blockchain.lock:
+        if store.get_meta('initialized'):
+            return
+        if os.path.exists(CHECKPOINT_FILE) or os.path.exists(BLOCKCHAIN_FILE):
+            source, source_wallets = Blockchain(), {}
+            _load_files(source, source_wallets)
+            if len(source.chain) > 0:
+                store.import_state(
+                    list(source.chain), list(source.utxo_pool.utxos.values()), source.tx_index,
+                    {address: _wallet_entry(wallet) for address, wallet in source_wallets.items()},
+                    _load_users_file()
+                )
+                print(f"Imported {len(source.chain)} blocks and {len(source_wallets)} wallets into {SQLITE_PATH}")
+        store.set_meta('initialized', '1')
+
+def load_data():
+    """서버 시작 시 데이터 로드 (체크포인트 + UTXO 스냅샷 + 저널 재생)"""
+    global journaled_height
+    start_time = time.perf_counter()
+    
+    if store is not None:
+        try:
+            _migrate_to_store()
+        except Exception as e:
+            print(f"Failed to initialize SQLite store: {e}")
+            return
+        print(f"Using SQLite store {SQLITE_PATH}: {len(blockchain.chain)} blocks, "
+              f"{len(wallets)} wallets (pid {os.getpid()})")
+    else:
+        try:
+            has_checkpoint, utxo_mode, event_count = _load_files(blockchain, wallets)
+        except Exception as e:
+            print(f"Failed to recover journal: {e}")
+            return
+        
+        journaled_height = len(blockchain.chain)
+        if not has_checkpoint:
+            save_data()
+        
+        elapsed = time.perf_counter() - start_time
+        print(f"Loaded {len(blockchain.chain)} blocks, {len(blockchain.utxo_pool.utxos)} UTXOs, "
+              f"{len(wallets)} wallets in {elapsed:.2f}s ({utxo_mode}, {event_count} journal events)")
+    
+    if VERIFY_WALLETS:
+        threading.Thread(target=_verify_wallets, daemon=True).start()
+    if VERIFY_CHAIN:
+        threading.Thread(target=_verify_chain, daemon=True).start()
+
 def save_data():
-    """데이터 저장"""
+    """전체 상태를 체크포인트로 압축 저장 (저널 초기화)"""
+    global journaled_height
+    if store is not None:
+        return  # SQLite 저장소는 변경할 때마다 바로 기록됨
     try:
-        # 블록체인 데이터 저장
-        with open(BLOCKCHAIN_FILE, 'w') as f:
-            json.dump({
-                'chain': blockchain.chain,
-                'utxos': {k: v.to_dict() for k, v in blockchain.utxo_pool.utxos.items()}
-            }, f, indent=2)
-        
-        # 지갑 데이터 저장
-        wallet_data = {address: wallet.get_private_key_hex() 
-                      for address, wallet in wallets.items()}
-        with open(WALLETS_FILE, 'w') as f:
-            json.dump(wallet_data, f, indent=2)
+        with persist_lock, save_data_seconds.time():
+            with blockchain.lock:
+                chain = list(blockchain.chain)
+                snapshot = blockchain.utxo_snapshot()
+            journal.write_checkpoint({
+                'chain': chain,
+                'utxo_snapshot': snapshot,
+                'wallets': {address: _wallet_entry(wallet)
+                            for address, wallet in list(wallets.items())}
+            })
+            journaled_height = len(chain)
     except Exception as e:
         print(f"Failed to save data: {e}")
 
+def record_event(event: dict):
+    """변경분을 저널에 추가 (일정 개수마다 체크포인트)"""
+    if store is not None:
+        return
+    with persist_lock:
+        try:
+            journal.append(event)
+        except Exception as e:
+            print(f"Failed to append journal: {e}")
+            return
+        if journal.should_checkpoint():
+            save_data()
+
+def record_block(block: dict):
+    """새 블록을 저널에 기록 (여러 스레드가 채굴해도 아직 기록되지 않은 블록을 높이 순서대로)"""
+    global journaled_height
+    if store is not None:
+        return
+    with persist_lock:
+        while journaled_height < len(blockchain.chain):
+            height = journaled_height + 1
+            record_event({'type': 'block', 'block': blockchain.get_block(height)})
+            # 체크포인트가 기록되었으면 journaled_height가 이미 체인 길이로 이동해 있음
+            journaled_height = max(journaled_height, height)
+
+# 백그라운드 채굴 서비스 (블록 발견 시 저널 기록)
+mining_service = MiningService(blockchain, on_block=record_block)
+
+# SQLite 저장소는 워커 프로세스마다 import 시점에 준비 (gunicorn 등 __main__을 거치지 않는 실행 포함)
+if store is not None:
+    load_data()
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request_latency(response):
+    """경로 규칙 단위로 지연 시간 기록 (주소/tx_id 값마다 라벨이 늘어나지 않게)"""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        http_request_seconds.observe(time.perf_counter() - start,
+                                     (request.method, route, str(response.status_code)))
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 텍스트 형식 지표"""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def login():
     """로그인 페이지"""
@@ -215,11 +453,11 @@ def dashboard():
 def create_wallet():
     """새 지갑 생성"""
     try:
-        wallet = Wallet()
+        wallet = key_pool.pop()
         address = wallet.get_address()
         wallets[address] = wallet
         
-        save_data()
+        record_event(dict(_wallet_entry(wallet), type='wallet', address=address))
         
         return jsonify({
             'success': True,
@@ -236,8 +474,7 @@ def create_wallet():
 def get_balance(address):
     """지갑 잔액 조회"""
     try:
-        balance = blockchain.get_balance(address)
-        utxos = blockchain.utxo_pool.get_utxos_by_address(address)
+        balance, utxos = blockchain.get_address_snapshot(address)
         
         return jsonify({
             'success': True,
@@ -254,7 +491,7 @@ def get_balance(address):
 def get_utxos(address):
     """지갑의 UTXO 목록 조회"""
     try:
-        utxos = blockchain.utxo_pool.get_utxos_by_address(address)
+        utxos = blockchain.get_utxos(address)
         utxo_list = [utxo.to_dict() for utxo in utxos]
         
         return jsonify({
@@ -286,9 +523,17 @@ def create_transaction():
         
         sender_wallet = wallets[sender_address]
         
+        # 코인 선택 전략 (요청마다 지정 가능)
+        coin_selection = data.get('coin_selection', DEFAULT_COIN_SELECTION)
+        if coin_selection not in COIN_SELECTION_STRATEGIES:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown coin_selection (choose from {", ".join(COIN_SELECTION_STRATEGIES)})'
+            }), 400
+        
         # 트랜잭션 생성
         transaction = blockchain.create_transaction(
-            sender_address, receiver_address, amount, sender_wallet
+            sender_address, receiver_address, amount, sender_wallet, coin_selection
         )
         
         if not transaction:
@@ -325,9 +570,17 @@ def send_transaction():
         
         sender_wallet = wallets[sender_address]
         
+        # 코인 선택 전략 (요청마다 지정 가능)
+        coin_selection = data.get('coin_selection', DEFAULT_COIN_SELECTION)
+        if coin_selection not in COIN_SELECTION_STRATEGIES:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown coin_selection (choose from {", ".join(COIN_SELECTION_STRATEGIES)})'
+            }), 400
+        
         # 트랜잭션 생성
         transaction = blockchain.create_transaction(
-            sender_address, receiver_address, amount, sender_wallet
+            sender_address, receiver_address, amount, sender_wallet, coin_selection
         )
         
         if not transaction:
@@ -337,8 +590,8 @@ def send_transaction():
             }), 400
         
         # 트랜잭션을 대기 목록에 추가
+        # (대기 트랜잭션은 저장 대상이 아니므로 채굴 시점에 블록으로 기록)
         if blockchain.add_transaction(transaction):
-            save_data()
             return jsonify({
                 'success': True,
                 'data': {
@@ -354,6 +607,93 @@ def send_transaction():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/transaction/batch', methods=['POST'])
+def send_batch_transaction():
+    """여러 수신자에게 일괄 송금 (수신자 묶음마다 다중 출력 트랜잭션 1개)"""
+    try:
+        data = request.get_json()
+        sender_address = data.get('sender_address')
+        payments = data.get('payments')
+        
+        if sender_address not in wallets:
+            return jsonify({
+                'success': False,
+                'error': 'Sender wallet not found'
+            }), 400
+        
+        if not isinstance(payments, list) or not payments:
+            return jsonify({
+                'success': False,
+                'error': 'payments must be a non-empty list of {receiver_address, amount}'
+            }), 400
+        
+        if len(payments) > MAX_BATCH_PAYMENTS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many payments (max {MAX_BATCH_PAYMENTS})'
+            }), 400
+        
+        coin_selection = data.get('coin_selection', DEFAULT_COIN_SELECTION)
+        if coin_selection not in COIN_SELECTION_STRATEGIES:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown coin_selection (choose from {", ".join(COIN_SELECTION_STRATEGIES)})'
+            }), 400
+        
+        sender_wallet = wallets[sender_address]
+        
+        # 수신자별 결과 (잘못된 항목은 건너뛰고 나머지만 송금)
+        results = []
+        valid = []
+        for i, payment in enumerate(payments):
+            try:
+                receiver_address = payment['receiver_address']
+                amount = float(payment['amount'])
+            except (TypeError, KeyError, ValueError):
+                results.append({'index': i, 'status': 'invalid', 'error': 'receiver_address and amount are required'})
+                continue
+            result = {'index': i, 'receiver_address': receiver_address, 'amount': amount}
+            results.append(result)
+            if not receiver_address or not amount > 0:
+                result.update(status='invalid', error='Invalid receiver_address or amount')
+                continue
+            valid.append(result)
+        
+        # MAX_BATCH_OUTPUTS명씩 묶어 트랜잭션 생성 (UTXO 선택/서명은 묶음당 한 번)
+        transaction_ids = []
+        for start in range(0, len(valid), MAX_BATCH_OUTPUTS):
+            chunk = valid[start:start + MAX_BATCH_OUTPUTS]
+            transaction = blockchain.create_batch_transaction(
+                sender_address, [(r['receiver_address'], r['amount']) for r in chunk],
+                sender_wallet, coin_selection
+            )
+            if transaction is None:
+                error = 'Failed to create transaction (insufficient funds)'
+            elif not blockchain.add_transaction(transaction):
+                error = 'Transaction validation failed'
+            else:
+                error = None
+                transaction_ids.append(transaction.tx_id)
+            for result in chunk:
+                if error is None:
+                    result.update(status='pending', transaction_id=transaction.tx_id)
+                else:
+                    result.update(status='failed', error=error)
+        
+        # (대기 트랜잭션은 저장 대상이 아니므로 채굴 시점에 블록으로 한 번에 기록)
+        accepted = sum(1 for result in results if result['status'] == 'pending')
+        return jsonify({
+            'success': accepted > 0,
+            'data': {
+                'transaction_ids': transaction_ids,
+                'accepted': accepted,
+                'failed': len(results) - accepted,
+                'results': results
+            }
+        }), 200 if accepted > 0 else 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/mine', methods=['POST'])
 def mine_block():
     """블록 채굴"""
@@ -369,31 +709,150 @@ def mine_block():
         
         # 블록 채굴
         block = blockchain.mine_block(miner_address)
-        save_data()
+        record_block(block)
         
         return jsonify({
             'success': True,
             'data': {
                 'block': block,
                 'message': f'Block {block["index"]} mined successfully',
-                'transactions_processed': len(blockchain.pending_transactions) + 1  # +1 for reward
+                'transactions_processed': len(blockchain.pending_transactions) + 1,  # +1 for reward
+                'mining': blockchain.last_mining_stats
             }
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/blockchain', methods=['GET'])
-def get_blockchain():
-    """전체 블록체인 조회"""
+@app.route('/api/mine/jobs', methods=['POST'])
+def start_mining_job():
+    """백그라운드 채굴 작업 시작"""
     try:
+        data = request.get_json()
+        miner_address = data.get('miner_address')
+        
+        if not miner_address:
+            return jsonify({
+                'success': False,
+                'error': 'Miner address is required'
+            }), 400
+        
+        job = mining_service.start(miner_address)
         return jsonify({
             'success': True,
-            'data': {
-                'chain': blockchain.chain,
-                'length': len(blockchain.chain),
-                'pending_transactions': len(blockchain.pending_transactions)
-            }
-        })
+            'data': {'job': job.to_dict()}
+        }), 202
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/mine/jobs/<job_id>', methods=['GET'])
+def get_mining_job(job_id):
+    """채굴 작업 상태/진행률 조회"""
+    job = mining_service.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Mining job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'data': {'job': job.to_dict()}
+    })
+
+@app.route('/api/mine/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_mining_job(job_id):
+    """채굴 작업 취소"""
+    job = mining_service.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Mining job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'data': {'job': job.to_dict()}
+    })
+
+def _chain_etag() -> str:
+    """체인 끝과 대기 트랜잭션 상태로 만든 ETag (변경이 없으면 동일)"""
+    with blockchain.read_lock:
+        height = len(blockchain.chain)
+        tip_hash = blockchain._hash(blockchain.chain[-1])
+        mempool_version = blockchain.mempool_version
+    return f"{height}-{tip_hash[:16]}-{mempool_version}"
+
+def _block_header_view(block: dict) -> dict:
+    """data 필드를 제외한 블록 헤더"""
+    return {key: value for key, value in block.items() if key != 'data'}
+
+@app.route('/api/blockchain', methods=['GET'])
+def get_blockchain():
+    """블록체인 조회 (페이지 단위, 헤더 전용, NDJSON 스트리밍 지원)
+
+    쿼리 파라미터:
+      from_height  시작 블록 번호 (기본: asc는 1, desc는 최신 블록)
+      limit        최대 블록 수 (기본 100, 최대 1000 / ndjson은 기본 제한 없음)
+      order        asc | desc (desc는 최신 블록부터)
+      headers      1이면 data를 제외한 헤더만 반환
+      format       ndjson이면 블록을 한 줄씩 스트리밍
+    """
+    try:
+        etag = _chain_etag()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        order = request.args.get('order', 'asc')
+        stream = request.args.get('format') == 'ndjson'
+        headers_only = request.args.get('headers') in ('1', 'true')
+        if order not in ('asc', 'desc'):
+            return jsonify({'success': False, 'error': 'order must be asc or desc'}), 400
+        
+        try:
+            height = len(blockchain.chain)
+            from_height = int(request.args.get('from_height', 1 if order == 'asc' else height))
+            default_limit = height if stream else DEFAULT_PAGE_LIMIT
+            limit = int(request.args.get('limit', default_limit))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'from_height and limit must be integers'}), 400
+        # limit 0은 빈 페이지에 같은 커서를 돌려주어 클라이언트가 무한 반복하므로 거부
+        if limit < 1 or (not stream and limit > MAX_PAGE_LIMIT):
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_PAGE_LIMIT}'}), 400
+        
+        # 요청 시점의 체인 길이 기준으로 범위 결정 (체인은 뒤에만 추가됨)
+        if order == 'asc':
+            start = max(from_height, 1)
+            heights = range(start, min(start + limit, height + 1))
+            next_from_height = heights.stop if heights.stop <= height else None
+        else:
+            start = min(from_height, height)
+            heights = range(start, max(start - limit, 0), -1)
+            next_from_height = heights.stop if heights.stop >= 1 else None
+        if not heights:
+            next_from_height = None
+        
+        def view(h):
+            block = blockchain.get_block(h)
+            return _block_header_view(block) if headers_only else block
+        
+        if stream:
+            def generate():
+                for h in heights:
+                    yield json.dumps(view(h)) + "\n"
+            response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        else:
+            response = jsonify({
+                'success': True,
+                'data': {
+                    'chain': [view(h) for h in heights],
+                    'length': height,
+                    'pending_transactions': len(blockchain.pending_transactions),
+                    'from_height': start,
+                    'limit': limit,
+                    'order': order,
+                    'next_from_height': next_from_height
+                }
+            })
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -401,13 +860,13 @@ def get_blockchain():
 def get_block(index):
     """특정 블록 조회"""
     try:
-        if index < 1 or index > len(blockchain.chain):
+        block = blockchain.get_block(index)
+        if block is None:
             return jsonify({
                 'success': False,
                 'error': 'Block not found'
             }), 404
         
-        block = blockchain.chain[index - 1]
         return jsonify({
             'success': True,
             'data': {'block': block}
@@ -415,6 +874,74 @@ def get_block(index):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/blockchain/hash/<block_hash>', methods=['GET'])
+def get_block_by_hash(block_hash):
+    """블록 해시로 블록 조회"""
+    try:
+        found = blockchain.find_block_by_hash(block_hash)
+        if found is None:
+            return jsonify({
+                'success': False,
+                'error': 'Block not found'
+            }), 404
+        
+        height, block = found
+        return jsonify({
+            'success': True,
+            'data': {'block': block, 'height': height}
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/transaction/<tx_id>', methods=['GET'])
+def get_transaction(tx_id):
+    """tx_id로 트랜잭션 조회 (확정된 트랜잭션 또는 대기 중인 트랜잭션)"""
+    try:
+        found = blockchain.find_transaction(tx_id)
+        if found is not None:
+            return jsonify({
+                'success': True,
+                'data': dict(found, status='confirmed')
+            })
+        
+        tx = blockchain.get_pending_transaction(tx_id)
+        if tx is not None:
+            return jsonify({
+                'success': True,
+                'data': {'transaction': tx.to_dict(), 'status': 'pending'}
+            })
+        
+        return jsonify({
+            'success': False,
+            'error': 'Transaction not found'
+        }), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/transaction/<tx_id>/proof', methods=['GET'])
+def get_transaction_proof(tx_id):
+    """확정된 트랜잭션의 머클 포함 증명 (경량 클라이언트가 블록 헤더만으로 검증)"""
+    try:
+        found = blockchain.get_transaction_proof(tx_id)
+        if found is not None:
+            return jsonify({
+                'success': True,
+                'data': found
+            })
+        
+        if blockchain.get_pending_transaction(tx_id) is not None:
+            error = 'Transaction is pending (not yet in a block)'
+        elif blockchain.find_transaction(tx_id) is not None:
+            error = 'Transaction is in a legacy block without a merkle root'
+        else:
+            error = 'Transaction not found'
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/pending-transactions', methods=['GET'])
 def get_pending_transactions():
     """대기 중인 트랜잭션 조회"""
@@ -434,17 +961,22 @@ def get_pending_transactions():
 def get_stats():
     """블록체인 통계"""
     try:
-        total_utxos = len(blockchain.utxo_pool.utxos)
-        total_supply = sum(utxo.amount for utxo in blockchain.utxo_pool.utxos.values())
+        # 블록 반영 때 증분 유지된 집계 (UTXO 전체를 순회하지 않음)
+        stats = blockchain.chain_stats()
         
         return jsonify({
             'success': True,
             'data': {
-                'total_blocks': len(blockchain.chain),
-                'pending_transactions': len(blockchain.pending_transactions),
-                'total_utxos': total_utxos,
-                'total_supply': total_supply,
-                'registered_wallets': len(wallets)
+                'total_blocks': stats['height'],
+                'pending_transactions': stats['pending_transactions'],
+                'total_utxos': stats['utxo_count'],
+                'total_supply': stats['total_supply'],
+                'address_count': stats['address_count'],
+                'total_transactions': stats['total_transactions'],
+                'average_block_time': stats['average_block_time'],
+                'registered_wallets': len(wallets),
+                'verification_cache': verification_cache.stats(),
+                'key_pool': key_pool.stats()
             }
         })
     except Exception as e:
@@ -474,8 +1006,9 @@ def internal_error(error):
     }), 500
 
 if __name__ == '__main__':
-    # 서버 시작 시 데이터 로드
-    load_data()
+    # 서버 시작 시 데이터 로드 (SQLite 저장소는 import 시점에 이미 준비됨)
+    if store is None:
+        load_data()
     
     # Genesis 블록에 초기 UTXO 추가 (테스트용)
     if len(blockchain.utxo_pool.utxos) == 0 and len(blockchain.chain) == 0:
@@ -495,6 +1028,9 @@ if __name__ == '__main__':
         
         print(f"Genesis wallet created: {genesis_wallet.get_address()}")
     
+    # 지갑 키를 미리 채워 둠 (fork 된 워커 프로세스는 첫 지갑 생성 요청 때 시작)
+    key_pool.start()
+    
     print("🚀 Bitcoin server starting...")
     print("📊 API endpoints:")
     print("   GET  / (로그인 페이지)")
@@ -505,9 +1041,18 @@ if __name__ == '__main__':
     print("   GET  /api/wallet/<address>/utxos")
     print("   POST /api/transaction/create")
     print("   POST /api/transaction/send")
+    print("   POST /api/transaction/batch")
     print("   POST /api/mine")
+    print("   POST /api/mine/jobs")
+    print("   GET  /api/mine/jobs/<job_id>")
+    print("   POST /api/mine/jobs/<job_id>/cancel")
     print("   GET  /api/blockchain")
+    print("   GET  /api/blockchain/hash/<hash>")
+    print("   GET  /api/transaction/<tx_id>")
+    print("   GET  /api/transaction/<tx_id>/proof")
     print("   GET  /api/pending-transactions")
     print("   GET  /api/stats")
+    print("   GET  /metrics")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # 요청마다 스레드로 처리 (쓰기는 Blockchain.lock으로 직렬화, 읽기는 잠금 없이)
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
@@ -0,0 +1,1370 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from bitcoin_utxo import (
+    Blockchain, Transaction, TransactionInput, TransactionOutput, ParallelMiner, Wallet, UTXO, UTXOPool,
+    verification_cache, COIN_SELECTION_STRATEGIES, check_wallet_keys, merkle_root,
+    merkle_levels, merkle_leaf, merkle_proof, verify_merkle_proof, merkle_tree_cache, block_header, _to_satoshi, SignatureVerifier
+)
+from journal import Journal
+from key_pool import KeyPool
+from chain_verifier import ChainVerifier
+from metrics import Registry
+from sqlite_store import SQLiteStore
+from binary_codec import encode_block, decode_block, encode_transaction, decode_transaction
+
+
+def _random_address(rng: random.Random) -> str:
+    """벤치마크용 가짜 주소 생성 (실제 키 없이)"""
+    return "1" + "".join(rng.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+                         for _ in range(33))
+
+
+def bench_utxo_index(num_utxos=100000, num_addresses=1000, spend_ratio=0.3, seed=42):
+    """UTXO 주소 인덱스 규모별 생성/소비/조회 시간 (인덱스 조회 vs 전체 스캔)"""
+    print(f"📦 UTXO 인덱스 규모 테스트 (UTXO {num_utxos}개, 주소 {num_addresses}개)")
+    rng = random.Random(seed)
+    blockchain = Blockchain()
+    addresses = [_random_address(rng) for _ in range(num_addresses)]
+
+    # 1. 출력만 있는 합성 트랜잭션으로 UTXO 생성
+    start = time.perf_counter()
+    transactions = []
+    per_tx = 10
+    for i in range(0, num_utxos, per_tx):
+        outputs = [TransactionOutput(amount=float(rng.randint(1, 100)), address=rng.choice(addresses))
+                   for _ in range(min(per_tx, num_utxos - i))]
+        tx = Transaction(inputs=[], outputs=outputs)
+        tx.tx_id = f"synthetic_{i}"
+        transactions.append(tx)
+    blockchain._update_utxo_pool(transactions)
+    print(f"   생성: {time.perf_counter() - start:.2f}초")
+
+    # 2. 일부 UTXO를 소비하고 거스름돈 출력 생성
+    start = time.perf_counter()
+    keys = list(blockchain.utxo_pool.utxos.keys())
+    spent = rng.sample(keys, int(len(keys) * spend_ratio))
+    transactions = []
+    for i in range(0, len(spent), 5):
+        inputs = []
+        total = 0.0
+        for key in spent[i:i + 5]:
+            tx_id, output_index = key.rsplit(":", 1)
+            total += blockchain.utxo_pool.utxos[key].amount
+            inputs.append(TransactionInput(tx_id, int(output_index), "", ""))
+        tx = Transaction(inputs=inputs, outputs=[
+            TransactionOutput(amount=total, address=rng.choice(addresses))
+        ])
+        transactions.append(tx)
+    blockchain._update_utxo_pool(transactions)
+    print(f"   소비: {time.perf_counter() - start:.2f}초")
+
+    # 3. 조회 비용 비교 (인덱스 vs 전체 스캔), 일관성은 tests/test_utxo_index.py에서 확인
+    samples = [rng.choice(addresses) for _ in range(1000)]
+    start = time.perf_counter()
+    for address in samples:
+        blockchain.get_balance(address)
+        blockchain.utxo_pool.get_utxos_by_address(address)
+    indexed = time.perf_counter() - start
+
+    utxos = blockchain.utxo_pool.utxos
+    start = time.perf_counter()
+    for address in samples[:20]:
+        sum(utxo.amount for utxo in utxos.values() if utxo.address == address)
+    scan = (time.perf_counter() - start) * len(samples) / 20
+
+    print(f"   인덱스 조회 {len(samples)}회: {indexed * 1000:.2f}ms")
+    print(f"   전체 스캔 {len(samples)}회 (추정): {scan * 1000:.2f}ms")
+    return {"indexed_ms": indexed * 1000, "scan_ms": scan * 1000}
+
+
+def bench_parallel_pow(num_blocks=5, workers=(1, 2, 4)):
+    """작업 증명 해시레이트 비교 (단일 스레드 vs 병렬 프로세스)"""
+    print(f"⛏️  작업 증명 해시레이트 비교 (블록 {num_blocks}개)")
+    results = {}
+    for count in workers:
+        blockchain = Blockchain(miner=ParallelMiner(workers=count))
+        attempts = 0
+        elapsed = 0.0
+        for _ in range(num_blocks):
+            blockchain.mine_block("1BenchMiner")
+            attempts += blockchain.last_mining_stats["attempts"]
+            elapsed += blockchain.last_mining_stats["elapsed"]
+        hashrate = attempts / elapsed if elapsed > 0 else 0.0
+        results[count] = hashrate
+        print(f"   workers={count}: {hashrate:,.0f} H/s ({elapsed:.2f}초)")
+    return results
+
+
+def _synthetic_transactions(rng: random.Random, count: int) -> list:
+    """서명 없는 합성 트랜잭션 (채굴 비용 측정용, validate_blocks=False인 체인에만 넣음)"""
+    transactions = []
+    for i in range(count):
+        tx = Transaction(
+            inputs=[TransactionInput(f"{i:064x}", 0, "ab" * 64, "04" + "cd" * 64)],
+            outputs=[TransactionOutput(amount=float(rng.randint(1, 100)), address=_random_address(rng)),
+                     TransactionOutput(amount=1.0, address=_random_address(rng))]
+        )
+        transactions.append(tx)
+    return transactions
+
+
+def bench_block_size_pow(tx_counts=(1, 10, 100, 1000), num_blocks=3, seed=42):
+    """블록당 트랜잭션 수에 따른 채굴 시간 (레거시 data 해싱 vs 머클 루트 헤더)"""
+    print(f"🧱 블록 크기별 채굴 시간 (블록 {num_blocks}개 평균)")
+    rng = random.Random(seed)
+    results = {}
+    for count in tx_counts:
+        row = {}
+        for label, version in (("legacy", 1), ("merkle", 2)):
+            blockchain = Blockchain()
+            blockchain.block_version = version
+            blockchain.validate_blocks = False  # 합성 트랜잭션: 블록 조립/작업 증명 비용만 측정
+            elapsed = 0.0
+            attempts = 0
+            for _ in range(num_blocks):
+                for tx in _synthetic_transactions(rng, count):
+                    blockchain.mempool.add(tx, fee=0.0)
+                start = time.perf_counter()
+                blockchain.mine_block("1BenchMiner")
+                elapsed += time.perf_counter() - start
+                attempts += blockchain.last_mining_stats["attempts"]
+            assert blockchain.is_chain_valid(), "채굴된 체인 검증 실패"
+            # 난이도 운의 영향을 줄이기 위해 nonce 1회당 시간도 함께 기록
+            row[label] = {"block_ms": elapsed / num_blocks * 1000,
+                          "us_per_attempt": elapsed / attempts * 1e6}
+        results[count] = row
+        print(f"   tx={count:5d}: legacy {row['legacy']['us_per_attempt']:8.2f}us/nonce "
+              f"({row['legacy']['block_ms']:.0f}ms/블록) | "
+              f"merkle {row['merkle']['us_per_attempt']:6.2f}us/nonce "
+              f"({row['merkle']['block_ms']:.0f}ms/블록)")
+    return results
+
+
+def _synthetic_chain(rng: random.Random, num_blocks: int) -> Blockchain:
+    """작업 증명 없이 코인베이스 블록만으로 체인 구성 (저장/로드 측정용)"""
+    blockchain = Blockchain()
+    addresses = [_random_address(rng) for _ in range(100)]
+    for index in range(2, num_blocks + 1):
+        reward_tx = Transaction(inputs=[], outputs=[
+            TransactionOutput(amount=10.0, address=rng.choice(addresses))
+        ])
+        reward_tx.tx_id = f"coinbase_{index}"
+        data = json.dumps({"transactions": [reward_tx.to_dict()]})
+        blockchain.chain.append(blockchain._create_block(data, index, f"{index:064x}", index))
+        blockchain._update_utxo_pool([reward_tx])
+    return blockchain
+
+
+def bench_persistence(chain_sizes=(10000, 100000), appends=200, seed=42):
+    """블록 1개 저장 지연 시간 (레거시 전체 재기록 vs 저널 추가)"""
+    print("💾 블록 저장 지연 시간 (레거시 save_data vs 저널)")
+    rng = random.Random(seed)
+    results = {}
+    for size in chain_sizes:
+        blockchain = _synthetic_chain(rng, size)
+        block = blockchain.chain[-1]
+        with tempfile.TemporaryDirectory() as tmp:
+            # 레거시: 요청마다 체인 + UTXO 전체를 indent=2 로 다시 기록
+            start = time.perf_counter()
+            repeats = 3
+            for _ in range(repeats):
+                with open(os.path.join(tmp, "blockchain_data.json"), 'w') as f:
+                    json.dump({
+                        'chain': blockchain.chain,
+                        'utxos': {k: v.to_dict() for k, v in blockchain.utxo_pool.utxos.items()}
+                    }, f, indent=2)
+            legacy_ms = (time.perf_counter() - start) / repeats * 1000
+
+            # 저널: 새 블록 한 줄만 추가 (fsync 묶음 처리)
+            journal = Journal(os.path.join(tmp, "journal.log"), os.path.join(tmp, "checkpoint.json"))
+            start = time.perf_counter()
+            for _ in range(appends):
+                journal.append({'type': 'block', 'block': block})
+            journal.sync()
+            journal_ms = (time.perf_counter() - start) / appends * 1000
+
+            start = time.perf_counter()
+            journal.write_checkpoint({'chain': blockchain.chain})
+            checkpoint_ms = (time.perf_counter() - start) * 1000
+            journal.close()
+
+        results[size] = {"legacy_ms": legacy_ms, "journal_ms": journal_ms, "checkpoint_ms": checkpoint_ms}
+        print(f"   블록 {size:6d}개: 레거시 {legacy_ms:9.2f}ms/요청 | 저널 {journal_ms:.3f}ms/요청 "
+              f"(체크포인트 1회 {checkpoint_ms:.0f}ms)")
+    return results
+
+
+def bench_startup(chain_sizes=(10000, 100000), tail_blocks=100, seed=42):
+    """노드 시작 시간 (UTXO 스냅샷 + 저널 재생 vs 블록 단위 전체 재구성)"""
+    print("🚀 노드 시작 시간 (UTXO 스냅샷 vs 전체 재구성)")
+    rng = random.Random(seed)
+    results = {}
+    for size in chain_sizes:
+        source = _synthetic_chain(rng, size)
+        tail = source.chain[-tail_blocks:]
+        with tempfile.TemporaryDirectory() as tmp:
+            # 스냅샷은 마지막 tail_blocks 개 블록 이전 시점으로 기록
+            journal = Journal(os.path.join(tmp, "journal.log"), os.path.join(tmp, "checkpoint.json"))
+            base = Blockchain()
+            base.chain = source.chain[:-tail_blocks]
+            base.rebuild_utxo_pool()
+            journal.write_checkpoint({'chain': base.chain, 'utxo_snapshot': base.utxo_snapshot()})
+            for block in tail:
+                journal.append({'type': 'block', 'block': block})
+            journal.close()
+
+            timings = {}
+            for mode in ("snapshot", "rebuild"):
+                start = time.perf_counter()
+                journal = Journal(os.path.join(tmp, "journal.log"), os.path.join(tmp, "checkpoint.json"))
+                checkpoint, events = journal.recover()
+                blockchain = Blockchain()
+                blockchain.chain = checkpoint['chain']
+                if mode == "snapshot":
+                    assert blockchain.load_utxo_snapshot(checkpoint['utxo_snapshot'])
+                else:
+                    blockchain.rebuild_utxo_pool()
+                for event in events:
+                    blockchain.replay_block(event['block'])
+                timings[mode] = time.perf_counter() - start
+                assert len(blockchain.utxo_pool.utxos) == len(source.utxo_pool.utxos)
+                assert blockchain.utxo_pool.check_index()
+
+        results[size] = timings
+        print(f"   블록 {size:6d}개: 스냅샷 {timings['snapshot']:.2f}초 | 전체 재구성 {timings['rebuild']:.2f}초")
+    return results
+
+
+def _funded_blockchain(num_wallets: int) -> Tuple[Blockchain, list]:
+    """지갑마다 코인베이스 보상 1개씩을 가진 체인 (작업 증명 없이 구성)"""
+    blockchain = Blockchain()
+    wallets = [Wallet() for _ in range(num_wallets)]
+    for index, wallet in enumerate(wallets, start=2):
+        reward_tx = Transaction(inputs=[], outputs=[TransactionOutput(amount=10.0, address=wallet.get_address())])
+        reward_tx.tx_id = f"coinbase_{index}"
+        blockchain._update_utxo_pool([reward_tx])
+    return blockchain, wallets
+
+
+def bench_verification_cache(num_transactions=200, rounds=3):
+    """반복 검증 작업에서 검증 캐시 효과 (재전송/블록 후 대기 트랜잭션 재검증)"""
+    print(f"🔁 검증 캐시 효과 (트랜잭션 {num_transactions}개 x {rounds}회 검증)")
+    blockchain, wallets = _funded_blockchain(num_transactions)
+    receiver = wallets[0].get_address()
+    transactions = [blockchain.create_transaction(w.get_address(), receiver, 1.0, w) for w in wallets]
+
+    verification_cache.clear()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for tx in transactions:
+            assert blockchain._validate_transaction(tx)
+        timings.append(time.perf_counter() - start)
+
+    for i, elapsed in enumerate(timings, start=1):
+        label = "콜드" if i == 1 else "웜"
+        print(f"   {i}회차 ({label}): {elapsed * 1000:.1f}ms ({elapsed / num_transactions * 1e6:.0f}us/트랜잭션)")
+    stats = verification_cache.stats()
+    for name, cache in stats.items():
+        print(f"   {name}: hits={cache['hits']} misses={cache['misses']}")
+    return {"cold_ms": timings[0] * 1000, "warm_ms": min(timings[1:]) * 1000, "cache": stats}
+
+
+def _legacy_message_cost(tx: Transaction) -> float:
+    """이전 방식처럼 입력마다 트랜잭션 전체를 다시 직렬화하는 비용 (비교용)"""
+    start = time.perf_counter()
+    for input_index in range(len(tx.inputs)):
+        temp_tx_data = {
+            "inputs": [dict(inp.to_dict(), signature="") if i == input_index else inp.to_dict()
+                       for i, inp in enumerate(tx.inputs)],
+            "outputs": [out.to_dict() for out in tx.outputs]
+        }
+        json.dumps(temp_tx_data, sort_keys=True).encode()
+    return time.perf_counter() - start
+
+
+def bench_sighash(input_counts=(1, 10, 100, 1000)):
+    """다중 입력 트랜잭션 서명/검증 시간 (트랜잭션당 한 번 직렬화)"""
+    print("✍️  입력 수별 서명/검증 시간")
+    results = {}
+    wallet = Wallet()
+    receiver = Wallet().get_address()
+    for count in input_counts:
+        blockchain = Blockchain()
+        reward_txs = []
+        for i in range(count):
+            reward_tx = Transaction(inputs=[], outputs=[TransactionOutput(amount=1.0, address=wallet.get_address())])
+            reward_tx.tx_id = f"coinbase_{i + 2}"
+            reward_txs.append(reward_tx)
+        blockchain._update_utxo_pool(reward_txs)
+
+        start = time.perf_counter()
+        tx = blockchain.create_transaction(wallet.get_address(), receiver, float(count), wallet)
+        sign_time = time.perf_counter() - start
+        assert len(tx.inputs) == count
+
+        verification_cache.clear()
+        start = time.perf_counter()
+        assert blockchain._check_transaction(tx) is None
+        verify_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(count):
+            tx.signing_digest()
+        per_input_digest = time.perf_counter() - start
+        legacy = _legacy_message_cost(tx)
+
+        results[count] = {"sign_ms": sign_time * 1000, "verify_ms": verify_time * 1000,
+                          "serialize_once_ms": per_input_digest / count * 1000,
+                          "legacy_serialize_ms": legacy * 1000}
+        print(f"   입력 {count:4d}개: 서명 {sign_time * 1000:8.1f}ms | 검증 {verify_time * 1000:8.1f}ms | "
+              f"직렬화 1회 {per_input_digest / count * 1000:.3f}ms (이전 방식 {legacy * 1000:.1f}ms)")
+    return results
+
+
+def bench_binary_codec(num_transactions=500, rounds=5):
+    """바이너리 형식 vs JSON: 크기와 인코딩/디코딩 처리량"""
+    print(f"📐 바이너리 형식 vs JSON (서명된 트랜잭션 {num_transactions}개)")
+    blockchain, wallets = _funded_blockchain(num_transactions)
+    receiver = wallets[0].get_address()
+    for wallet in wallets:
+        blockchain.add_transaction(blockchain.create_transaction(wallet.get_address(), receiver, 1.5, wallet))
+    block = blockchain.mine_block(receiver)
+    transactions = blockchain.get_block_transactions(block)
+    tx_objects = [Transaction.from_dict(tx) for tx in transactions]
+
+    json_block = json.dumps(block).encode()
+    binary_block = encode_block(block)
+    assert decode_block(binary_block) == block
+
+    def throughput(fn, items):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in items:
+                fn(item)
+        return len(items) * rounds / (time.perf_counter() - start)
+
+    json_encoded = [json.dumps(tx.to_dict()).encode() for tx in tx_objects]
+    binary_encoded = [encode_transaction(tx) for tx in tx_objects]
+    results = {
+        "block_bytes": {"json": len(json_block), "binary": len(binary_block)},
+        "tx_encode_per_s": {
+            "json": throughput(lambda tx: json.dumps(tx.to_dict()).encode(), tx_objects),
+            "binary": throughput(encode_transaction, tx_objects)
+        },
+        "tx_decode_per_s": {
+            "json": throughput(lambda raw: Transaction.from_dict(json.loads(raw)), json_encoded),
+            "binary": throughput(decode_transaction, binary_encoded)
+        }
+    }
+    print(f"   블록 크기: JSON {len(json_block):,}B | 바이너리 {len(binary_block):,}B "
+          f"({len(json_block) / len(binary_block):.2f}배 감소)")
+    for name in ("tx_encode_per_s", "tx_decode_per_s"):
+        print(f"   {name}: JSON {results[name]['json']:,.0f}/s | 바이너리 {results[name]['binary']:,.0f}/s")
+    return results
+
+
+def _wallet_with_utxos(amounts) -> Tuple[Blockchain, Wallet]:
+    """지정한 금액의 UTXO를 가진 지갑과 체인 (작업 증명 없이 구성)"""
+    blockchain = Blockchain()
+    wallet = Wallet()
+    reward_tx = Transaction(inputs=[], outputs=[TransactionOutput(amount, wallet.get_address()) for amount in amounts])
+    reward_tx.tx_id = "coinbase_exact"
+    blockchain._update_utxo_pool([reward_tx])
+    return blockchain, wallet
+
+
+def _check_exact_amounts():
+    """float 합계로는 틀어지는 금액 조합: 모든 전략에서 송금이 통과하고 거스름돈은 사토시 단위로 정확해야 함"""
+    cases = [
+        ([0.7, 0.1, 5.0], 0.8),  # 0.7 + 0.1 = 0.7999999999999999 (정확히 일치하는 조합)
+        ([0.1, 0.2], 0.3),       # 0.1 + 0.2 - 0.3 = 5.55e-17 (먼지 거스름돈)
+    ]
+    for amounts, amount in cases:
+        for strategy in COIN_SELECTION_STRATEGIES:
+            blockchain, wallet = _wallet_with_utxos(amounts)
+            tx = blockchain.create_transaction(wallet.get_address(), _random_address(random.Random(0)),
+                                               amount, wallet, strategy)
+            assert tx is not None, f"{strategy}: {amounts} -> {amount} 트랜잭션 생성 실패"
+            assert blockchain._check_transaction(tx) is None, f"{strategy}: {blockchain._check_transaction(tx)}"
+            assert blockchain.add_transaction(tx), f"{strategy}: {amounts} -> {amount} 거부됨"
+            change = [output.amount for output in tx.outputs[1:]]
+            assert all(_to_satoshi(value) > 0 for value in change), f"{strategy}: 먼지 거스름돈 {change}"
+            selected = sum(_to_satoshi(blockchain.utxo_pool.get_utxo(inp.prev_tx_id, inp.output_index).amount)
+                           for inp in tx.inputs)
+            outputs = sum(_to_satoshi(output.amount) for output in tx.outputs)
+            assert selected == outputs, f"{strategy}: 입력 {selected} != 출력 {outputs} (사토시)"
+
+
+def _tampered(signature: str) -> str:
+    return ("0" if signature[0] != "0" else "1") + signature[1:]
+
+
+def _verification_cases(rng: random.Random, num_transactions: int, inputs_per_tx: int) -> Tuple[Blockchain, list]:
+    """순차/일괄 검증 비교용 트랜잭션: 정상, 서명 변조, 없는 UTXO, 초과 지출, 다른 키 서명을 섞음"""
+    owner, stranger = Wallet(), Wallet()
+    blockchain = Blockchain()
+    funding = Transaction(inputs=[], outputs=[TransactionOutput(1.0, owner.get_address())
+                                              for _ in range(num_transactions * inputs_per_tx)])
+    funding.tx_id = "coinbase_funding"
+    blockchain._update_utxo_pool([funding])
+
+    transactions = []
+    for n in range(num_transactions):
+        inputs = [TransactionInput("coinbase_funding", n * inputs_per_tx + i, "", owner.get_public_key_hex())
+                  for i in range(inputs_per_tx)]
+        kind = rng.choice(("valid", "valid", "bad_signature", "missing", "overspend", "wrong_key",
+                           "bad_signature_then_missing", "missing_then_bad_signature"))
+        if kind in ("missing", "bad_signature_then_missing"):
+            inputs[rng.randrange(1, inputs_per_tx)].prev_tx_id = f"{n:064x}"
+        if kind == "missing_then_bad_signature":
+            inputs[0].prev_tx_id = f"{n:064x}"
+        amount = inputs_per_tx * (2.0 if kind == "overspend" else 0.9)
+        tx = Transaction(inputs, [TransactionOutput(amount, _random_address(rng))])
+        tx.sign_inputs(signing_key=(stranger if kind == "wrong_key" else owner).signing_key)
+        if kind == "bad_signature":
+            index = rng.randrange(inputs_per_tx)
+            inputs[index].signature = _tampered(inputs[index].signature)
+        elif kind == "bad_signature_then_missing":
+            inputs[0].signature = _tampered(inputs[0].signature)
+        elif kind == "missing_then_bad_signature":
+            inputs[1].signature = _tampered(inputs[1].signature)
+        transactions.append(tx)
+    return blockchain, transactions
+
+
+def bench_batch_verify(num_transactions=200, inputs_per_tx=4, workers=(1, 2), seed=42):
+    """일괄 서명 검증이 순차 검증과 같은 판정/첫 실패 사유를 내는지 확인하고 속도 비교"""
+    print(f"🧮 순차 vs 일괄 트랜잭션 검증 (트랜잭션 {num_transactions}개 x 입력 {inputs_per_tx}개)")
+    rng = random.Random(seed)
+    blockchain, transactions = _verification_cases(rng, num_transactions, inputs_per_tx)
+
+    verification_cache.clear()
+    start = time.perf_counter()
+    serial = [blockchain._check_transaction(tx) for tx in transactions]
+    results = {"serial": {"us_per_tx": (time.perf_counter() - start) / num_transactions * 1e6}}
+    assert any(reason is None for reason in serial) and any(reason is not None for reason in serial)
+
+    for count in workers:
+        blockchain.verifier = SignatureVerifier(workers=count)
+        verification_cache.clear()
+        start = time.perf_counter()
+        batch = blockchain.check_transactions(transactions)
+        elapsed = time.perf_counter() - start
+        blockchain.verifier.shutdown()
+        for tx, expected, actual in zip(transactions, serial, batch):
+            assert expected == actual, f"워커 {count}개: {tx.tx_id} 순차 {expected!r} != 일괄 {actual!r}"
+        results[f"batch_{count}"] = {"us_per_tx": elapsed / num_transactions * 1e6}
+
+    # 블록 단위 검증: 첫 실패 트랜잭션과 사유가 순차 경로와 같아야 함
+    blockchain.verifier = None
+    first = next((tx, reason) for tx, reason in zip(transactions, serial) if reason is not None)
+    expected = f"{first[0].tx_id}: {first[1]}"
+    assert blockchain.validate_block_transactions(transactions) == expected, "블록 검증의 첫 실패 사유 불일치"
+    valid = [tx for tx, reason in zip(transactions, serial) if reason is None]
+    assert blockchain.validate_block_transactions(valid) is None, "정상 트랜잭션만 담은 블록이 거부됨"
+
+    rejected = sum(1 for reason in serial if reason is not None)
+    print(f"   ✅ 판정/사유 일치 (거부 {rejected}건 / {num_transactions}건, 블록 검증 포함)")
+    for name, row in results.items():
+        print(f"   {name:8s}: {row['us_per_tx']:.0f}us/트랜잭션")
+    return results
+
+
+def bench_coin_selection(num_sends=2000, initial_coinbases=200, seed=42):
+    """코인 선택 전략별 입력 수와 UTXO 수 변화 (합성 송금 워크로드 시뮬레이션)"""
+    print(f"🪙 코인 선택 전략 비교 (코인베이스 {initial_coinbases}개, 송금 {num_sends}회)")
+    _check_exact_amounts()
+    print("   ✅ 정확한 금액 조합 (0.7+0.1 -> 0.8, 0.1+0.2 -> 0.3) 모든 전략에서 통과")
+    results = {}
+    for name, select in COIN_SELECTION_STRATEGIES.items():
+        # 모든 전략이 같은 워크로드를 받도록 같은 시드 사용
+        rng = random.Random(seed)
+        utxos = [UTXO(f"coinbase_{i}", 0, 10.0, "sender") for i in range(initial_coinbases)]
+        input_counts = []
+        changeless = 0
+        peak_utxos = len(utxos)
+        start = time.perf_counter()
+        for n in range(num_sends):
+            # 수신: 매번 채굴 보상, 가끔 작은 입금
+            utxos.append(UTXO(f"coinbase_{initial_coinbases + n}", 0, 10.0, "sender"))
+            if rng.random() < 0.5:
+                utxos.append(UTXO(f"incoming_{n}", 0, round(rng.uniform(0.1, 5), 2), "sender"))
+            amount = rng.choice((10.0, 20.0, round(rng.uniform(0.1, 12), 2)))
+            selected = select(utxos, amount)
+            if selected is None:
+                continue
+            used = {(utxo.tx_id, utxo.output_index) for utxo in selected}
+            utxos = [utxo for utxo in utxos if (utxo.tx_id, utxo.output_index) not in used]
+            change = round(sum(utxo.amount for utxo in selected) - amount, 8)
+            if change > 0:
+                utxos.append(UTXO(f"change_{n}", 1, change, "sender"))
+            else:
+                changeless += 1
+            input_counts.append(len(selected))
+            peak_utxos = max(peak_utxos, len(utxos))
+        elapsed = time.perf_counter() - start
+
+        results[name] = {
+            "sends": len(input_counts),
+            "avg_inputs": sum(input_counts) / len(input_counts),
+            "max_inputs": max(input_counts),
+            "changeless": changeless,
+            "final_utxos": len(utxos),
+            "peak_utxos": peak_utxos,
+            "elapsed": elapsed
+        }
+        r = results[name]
+        print(f"   {name:16s} 평균 입력 {r['avg_inputs']:.2f} (최대 {r['max_inputs']}) | "
+              f"거스름돈 없음 {r['changeless']} | UTXO 최종 {r['final_utxos']} / 최대 {r['peak_utxos']} | "
+              f"{elapsed:.2f}초")
+    return results
+
+
+def bench_batch_payment(num_payments=500, outputs_per_tx=100):
+    """수신자 N명 송금: 건별 트랜잭션 vs 다중 출력 일괄 트랜잭션"""
+    print(f"📨 일괄 송금 vs 건별 송금 (수신자 {num_payments}명)")
+    sender = Wallet()
+    receivers = [Wallet().get_address() for _ in range(num_payments)]
+
+    def funded() -> Blockchain:
+        blockchain = Blockchain()
+        reward_txs = []
+        for i in range(num_payments):
+            reward_tx = Transaction(inputs=[], outputs=[TransactionOutput(amount=10.0, address=sender.get_address())])
+            reward_tx.tx_id = f"coinbase_{i + 2}"
+            reward_txs.append(reward_tx)
+        blockchain._update_utxo_pool(reward_txs)
+        return blockchain
+
+    results = {}
+    blockchain = funded()
+    verification_cache.clear()
+    start = time.perf_counter()
+    for receiver in receivers:
+        assert blockchain.add_transaction(blockchain.create_transaction(sender.get_address(), receiver, 1.5, sender))
+    elapsed = time.perf_counter() - start
+    results["per_payment"] = {"elapsed": elapsed, "payments_per_s": num_payments / elapsed,
+                              "transactions": len(blockchain.mempool),
+                              "bytes": blockchain.mempool.total_bytes}
+
+    blockchain = funded()
+    verification_cache.clear()
+    start = time.perf_counter()
+    for i in range(0, num_payments, outputs_per_tx):
+        payments = [(receiver, 1.5) for receiver in receivers[i:i + outputs_per_tx]]
+        assert blockchain.add_transaction(blockchain.create_batch_transaction(sender.get_address(), payments, sender))
+    elapsed = time.perf_counter() - start
+    results["batch"] = {"elapsed": elapsed, "payments_per_s": num_payments / elapsed,
+                        "transactions": len(blockchain.mempool),
+                        "bytes": blockchain.mempool.total_bytes}
+
+    # 잔액과 정확히 같은 일괄 송금 (0.1 + 0.2 = 0.3 UTXO 1개)
+    blockchain, wallet = _wallet_with_utxos([0.3])
+    exact = blockchain.create_batch_transaction(wallet.get_address(), [(receivers[0], 0.1), (receivers[1], 0.2)], wallet)
+    assert exact is not None and blockchain.add_transaction(exact), "잔액과 정확히 같은 일괄 송금이 거부됨"
+    assert len(exact.outputs) == 2, f"불필요한 거스름돈 출력: {[output.amount for output in exact.outputs]}"
+
+    for name, r in results.items():
+        print(f"   {name:12s} {r['elapsed']:.2f}초 ({r['payments_per_s']:,.0f}건/s) | "
+              f"트랜잭션 {r['transactions']}개 | {r['bytes']:,}B")
+    print(f"   속도 향상: {results['per_payment']['elapsed'] / results['batch']['elapsed']:.1f}배")
+    return results
+
+
+def bench_concurrency(duration=5.0, num_wallets=4, readers=4, senders=2, seed=42):
+    """채굴/송금과 동시에 조회했을 때의 처리량 (불변식은 tests/test_concurrency.py에서 확인)"""
+    print(f"🧵 동시성 스트레스 테스트 ({duration:.0f}초, 조회 스레드 {readers}개, 송금 스레드 {senders}개)")
+    blockchain = Blockchain()
+    wallets = [Wallet() for _ in range(num_wallets)]
+    for wallet in wallets:
+        blockchain.mine_block(wallet.get_address())
+
+    stop = threading.Event()
+    errors = []
+    counts = {"reads": 0, "sends": 0, "rejected": 0, "blocks": 0}
+    counts_lock = threading.Lock()
+
+    def count(name, n=1):
+        with counts_lock:
+            counts[name] += n
+
+    def guarded(fn):
+        def run(*args):
+            try:
+                fn(*args)
+            except Exception as e:
+                errors.append(f"{fn.__name__}: {type(e).__name__}: {e}")
+                stop.set()
+        return run
+
+    @guarded
+    def miner():
+        rng = random.Random(seed)
+        while not stop.is_set():
+            blockchain.mine_block(rng.choice(wallets).get_address())
+            count("blocks")
+
+    @guarded
+    def sender(n):
+        rng = random.Random(seed + n)
+        while not stop.is_set():
+            source, target = rng.sample(wallets, 2)
+            tx = blockchain.create_transaction(source.get_address(), target.get_address(),
+                                               round(rng.uniform(0.1, 5), 2), source)
+            # 같은 지갑에서 동시에 만든 트랜잭션은 이중 지불로 거부될 수 있음
+            if tx is not None and blockchain.add_transaction(tx):
+                count("sends")
+            else:
+                # 확정된 잔액이 없으면 다음 블록까지 잠시 대기
+                count("rejected")
+                time.sleep(0.05)
+
+    @guarded
+    def reader(n):
+        rng = random.Random(seed + 100 + n)
+        while not stop.is_set():
+            address = rng.choice(wallets).get_address()
+            blockchain.get_address_snapshot(address)
+            blockchain.get_balance(address)
+            blockchain.get_utxos(address)
+            for tx in blockchain.pending_transactions[:5]:
+                blockchain.mempool.get(tx.tx_id)
+            snapshot = blockchain.read_snapshot()
+            block = blockchain.get_block(rng.randint(1, snapshot["height"]))
+            for tx in blockchain.get_block_transactions(block)[:3]:
+                blockchain.find_transaction(tx["tx_id"])
+            count("reads")
+
+    threads = [threading.Thread(target=miner)]
+    threads += [threading.Thread(target=sender, args=(i,)) for i in range(senders)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, "\n".join(errors)
+    reads_per_s = counts["reads"] / duration
+    print(f"   블록 {counts['blocks']}개 | 송금 {counts['sends']}건 (거부 {counts['rejected']}건) | "
+          f"조회 {counts['reads']:,}회 ({reads_per_s:,.0f}회/초)")
+    return dict(counts, reads_per_s=reads_per_s)
+
+
+def _serve_app_worker(fd: int):
+    """미리 만든 리스닝 소켓을 공유하는 워커 프로세스 (pre-fork)"""
+    from werkzeug.serving import make_server
+    import app as server_app
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    make_server("127.0.0.1", 0, server_app.app, fd=fd).serve_forever()
+
+
+def bench_workers(worker_counts=(1, 2, 4, 8), duration=3.0, clients=16, num_wallets=8, seed=42):
+    """SQLite(WAL) 저장소를 공유하는 워커 프로세스 수별 초당 요청 수 (조회 위주 + 일부 송금)"""
+    import requests
+
+    print(f"🏭 워커 프로세스 수별 처리량 (클라이언트 {clients}개, 각 {duration:.0f}초, CPU {os.cpu_count()}개)")
+    workdir = tempfile.mkdtemp()
+    os.environ.update({
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(workdir, "bench.db"),
+        "MINING_WORKERS": "1",
+        "SIGNATURE_WORKERS": "1",
+    })
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.chdir(workdir)  # 저널/레거시 파일을 가져오지 않도록 빈 디렉터리에서 실행
+    import app as server_app
+
+    # 지갑마다 채굴 보상을 받아 둠 (워커들이 같은 DB에서 읽음)
+    addresses = []
+    for _ in range(num_wallets):
+        wallet = Wallet()
+        server_app.wallets[wallet.get_address()] = wallet
+        server_app.blockchain.mine_block(wallet.get_address())
+        addresses.append(wallet.get_address())
+    height = len(server_app.blockchain.chain)
+
+    results = {}
+    context = multiprocessing.get_context("fork")
+    for count in worker_counts:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(128)
+        base_url = f"http://127.0.0.1:{listener.getsockname()[1]}"
+        workers = [context.Process(target=_serve_app_worker, args=(listener.fileno(),), daemon=True)
+                   for _ in range(count)]
+        for worker in workers:
+            worker.start()
+        while True:
+            try:
+                requests.get(f"{base_url}/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.05)
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        counts_lock = threading.Lock()
+
+        def client(n):
+            rng = random.Random(seed + n)
+            session = requests.Session()
+            while not stop.is_set():
+                roll = rng.random()
+                try:
+                    if roll < 0.05:
+                        # 쓰기: 소액 송금 (잔액 부족/이중 지불 거부도 정상 응답으로 계산)
+                        sender, receiver = rng.sample(addresses, 2)
+                        response = session.post(f"{base_url}/api/transaction/send", json={
+                            "sender_address": sender, "receiver_address": receiver, "amount": 0.01})
+                        kind = "writes"
+                    elif roll < 0.6:
+                        response = session.get(f"{base_url}/api/wallet/{rng.choice(addresses)}/balance")
+                        kind = "reads"
+                    else:
+                        response = session.get(f"{base_url}/api/blockchain/block/{rng.randint(1, height)}")
+                        kind = "reads"
+                    ok = response.status_code < 500
+                except requests.RequestException:
+                    ok = False
+                with counts_lock:
+                    counts[kind if ok else "errors"] += 1
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+        listener.close()
+
+        total = counts["reads"] + counts["writes"]
+        results[count] = dict(counts, requests_per_s=total / elapsed)
+        print(f"   워커 {count}개: {total / elapsed:8,.0f} req/s (조회 {counts['reads']:,}, "
+              f"송금 {counts['writes']:,}, 오류 {counts['errors']})")
+
+    assert server_app.blockchain.utxo_pool.check_index(), "SQLite 무결성 검사 실패"
+    return results
+
+
+def _legacy_restore_wallet(private_key_hex: str) -> Wallet:
+    """이전 방식의 지갑 복원 (임시 키 생성 + 공개키/주소 재계산, 비교용)"""
+    wallet = Wallet()
+    wallet.private_key = bytes.fromhex(private_key_hex)
+    wallet.public_key = wallet._generate_public_key(wallet.private_key)
+    wallet.address = wallet._generate_address(wallet.public_key)
+    return wallet
+
+
+def bench_wallet_loading(wallet_counts=(10000, 100000), legacy_sample=1000, verify_count=2000, seed=42):
+    """지갑 로딩 시간: 이전 방식(키 재계산) vs 저장된 공개키/주소 + 지연 서명 키"""
+    print(f"👛 지갑 로딩 시간 (이전 방식은 {legacy_sample}개로 측정 후 환산)")
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in wallet_counts:
+            # 로딩 경로는 키를 검증하지 않으므로 합성 키 재료 사용 (생성에 타원 곡선 연산 불필요)
+            entries = {_random_address(rng): {"private_key": rng.randbytes(32).hex(),
+                                              "public_key": ("04" + rng.randbytes(64).hex())}
+                       for _ in range(count)}
+            path = os.path.join(workdir, f"wallets_{count}.json")
+            with open(path, "w") as f:
+                json.dump(entries, f)
+
+            start = time.perf_counter()
+            with open(path) as f:
+                loaded = json.load(f)
+            wallets = {address: Wallet.from_keys(entry["private_key"], entry["public_key"], address)
+                       for address, entry in loaded.items()}
+            fast = time.perf_counter() - start
+            assert len(wallets) == count
+
+            sample = list(loaded.values())[:legacy_sample]
+            start = time.perf_counter()
+            for entry in sample:
+                _legacy_restore_wallet(entry["private_key"])
+            legacy = (time.perf_counter() - start) * count / len(sample)
+
+            results[count] = {"legacy_s": legacy, "fast_s": fast}
+            print(f"   지갑 {count:6d}개: 이전 방식 {legacy:7.2f}초 (환산) | 저장된 키 사용 {fast:.2f}초 "
+                  f"({legacy / fast:.0f}배)")
+
+    # 첫 서명 시 서명 키 생성 비용과 백그라운드 병렬 검증
+    real = [Wallet() for _ in range(verify_count)]
+    restored = [Wallet.from_keys(w.get_private_key_hex(), w.get_public_key_hex(), w.get_address()) for w in real]
+    start = time.perf_counter()
+    restored[0].signing_key.sign_digest(b"\x00" * 20)
+    first_sign = time.perf_counter() - start
+    start = time.perf_counter()
+    mismatched = check_wallet_keys(restored)
+    verify = time.perf_counter() - start
+    assert not mismatched, "저장된 키 불일치"
+    broken = Wallet.from_keys(real[0].get_private_key_hex(), real[1].get_public_key_hex(), real[0].get_address())
+    assert check_wallet_keys([broken], workers=1) == [real[0].get_address()], "불일치 검출 실패"
+    results["first_sign_ms"] = first_sign * 1000
+    results["verify_per_s"] = verify_count / verify
+    print(f"   첫 서명(서명 키 생성 포함) {first_sign * 1000:.1f}ms | 백그라운드 키 검증 {verify_count / verify:,.0f}개/s")
+    return results
+
+
+def _percentile(samples: list, ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def bench_key_pool(pool_sizes=(0, 100), bursts=5, burst_size=50, gap=1.0):
+    """지갑 생성 요청 폭주 시 지연 시간: 요청마다 키 생성 vs 미리 생성한 키 풀"""
+    print(f"🔑 지갑 생성 지연 시간 (폭주 {burst_size}건 x {bursts}회, 간격 {gap:.1f}초)")
+    results = {}
+    for size in pool_sizes:
+        pool = KeyPool(size=size)
+        pool.start()
+        while pool.stats()["size"] < size:
+            time.sleep(0.05)
+
+        latencies = []
+        for _ in range(bursts):
+            for _ in range(burst_size):
+                start = time.perf_counter()
+                wallet = pool.pop()
+                wallet.get_address()
+                latencies.append(time.perf_counter() - start)
+            time.sleep(gap)  # 폭주 사이에 풀이 다시 채워짐
+
+        stats = pool.stats()
+        results[size] = {"p50_ms": _percentile(latencies, 0.5) * 1000, "p99_ms": _percentile(latencies, 0.99) * 1000,
+                         "hit_rate": stats["hit_rate"], "refill_rate": stats["refill_rate"]}
+        label = f"키 풀 {size}개" if size else "키 풀 없음"
+        print(f"   {label:>10}: p50 {results[size]['p50_ms']:6.3f}ms | p99 {results[size]['p99_ms']:6.2f}ms | "
+              f"적중률 {stats['hit_rate']:.0%} | 채우기 {stats['refill_rate']:,.0f}개/s")
+    return results
+
+
+def bench_chain_verify(num_blocks=60, txs_per_block=10, worker_counts=(1, 2, 4), checkpoint_every=20, seed=42):
+    """체인 전체 검증 속도 (워커 수별 초당 블록 수), 중단 후 이어서 검증, 변조 검출"""
+    print(f"🔎 체인 전체 검증 (블록 {num_blocks}개, 블록당 송금 {txs_per_block}건, CPU {os.cpu_count()}개)")
+    rng = random.Random(seed)
+    blockchain = Blockchain()
+    wallets = [Wallet() for _ in range(txs_per_block * 2)]
+    for wallet in wallets:
+        blockchain.mine_block(wallet.get_address())
+    while len(blockchain.chain) < num_blocks:
+        for source, target in zip(wallets[::2], wallets[1::2]):
+            if rng.random() < 0.5:
+                source, target = target, source
+            tx = blockchain.create_transaction(source.get_address(), target.get_address(), 0.5, source)
+            if tx is not None:
+                blockchain.add_transaction(tx)
+        blockchain.mine_block(rng.choice(wallets).get_address())
+    chain = list(blockchain.chain)
+
+    results = {}
+    for workers in worker_counts:
+        verification_cache.clear()  # 채굴 때 검증한 서명 결과를 재사용하지 않도록
+        verifier = ChainVerifier(workers=workers, checkpoint_every=checkpoint_every)
+        assert verifier.verify(chain) is None, "유효한 체인 검증 실패"
+        verifier.shutdown()
+        stats = verifier.last_stats
+        results[workers] = stats["blocks_per_second"]
+        print(f"   워커 {workers}개: {stats['blocks_per_second']:7.1f} blocks/s "
+              f"(서명 {stats['signatures']}개, {stats['elapsed']:.2f}초)")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        progress_path = os.path.join(workdir, "progress.json")
+        verification_cache.clear()
+        verifier = ChainVerifier(workers=1, checkpoint_every=checkpoint_every, progress_path=progress_path)
+        verifier.verify(chain[:num_blocks // 2])  # 절반에서 중단된 것으로 가정
+        first = verifier.last_stats["elapsed"]
+        verifier.verify(chain)
+        resumed = verifier.last_stats
+        print(f"   이어서 검증: {resumed['resumed_from']}번 블록부터 {resumed['blocks']}개 "
+              f"({first:.2f}초 + {resumed['elapsed']:.2f}초)")
+
+    # 블록 하나의 출력 금액을 바꾸고 머클 루트까지 다시 계산해도 검출되어야 함
+    tampered = json.loads(json.dumps(chain))
+    block = tampered[num_blocks // 2]
+    data = json.loads(block["data"])
+    data["transactions"][0]["outputs"][0]["amount"] += 100
+    block["data"] = json.dumps(data)
+    block["merkle_root"] = merkle_root(data["transactions"])
+    reason = ChainVerifier(workers=1).verify(tampered)
+    assert reason is not None, "변조된 체인을 검출하지 못함"
+    print(f"   변조 검출: {reason[:60]}...")
+    results["resumed_from"] = resumed["resumed_from"]
+    return results
+
+
+def bench_merkle_proof(tx_count=10000, num_proofs=1000, seed=42):
+    """블록당 트랜잭션 10k개에서 포함 증명 생성/검증 시간과 크기 (블록 전체 다운로드 대비)"""
+    print(f"🌳 머클 포함 증명 (블록당 트랜잭션 {tx_count:,}개, 증명 {num_proofs}개)")
+    rng = random.Random(seed)
+
+    # 홀수 층(마지막 항목 복제)을 포함한 여러 크기에서 모든 위치의 증명이 루트와 맞는지 확인
+    for size in (1, 2, 3, 5, 7, 100, 1001):
+        txs = [tx.to_dict() for tx in _synthetic_transactions(rng, size)]
+        levels = merkle_levels(txs)
+        assert levels[-1][0] == merkle_root(txs)
+        for position, tx in enumerate(txs):
+            assert verify_merkle_proof(merkle_leaf(tx), merkle_proof(levels, position), levels[-1][0]), \
+                f"포함 증명 실패 (크기 {size}, 위치 {position})"
+
+    blockchain = Blockchain()
+    blockchain.validate_blocks = False  # 합성 트랜잭션: 포함 증명만 확인
+    for tx in _synthetic_transactions(rng, tx_count - 1):
+        blockchain.mempool.add(tx, fee=0.0)
+    block = blockchain.mine_block("1BenchMiner")
+    block_bytes = len(json.dumps(block))
+    tx_ids = [tx["tx_id"] for tx in blockchain.get_block_transactions(block)]
+    root = block["merkle_root"]
+
+    # 트리 생성 (블록 파싱 + 리프/내부 노드 해싱), 블록마다 처음 한 번
+    merkle_tree_cache.clear()
+    start = time.perf_counter()
+    first = blockchain.get_transaction_proof(tx_ids[0])
+    cold = time.perf_counter() - start
+
+    # 캐시된 트리에서 증명 생성
+    sample = rng.sample(tx_ids, num_proofs)
+    start = time.perf_counter()
+    proofs = [blockchain.get_transaction_proof(tx_id) for tx_id in sample]
+    warm = (time.perf_counter() - start) / num_proofs
+
+    # 클라이언트 검증 (리프 해시 + 형제 해시 결합)
+    start = time.perf_counter()
+    for found in proofs:
+        assert verify_merkle_proof(merkle_leaf(found["transaction"]), found["proof"], root), "포함 증명 검증 실패"
+    verify = (time.perf_counter() - start) / num_proofs
+
+    proof_bytes = len(json.dumps(first))
+    print(f"   트리 생성(첫 요청) {cold * 1000:.1f}ms | 증명 생성 {warm * 1e6:.1f}us | 검증 {verify * 1e6:.1f}us")
+    print(f"   증명 크기 {proof_bytes:,}B (형제 해시 {len(first['proof'])}개) vs 블록 {block_bytes:,}B "
+          f"({block_bytes / proof_bytes:,.0f}배 작음)")
+    return {"tree_ms": cold * 1000, "proof_us": warm * 1e6, "verify_us": verify * 1e6,
+            "proof_bytes": proof_bytes, "block_bytes": block_bytes}
+
+
+def bench_metrics(iterations=200000, routes=30):
+    """지표 기록 비용 (카운터/히스토그램 1회) 과 /metrics 출력 시간, 캐시된 서명 검증 대비 비율"""
+    print(f"📏 지표 기록 오버헤드 ({iterations:,}회)")
+    registry = Registry()
+    counter = registry.counter("bench_total", "benchmark counter", ("result",))
+    histogram = registry.histogram("bench_seconds", "benchmark histogram", ("method", "route", "status"))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        counter.inc(labels=("valid",))
+    counter_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    labels = ("GET", "/api/wallet/<address>/balance", "200")
+    start = time.perf_counter()
+    for i in range(iterations):
+        histogram.observe((i % 1000) / 10000, labels)
+    histogram_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    # 요청 하나에 붙는 비용 (시작 시각 + 라벨 조립 + 기록)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        request_start = time.perf_counter()
+        histogram.observe(time.perf_counter() - request_start, ("GET", "/health", str(200)))
+    request_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    # 가장 빠른 핫 패스(캐시된 서명 검증)와 비교
+    blockchain, wallets = _funded_blockchain(1)
+    tx = blockchain.create_transaction(wallets[0].get_address(), "1BenchReceiver", 1.0, wallets[0])
+    utxo = blockchain.utxo_pool.get_utxos_by_address(wallets[0].get_address())[0]
+    digest = tx.signing_digest()
+    tx.verify_input(0, utxo, digest)
+    start = time.perf_counter()
+    for _ in range(iterations // 10):
+        tx.verify_input(0, utxo, digest)
+    cached_verify_ns = (time.perf_counter() - start) / (iterations // 10) * 1e9
+
+    for i in range(routes):
+        for status in ("200", "400", "404"):
+            histogram.observe(0.001, ("GET", f"/api/route{i}", status))
+    start = time.perf_counter()
+    text = registry.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(f"   카운터 {counter_ns:.0f}ns | 히스토그램 {histogram_ns:.0f}ns | 요청당 {request_ns:.0f}ns")
+    print(f"   캐시된 서명 검증 {cached_verify_ns / 1000:.1f}us (캐시 적중은 별도 기록 없음, 카운터 1회는 {counter_ns / cached_verify_ns:.0%} 해당)")
+    print(f"   /metrics 출력 {render_ms:.2f}ms ({len(text.splitlines())}줄, 라벨 조합 {routes * 3 + 1}개)")
+    return {"counter_ns": counter_ns, "histogram_ns": histogram_ns, "request_ns": request_ns,
+            "render_ms": render_ms}
+
+
+def _timed_per_call(fn, count: int) -> float:
+    """fn을 count번 실행한 평균 시간 (초)"""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count
+
+
+def bench_core(utxo_counts=(1000, 100000, 1000000), block_tx_counts=(1, 100, 1000), iterations=200,
+               lookups=10000, pow_blocks=5, seed=42):
+    """핵심 경로 마이크로 벤치마크 (지갑 생성, 서명/검증, 고정 난이도 작업 증명, UTXO 조회, 블록 채굴)"""
+    print(f"⚙️  핵심 경로 (UTXO {', '.join(f'{n:,}' for n in utxo_counts)}개, "
+          f"블록당 트랜잭션 {', '.join(map(str, block_tx_counts))}개)")
+    rng = random.Random(seed)
+    results = {}
+
+    start = time.perf_counter()
+    wallets = [Wallet() for _ in range(iterations)]
+    results["wallet_create_us"] = (time.perf_counter() - start) / iterations * 1e6
+
+    # 입력 하나짜리 트랜잭션 서명/검증 (검증 캐시를 비운 상태와 채운 상태)
+    utxos = [UTXO(f"{i:064x}", 0, 10.0, wallet.get_address()) for i, wallet in enumerate(wallets)]
+    transactions = [Transaction([TransactionInput(utxo.tx_id, 0, "", wallet.get_public_key_hex())],
+                                [TransactionOutput(9.0, _random_address(rng))])
+                    for wallet, utxo in zip(wallets, utxos)]
+    start = time.perf_counter()
+    for tx, wallet in zip(transactions, wallets):
+        tx.sign_input(0, wallet.get_private_key_hex())
+    results["sign_input_us"] = (time.perf_counter() - start) / iterations * 1e6
+    verification_cache.clear()
+    for label in ("verify_input_us", "verify_input_cached_us"):
+        start = time.perf_counter()
+        for tx, utxo in zip(transactions, utxos):
+            assert tx.verify_input(0, utxo), "서명 검증 실패"
+        results[label] = (time.perf_counter() - start) / iterations * 1e6
+
+    # 고정 입력의 작업 증명 (nonce 수가 항상 같으므로 시간 비교 가능)
+    blockchain = Blockchain()
+    attempts = 0
+    start = time.perf_counter()
+    for index in range(2, 2 + pow_blocks):
+        blockchain._proof_of_work(1, index, block_header(2, f"{index:064x}", f"{seed:064x}"))
+        attempts += blockchain.last_mining_stats["attempts"]
+    elapsed = time.perf_counter() - start
+    results["pow_fixed_ms"] = elapsed / pow_blocks * 1000
+    results["pow_us_per_attempt"] = elapsed / attempts * 1e6
+
+    for count in utxo_counts:
+        pool = UTXOPool()
+        addresses = [_random_address(rng) for _ in range(max(1, count // 10))]
+        entries = [UTXO(f"{i:064x}", i % 4, float(rng.randint(1, 100)), addresses[i % len(addresses)])
+                   for i in range(count)]
+        start = time.perf_counter()
+        for utxo in entries:
+            pool.add_utxo(utxo)
+        add_us = (time.perf_counter() - start) / count * 1e6
+        probes = [rng.choice(entries) for _ in range(lookups)]
+        start = time.perf_counter()
+        for utxo in probes:
+            pool.get_utxo(utxo.tx_id, utxo.output_index)
+        lookup_us = (time.perf_counter() - start) / lookups * 1e6
+        start = time.perf_counter()
+        for utxo in probes:
+            pool.get_utxos_by_address(utxo.address)
+            pool.get_balance(utxo.address)
+        address_us = (time.perf_counter() - start) / lookups * 1e6
+        start = time.perf_counter()
+        for utxo in probes[:count]:
+            pool.remove_utxo(utxo.tx_id, utxo.output_index)
+        remove_us = (time.perf_counter() - start) / min(count, lookups) * 1e6
+        results[f"utxos_{count}"] = {"add_us": add_us, "lookup_us": lookup_us,
+                                     "address_lookup_us": address_us, "remove_us": remove_us}
+        print(f"   UTXO {count:>9,}개: 추가 {add_us:.2f}us | 조회 {lookup_us:.2f}us | "
+              f"주소 조회 {address_us:.2f}us | 삭제 {remove_us:.2f}us")
+        del pool, entries
+
+    # 블록 채굴: 작업 증명은 운에 따라 달라지므로 nonce 1회당 시간과 작업 증명 외 시간으로 나눠 기록
+    for count in block_tx_counts:
+        blockchain = Blockchain()
+        blockchain.validate_blocks = False  # 합성 트랜잭션: 블록 조립/작업 증명 비용만 측정
+        for tx in _synthetic_transactions(rng, count):
+            blockchain.mempool.add(tx, fee=0.0)
+        start = time.perf_counter()
+        blockchain.mine_block("1BenchMiner")
+        total = time.perf_counter() - start
+        stats = blockchain.last_mining_stats
+        results[f"block_{count}"] = {"mine_overhead_ms": (total - stats["elapsed"]) * 1000,
+                                     "pow_us_per_attempt": stats["elapsed"] / stats["attempts"] * 1e6}
+        print(f"   블록 트랜잭션 {count:5d}개: 작업 증명 외 {results[f'block_{count}']['mine_overhead_ms']:.1f}ms "
+              f"| nonce당 {results[f'block_{count}']['pow_us_per_attempt']:.2f}us")
+
+    print(f"   지갑 생성 {results['wallet_create_us']:.0f}us | 서명 {results['sign_input_us']:.0f}us | "
+          f"검증 {results['verify_input_us']:.0f}us (캐시 {results['verify_input_cached_us']:.1f}us) | "
+          f"고정 작업 증명 {results['pow_fixed_ms']:.0f}ms")
+    return results
+
+
+def _api_benchmark_job(num_senders: int, requests_per_route: int, num_blocks: int) -> dict:
+    """빈 작업 디렉터리에서 app을 불러와 Flask 테스트 클라이언트로 경로별 지연 시간 측정 (별도 프로세스)"""
+    os.environ.update({"SECRET_KEY": "benchmark", "STORAGE_BACKEND": "json", "MINING_WORKERS": "1",
+                       "SIGNATURE_WORKERS": "1", "KEY_POOL_SIZE": "0"})
+    os.chdir(tempfile.mkdtemp())
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    import app as server_app
+    server_app.load_data()
+    client = server_app.app.test_client()
+
+    # 송금용 UTXO 준비: 채굴 보상을 작은 UTXO 여러 개로 나눔
+    funder = client.post("/api/wallet/create").get_json()["data"]["address"]
+    receiver = client.post("/api/wallet/create").get_json()["data"]["address"]
+    for _ in range(num_blocks):
+        client.post("/api/mine", json={"miner_address": funder})
+    split = server_app.blockchain.create_batch_transaction(
+        funder, [(funder, 0.04)] * num_senders, server_app.wallets[funder])
+    assert split is not None and server_app.blockchain.add_transaction(split), "UTXO 분할 실패"
+    client.post("/api/mine", json={"miner_address": receiver})
+    sent = client.post("/api/transaction/send", json={
+        "sender_address": funder, "receiver_address": receiver, "amount": 0.01}).get_json()
+    tx_id = sent["data"]["transaction_id"]
+    client.post("/api/mine", json={"miner_address": receiver})
+
+    routes = [
+        ("health", "GET", "/health", None),
+        ("stats", "GET", "/api/stats", None),
+        ("balance", "GET", f"/api/wallet/{funder}/balance", None),
+        ("utxos", "GET", f"/api/wallet/{receiver}/utxos", None),
+        ("blockchain_page", "GET", "/api/blockchain?order=desc&limit=10", None),
+        ("block", "GET", "/api/blockchain/block/2", None),
+        ("transaction", "GET", f"/api/transaction/{tx_id}", None),
+        ("transaction_proof", "GET", f"/api/transaction/{tx_id}/proof", None),
+        ("metrics", "GET", "/metrics", None),
+        ("wallet_create", "POST", "/api/wallet/create", None),
+        ("transaction_send", "POST", "/api/transaction/send",
+         {"sender_address": funder, "receiver_address": receiver, "amount": 0.01}),
+    ]
+    results = {}
+    for name, method, path, body in routes:
+        count = min(requests_per_route, num_senders - 2) if name == "transaction_send" else requests_per_route
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, f"{name}: {response.status_code} {response.get_data(as_text=True)[:200]}"
+        results[name] = {"mean_us": sum(latencies) / len(latencies) * 1e6,
+                         "p99_us": _percentile(latencies, 0.99) * 1e6}
+
+    results["save_data_ms"] = _timed_per_call(server_app.save_data, 5) * 1000
+    results["load_data_ms"] = _timed_per_call(lambda: server_app._load_files(Blockchain(), {}), 5) * 1000
+    server_app.journal.close()
+    return results
+
+
+def bench_api(num_senders=200, requests_per_route=200, num_blocks=2):
+    """Flask 테스트 클라이언트로 API 경로별 지연 시간과 save_data/load_data 시간 (별도 프로세스에서 실행)"""
+    print(f"🌐 API 경로 지연 시간 (경로당 요청 {requests_per_route}회)")
+    # app은 import 시점의 환경 변수/작업 디렉터리로 전역 상태를 만들므로 새 프로세스에서 불러옴
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        results = pool.apply(_api_benchmark_job, (num_senders, requests_per_route, num_blocks))
+    for name, row in results.items():
+        if isinstance(row, dict):
+            print(f"   {name:18s}: 평균 {row['mean_us']:8.1f}us | p99 {row['p99_us']:8.1f}us")
+    print(f"   save_data {results['save_data_ms']:.2f}ms | load_data {results['load_data_ms']:.2f}ms")
+    return results
+
+
+def _replay_spending_chain(blockchain: Blockchain, rng: random.Random, num_utxos: int, spends_per_block: int = 50):
+    """UTXO가 num_utxos개가 될 때까지 코인베이스 + 기존 UTXO를 쓰는 트랜잭션 블록을 재생 (서명/작업 증명 없음)"""
+    addresses = [_random_address(rng) for _ in range(max(10, num_utxos // 5))]
+    outpoints = []
+    index = len(blockchain.chain) + 1
+    while len(outpoints) < num_utxos:
+        coinbase = Transaction(inputs=[], outputs=[TransactionOutput(10.0, rng.choice(addresses))])
+        coinbase.tx_id = f"coinbase_{index}"
+        transactions = [coinbase]
+        spent = [outpoints.pop(rng.randrange(len(outpoints))) for _ in range(min(spends_per_block, len(outpoints)))]
+        for j, (tx_id, output_index, amount) in enumerate(spent):
+            half = round(amount / 2, 8)
+            tx = Transaction(inputs=[TransactionInput(tx_id, output_index, "", "")],
+                             outputs=[TransactionOutput(half, rng.choice(addresses)),
+                                      TransactionOutput(round(amount - half, 8), rng.choice(addresses))])
+            tx.tx_id = f"spend_{index}_{j}"
+            transactions.append(tx)
+        for tx in transactions:
+            outpoints.extend((tx.tx_id, i, output.amount) for i, output in enumerate(tx.outputs))
+        data = json.dumps({"transactions": [tx.to_dict() for tx in transactions]})
+        previous_hash = blockchain._hash(blockchain.get_previous_block())
+        blockchain.replay_block(blockchain._create_block(data, index, previous_hash, index))
+        index += 1
+
+
+def bench_chain_stats(utxo_counts=(1000, 100000), sqlite_utxo_counts=(1000, 20000), reads=200, seed=42):
+    """/api/stats 집계: UTXO 전체 합산 vs 증분 유지 통계 (메모리/SQLite), 처음부터 재계산한 값과 비교"""
+    print(f"📈 체인 통계 조회 (조회 {reads}회 평균)")
+    rng = random.Random(seed)
+    results = {}
+    backends = [("memory", count) for count in utxo_counts] + [("sqlite", count) for count in sqlite_utxo_counts]
+    for backend, count in backends:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteStore(os.path.join(tmp, "chain.db")) if backend == "sqlite" else None
+            blockchain = Blockchain(store=store)
+            start = time.perf_counter()
+            _replay_spending_chain(blockchain, rng, count)
+            build_s = time.perf_counter() - start
+
+            def full_scan():
+                snapshot = blockchain.read_snapshot()
+                return len(snapshot["utxos"]), sum(utxo.amount for utxo in snapshot["utxos"])
+
+            scan_s = _timed_per_call(full_scan, max(1, reads // 20))
+            incremental_s = _timed_per_call(blockchain.chain_stats, reads)
+            start = time.perf_counter()
+            assert blockchain.check_chain_stats(), "증분 통계가 체인 재계산 결과와 불일치"
+            assert blockchain.utxo_pool.check_index(), "UTXO 통계가 UTXO 풀과 불일치"
+            recompute_s = time.perf_counter() - start
+            stats = blockchain.chain_stats()
+
+        results[f"{backend}_{count}"] = {"full_scan_ms": scan_s * 1000, "incremental_us": incremental_s * 1e6,
+                                         "recompute_ms": recompute_s * 1000,
+                                         "build_ms_per_block": build_s / stats["height"] * 1000}
+        print(f"   {backend:6s} UTXO {stats['utxo_count']:>7,}개 (블록 {stats['height']:,}개): "
+              f"전체 합산 {scan_s * 1000:8.2f}ms | 증분 {incremental_s * 1e6:7.1f}us | "
+              f"재계산 확인 {recompute_s * 1000:.0f}ms ✅")
+    return results
+
+
+BENCHMARKS = {
+    "utxo_index": bench_utxo_index,
+    "parallel_pow": bench_parallel_pow,
+    "block_size_pow": bench_block_size_pow,
+    "persistence": bench_persistence,
+    "startup": bench_startup,
+    "verification_cache": bench_verification_cache,
+    "sighash": bench_sighash,
+    "binary_codec": bench_binary_codec,
+    "coin_selection": bench_coin_selection,
+    "batch_payment": bench_batch_payment,
+    "concurrency": bench_concurrency,
+    "workers": bench_workers,
+    "wallet_loading": bench_wallet_loading,
+    "key_pool": bench_key_pool,
+    "chain_verify": bench_chain_verify,
+    "merkle_proof": bench_merkle_proof,
+    "metrics": bench_metrics,
+    "batch_verify": bench_batch_verify,
+    "core": bench_core,
+    "api": bench_api,
+    "chain_stats": bench_chain_stats,
+}
+
+# --scale 별 매개변수 (지정하지 않은 벤치마크는 기본값)
+# 기본 규모도 UTXO 100만 개 조회를 포함하므로 기본 실행만으로 회귀 검사 가능 (quick은 빠른 확인용)
+# --baseline 비교는 양쪽에 모두 있는 지표만 대상이므로 기준 결과와 같은 --scale로 실행해야 함
+# pytest(tests/test_benchmark_regression.py)는 작은 설정으로 같은 비교 로직을 확인 (BENCHMARK_BASELINE 지정 시 quick 기준과 비교)
+SCALES = {
+    "quick": {
+        "core": {"utxo_counts": (1000,), "block_tx_counts": (1, 100), "iterations": 50, "pow_blocks": 2},
+        "api": {"num_senders": 50, "requests_per_route": 50},
+        "chain_stats": {"utxo_counts": (1000,), "sqlite_utxo_counts": (1000,)},
+    },
+    "default": {},
+    "full": {
+        "core": {"iterations": 1000, "lookups": 100000},
+        "api": {"num_senders": 500, "requests_per_route": 500},
+        "chain_stats": {"utxo_counts": (1000, 100000, 1000000), "sqlite_utxo_counts": (1000, 100000)},
+    },
+}
+
+
+def _flatten(value, prefix: str = "") -> Dict[str, float]:
+    """중첩된 결과를 "벤치마크.키.하위키" -> 숫자 로 펼침"""
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: float(value)}
+    return {}
+
+
+def _direction(metric: str) -> Optional[str]:
+    """지표 이름의 단위로 비교 방향 결정 (시간은 낮을수록, 처리량은 높을수록 좋음, 그 외는 비교하지 않음)"""
+    key = metric.rsplit(".", 1)[-1]
+    if key.endswith(("_per_s", "per_second", "hashrate", "_rate")):
+        return "higher"
+    # 시간 단위로 끝나거나 "<시간 단위>_per_<대상>" 형태 (us_per_attempt, pow_us_per_attempt, build_ms_per_block)
+    parts = key.split("_")
+    for i, part in enumerate(parts):
+        if part in ("s", "ms", "us", "ns") and (i == len(parts) - 1 or parts[i + 1] == "per"):
+            return "lower"
+    return None
+
+
+def compare_with_baseline(current: Dict[str, float], baseline: Dict[str, float], max_regression: float) -> list:
+    """기준 결과 대비 max_regression(비율) 이상 나빠진 지표 목록 [(지표, 기준, 현재, 변화율)]"""
+    regressions = []
+    for metric, value in sorted(current.items()):
+        direction = _direction(metric)
+        base = baseline.get(metric)
+        if direction is None or base is None or base <= 0 or value <= 0:
+            continue
+        # 나빠진 비율 (양수면 느려짐/처리량 감소)
+        change = value / base - 1 if direction == "lower" else base / value - 1
+        marker = "❌" if change > max_regression else ("✅" if change < -max_regression else "  ")
+        print(f"   {marker} {metric:55s} {base:12.4g} -> {value:12.4g} ({change:+.0%})")
+        if change > max_regression:
+            regressions.append((metric, base, value, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitcoin UTXO 블록체인 벤치마크")
+    parser.add_argument("names", nargs="*", default=list(BENCHMARKS),
+                        help=f"실행할 벤치마크 ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--scale", choices=list(SCALES), default="default", help="core/api 벤치마크 규모")
+    parser.add_argument("--json", help="결과를 기록할 JSON 파일 (다음 실행의 --baseline으로 사용)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일 (같은 --scale로 기록한 결과)")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="허용하는 최대 성능 저하 비율 (기본 0.25 = 25%%), 넘으면 종료 코드 1")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.names:
+        print("=" * 50)
+        results[name] = BENCHMARKS[name](**SCALES[args.scale].get(name, {}))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": args.scale,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+        "metrics": _flatten(results)
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"📝 결과 기록: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != args.scale or baseline.get("cpu_count") != os.cpu_count():
+            print(f"⚠️  기준 결과와 실행 환경이 다름 (scale {baseline.get('scale')}, CPU {baseline.get('cpu_count')})")
+        print("=" * 50)
+        print(f"📊 기준 결과 대비 (허용 저하 {args.max_regression:.0%})")
+        regressions = compare_with_baseline(report["metrics"], baseline.get("metrics", {}), args.max_regression)
+        if regressions:
+            print(f"❌ 성능 저하 {len(regressions)}건")
+            sys.exit(1)
+        print("✅ 성능 저하 없음")
@@ -0,0 +1,324 @@
+import json
+import struct
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+import base58
+
+from bitcoin_utxo import Transaction, TransactionInput, TransactionOutput
+
+WIRE_VERSION = 1
+SATOSHI = 10 ** 8
+
+# 금액 태그 (varint 하위 2비트)
+_AMOUNT_SATOSHI = 0  # float 금액을 사토시 정수로 표현 가능
+_AMOUNT_INT = 1      # int 금액 (zigzag)
+_AMOUNT_DOUBLE = 2   # 사토시로 표현 불가능한 float -> 8바이트 IEEE 754
+
+# 블록 data 태그
+_DATA_TRANSACTIONS = 0
+_DATA_RAW = 1
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class DecodeError(ValueError):
+    """바이너리 데이터 해석 실패"""
+
+
+# ---- 기본 필드 ----
+
+def _write_varint(buf: bytearray, value: int):
+    while value >= 0x80:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+def _read_varint(view: memoryview, pos: int) -> Tuple[int, int]:
+    if pos < len(view) and view[pos] < 0x80:
+        return view[pos], pos + 1
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(view):
+            raise DecodeError("Truncated varint")
+        byte = view[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def _take(view: memoryview, pos: int, length: int) -> Tuple[memoryview, int]:
+    """복사 없이 memoryview 조각 반환"""
+    end = pos + length
+    if end > len(view):
+        raise DecodeError("Truncated field")
+    return view[pos:end], end
+
+def _write_text(buf: bytearray, text: str):
+    raw = text.encode('utf-8')
+    _write_varint(buf, len(raw))
+    buf += raw
+
+def _read_text(view: memoryview, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(view, pos)
+    raw, pos = _take(view, pos, length)
+    return str(raw, 'utf-8'), pos
+
+def _write_hex(buf: bytearray, text: str):
+    """해시/서명/공개키: 소문자 hex면 원시 바이트(32/64/65바이트), 아니면 문자열 그대로"""
+    try:
+        raw = bytes.fromhex(text)
+    except ValueError:
+        raw = None
+    if raw is not None and raw.hex() == text:
+        _write_varint(buf, len(raw) << 1)
+        buf += raw
+    else:
+        raw = text.encode('utf-8')
+        _write_varint(buf, (len(raw) << 1) | 1)
+        buf += raw
+
+def _read_hex(view: memoryview, pos: int) -> Tuple[str, int]:
+    header, pos = _read_varint(view, pos)
+    raw, pos = _take(view, pos, header >> 1)
+    return (str(raw, 'utf-8') if header & 1 else raw.hex()), pos
+
+@lru_cache(maxsize=65536)
+def _address_to_raw(address: str) -> Union[bytes, None]:
+    """Base58 디코딩 (다시 인코딩했을 때 원문과 같을 때만), 주소는 반복되므로 캐시"""
+    try:
+        raw = base58.b58decode(address)
+    except ValueError:
+        return None
+    if not address or base58.b58encode(raw).decode() != address:
+        return None
+    return raw
+
+@lru_cache(maxsize=65536)
+def _raw_to_address(raw: bytes) -> str:
+    return base58.b58encode(raw).decode()
+
+def _write_address(buf: bytearray, address: str):
+    """Base58 주소는 디코딩된 25바이트로, 그 외 문자열은 그대로 기록"""
+    raw = _address_to_raw(address)
+    if raw is not None:
+        _write_varint(buf, len(raw) << 1)
+        buf += raw
+    else:
+        raw = address.encode('utf-8')
+        _write_varint(buf, (len(raw) << 1) | 1)
+        buf += raw
+
+def _read_address(view: memoryview, pos: int) -> Tuple[str, int]:
+    header, pos = _read_varint(view, pos)
+    raw, pos = _take(view, pos, header >> 1)
+    return (str(raw, 'utf-8') if header & 1 else _raw_to_address(raw.tobytes())), pos
+
+def _write_amount(buf: bytearray, amount: Union[int, float]):
+    """금액은 사토시 정수로 기록 (표현 불가능한 float만 8바이트 원본 유지)"""
+    if isinstance(amount, int) and not isinstance(amount, bool):
+        zigzag = (amount << 1) if amount >= 0 else ((-amount << 1) - 1)
+        _write_varint(buf, (zigzag << 2) | _AMOUNT_INT)
+        return
+    sats = round(amount * SATOSHI) if amount == amount and abs(amount) < 2 ** 52 else None
+    if sats is not None and sats >= 0 and sats / SATOSHI == amount and str(sats / SATOSHI) == str(amount):
+        _write_varint(buf, (sats << 2) | _AMOUNT_SATOSHI)
+    else:
+        _write_varint(buf, _AMOUNT_DOUBLE)
+        buf += struct.pack('<d', amount)
+
+def _read_amount(view: memoryview, pos: int) -> Tuple[Union[int, float], int]:
+    header, pos = _read_varint(view, pos)
+    tag = header & 3
+    value = header >> 2
+    if tag == _AMOUNT_SATOSHI:
+        return value / SATOSHI, pos
+    if tag == _AMOUNT_INT:
+        return ((value >> 1) if not value & 1 else -((value + 1) >> 1)), pos
+    if tag == _AMOUNT_DOUBLE:
+        raw, pos = _take(view, pos, 8)
+        return struct.unpack('<d', raw)[0], pos
+    raise DecodeError(f"Unknown amount tag: {tag}")
+
+
+# ---- 트랜잭션 ----
+
+def _write_input(buf: bytearray, inp: TransactionInput):
+    _write_hex(buf, inp.prev_tx_id)
+    _write_varint(buf, inp.output_index)
+    _write_hex(buf, inp.signature)
+    _write_hex(buf, inp.public_key)
+
+def _read_input(view: memoryview, pos: int) -> Tuple[TransactionInput, int]:
+    prev_tx_id, pos = _read_hex(view, pos)
+    output_index, pos = _read_varint(view, pos)
+    signature, pos = _read_hex(view, pos)
+    public_key, pos = _read_hex(view, pos)
+    return TransactionInput(prev_tx_id, output_index, signature, public_key), pos
+
+def _write_output(buf: bytearray, out: TransactionOutput):
+    _write_amount(buf, out.amount)
+    _write_address(buf, out.address)
+
+def _read_output(view: memoryview, pos: int) -> Tuple[TransactionOutput, int]:
+    amount, pos = _read_amount(view, pos)
+    address, pos = _read_address(view, pos)
+    return TransactionOutput(amount, address), pos
+
+def _write_transaction(buf: bytearray, tx: Transaction):
+    _write_hex(buf, tx.tx_id)
+    _write_varint(buf, len(tx.inputs))
+    for inp in tx.inputs:
+        _write_input(buf, inp)
+    _write_varint(buf, len(tx.outputs))
+    for out in tx.outputs:
+        _write_output(buf, out)
+
+def _read_transaction(view: memoryview, pos: int) -> Tuple[Transaction, int]:
+    tx_id, pos = _read_hex(view, pos)
+    count, pos = _read_varint(view, pos)
+    inputs = []
+    for _ in range(count):
+        inp, pos = _read_input(view, pos)
+        inputs.append(inp)
+    count, pos = _read_varint(view, pos)
+    outputs = []
+    for _ in range(count):
+        out, pos = _read_output(view, pos)
+        outputs.append(out)
+    # 저장된 tx_id를 그대로 사용 (해시 재계산 없음)
+    tx = Transaction.__new__(Transaction)
+    tx.inputs = inputs
+    tx.outputs = outputs
+    tx.tx_id = tx_id
+    return tx, pos
+
+
+# ---- 버전 헤더가 붙은 공개 함수 ----
+
+def _check_version(view: memoryview) -> int:
+    if not len(view):
+        raise DecodeError("Empty buffer")
+    if view[0] != WIRE_VERSION:
+        raise DecodeError(f"Unsupported wire version: {view[0]}")
+    return 1
+
+def _finish(view: memoryview, pos: int):
+    if pos != len(view):
+        raise DecodeError(f"Trailing bytes: {len(view) - pos}")
+
+def encode_input(inp: TransactionInput) -> bytes:
+    buf = bytearray([WIRE_VERSION])
+    _write_input(buf, inp)
+    return bytes(buf)
+
+def decode_input(data: Buffer) -> TransactionInput:
+    view = memoryview(data)
+    inp, pos = _read_input(view, _check_version(view))
+    _finish(view, pos)
+    return inp
+
+def encode_output(out: TransactionOutput) -> bytes:
+    buf = bytearray([WIRE_VERSION])
+    _write_output(buf, out)
+    return bytes(buf)
+
+def decode_output(data: Buffer) -> TransactionOutput:
+    view = memoryview(data)
+    out, pos = _read_output(view, _check_version(view))
+    _finish(view, pos)
+    return out
+
+def encode_transaction(tx: Transaction) -> bytes:
+    """트랜잭션을 바이너리로 인코딩"""
+    buf = bytearray([WIRE_VERSION])
+    _write_transaction(buf, tx)
+    return bytes(buf)
+
+def decode_transaction(data: Buffer) -> Transaction:
+    """바이너리에서 트랜잭션 복원 (memoryview 기반, 원시 필드 복사 없음)"""
+    view = memoryview(data)
+    tx, pos = _read_transaction(view, _check_version(view))
+    _finish(view, pos)
+    return tx
+
+def _parse_block_transactions(data: str) -> Union[List[Transaction], None]:
+    """data 문자열을 트랜잭션으로 되돌렸을 때 원문이 그대로 재현되는 경우에만 반환"""
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict) or list(parsed) != ["transactions"]:
+        return None
+    try:
+        transactions = [Transaction.from_dict(tx) for tx in parsed["transactions"]]
+    except (KeyError, TypeError):
+        return None
+    if json.dumps({"transactions": [tx.to_dict() for tx in transactions]}) != data:
+        return None
+    return transactions
+
+def encode_block(block: dict) -> bytes:
+    """블록을 바이너리로 인코딩 (data 안의 JSON 트랜잭션도 바이너리로)"""
+    buf = bytearray([WIRE_VERSION])
+    _write_varint(buf, block["index"])
+    _write_text(buf, block["timestamp"])
+    _write_varint(buf, block["proof"])
+    _write_hex(buf, block["previous_hash"])
+    version = block.get("version", 0)  # 0: 레거시 블록 (version 필드 없음)
+    _write_varint(buf, version)
+    if version:
+        _write_hex(buf, block["merkle_root"])
+
+    transactions = _parse_block_transactions(block["data"])
+    if transactions is None:
+        # Genesis 등 트랜잭션 형식이 아닌 data는 원문 그대로
+        _write_varint(buf, _DATA_RAW)
+        _write_text(buf, block["data"])
+    else:
+        _write_varint(buf, _DATA_TRANSACTIONS)
+        _write_varint(buf, len(transactions))
+        for tx in transactions:
+            _write_transaction(buf, tx)
+    return bytes(buf)
+
+def decode_block(data: Buffer) -> dict:
+    """바이너리에서 블록 dict 복원 (기존 블록과 동일한 형태와 해시)"""
+    view = memoryview(data)
+    pos = _check_version(view)
+    index, pos = _read_varint(view, pos)
+    timestamp, pos = _read_text(view, pos)
+    proof, pos = _read_varint(view, pos)
+    previous_hash, pos = _read_hex(view, pos)
+    version, pos = _read_varint(view, pos)
+    merkle_root_hash = None
+    if version:
+        merkle_root_hash, pos = _read_hex(view, pos)
+
+    data_tag, pos = _read_varint(view, pos)
+    if data_tag == _DATA_RAW:
+        block_data, pos = _read_text(view, pos)
+    elif data_tag == _DATA_TRANSACTIONS:
+        count, pos = _read_varint(view, pos)
+        transactions = []
+        for _ in range(count):
+            tx, pos = _read_transaction(view, pos)
+            transactions.append(tx.to_dict())
+        block_data = json.dumps({"transactions": transactions})
+    else:
+        raise DecodeError(f"Unknown block data tag: {data_tag}")
+    _finish(view, pos)
+
+    block = {
+        "index": index,
+        "timestamp": timestamp,
+        "data": block_data,
+        "proof": proof,
+        "previous_hash": previous_hash
+    }
+    if version:
+        block["version"] = version
+        block["merkle_root"] = merkle_root_hash
+    return block
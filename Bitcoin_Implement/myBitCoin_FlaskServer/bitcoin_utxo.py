@@ -3,9 +3,242 @@ import ecdsa
 import hashlib
 import base58
 import json
+import time
+import heapq
+import threading
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
 import datetime as _dt
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from metrics import registry
+
+BLOCK_VERSION = 2  # 1: data 전체를 작업 증명에 사용 (레거시), 2: 머클 루트 헤더 사용
+UTXO_SNAPSHOT_VERSION = 1
+BLOCK_REWARD = 10.0  # 코인베이스 채굴 보상
+
+def _double_sha256(data: str) -> str:
+    return hashlib.sha256(hashlib.sha256(data.encode('utf-8')).digest()).hexdigest()
+
+def merkle_leaf(transaction: dict) -> str:
+    """트랜잭션 전체 내용을 리프로 사용 (코인베이스 출력까지 커밋)"""
+    return _double_sha256(json.dumps(transaction, sort_keys=True))
+
+def merkle_levels(transactions: List[dict]) -> List[List[str]]:
+    """리프부터 루트까지 머클 트리의 모든 층 (Lecture1 merkle_tree 기반, 포함 증명 생성용)"""
+    current_layer = [merkle_leaf(tx) for tx in transactions]
+    if not current_layer:
+        return [[_double_sha256("")]]
+
+    levels = [current_layer]
+    while len(current_layer) > 1:
+        # 홀수 개일 경우 마지막 항목을 복제 (저장된 층은 복제 전 그대로)
+        padded = current_layer + [current_layer[-1]] if len(current_layer) % 2 == 1 else current_layer
+        current_layer = [_double_sha256(padded[i] + padded[i + 1]) for i in range(0, len(padded), 2)]
+        levels.append(current_layer)
+    return levels
+
+def merkle_root(transactions: List[dict]) -> str:
+    """트랜잭션 목록의 머클 루트 계산"""
+    return merkle_levels(transactions)[-1][0]
+
+def merkle_proof(levels: List[List[str]], position: int) -> List[dict]:
+    """position 번째 리프의 포함 증명 (리프에서 루트까지 형제 해시와 위치, 층 수만큼)"""
+    proof = []
+    for layer in levels[:-1]:
+        sibling = position ^ 1
+        if sibling >= len(layer):
+            sibling = position  # 홀수 층의 마지막 항목은 자기 자신과 결합
+        proof.append({"hash": layer[sibling], "side": "left" if sibling < position else "right"})
+        position //= 2
+    return proof
+
+def verify_merkle_proof(leaf_hash: str, proof: List[dict], root: str) -> bool:
+    """포함 증명으로 리프에서 루트를 다시 계산해 비교"""
+    current = leaf_hash
+    for step in proof:
+        if step["side"] == "left":
+            current = _double_sha256(step["hash"] + current)
+        else:
+            current = _double_sha256(current + step["hash"])
+    return current == root
+
+def block_header(version: int, previous_hash: str, merkle_root_hash: str) -> str:
+    """작업 증명에 사용하는 고정 길이 블록 헤더"""
+    return f"{version}:{previous_hash}:{merkle_root_hash}"
+
+def search_proof(previous_proof: int, index: int, data: str, start: int, count: int) -> Tuple[Optional[int], int]:
+    """[start, start + count) 구간에서 proof 탐색, (proof 또는 None, 시도 횟수) 반환"""
+    for new_proof in range(start, start + count):
+        to_digest = f"{new_proof**2 - previous_proof**2 + index}{data}"
+        if hashlib.sha256(to_digest.encode()).hexdigest()[:4] == "0000":
+            return new_proof, new_proof - start + 1
+    return None, count
+
+def _pow_search_worker(previous_proof: int, index: int, data: str, worker_id: int,
+                       workers: int, chunk_size: int, stop_event, attempts, results):
+    """nonce 구간을 chunk 단위로 나눠 탐색하는 작업 프로세스 (worker_id, worker_id + workers, ...)"""
+    chunk = worker_id
+    while not stop_event.is_set():
+        proof, tried = search_proof(previous_proof, index, data, chunk * chunk_size + 1, chunk_size)
+        if proof is not None:
+            results.put(proof)
+            stop_event.set()
+        with attempts.get_lock():
+            attempts.value += tried
+        chunk += workers
+
+class ParallelMiner:
+    """nonce 공간을 여러 프로세스에 나눠 탐색하는 병렬 작업 증명 엔진"""
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 2000,
+                 poll_interval: float = 0.5, join_timeout: float = 2.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval  # 결과를 기다리는 동안 작업 프로세스 생존 확인 간격 (초)
+        self.join_timeout = join_timeout    # 중단 신호 후 이 시간 안에 끝나지 않으면 강제 종료
+        self.last_stats: Dict[str, float] = {}
+
+    def mine(self, previous_proof: int, index: int, data: str) -> int:
+        """첫 번째로 발견된 proof 반환, 발견 즉시 모든 작업 프로세스 중단"""
+        stop_event = multiprocessing.Event()
+        attempts = multiprocessing.Value('q', 0)
+        results = multiprocessing.Queue()
+
+        start_time = time.perf_counter()
+        processes = [
+            multiprocessing.Process(
+                target=_pow_search_worker,
+                args=(previous_proof, index, data, worker_id, self.workers,
+                      self.chunk_size, stop_event, attempts, results),
+                daemon=True
+            )
+            for worker_id in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        proof = None
+        workers = self.workers
+        try:
+            while proof is None:
+                try:
+                    proof = results.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    # 결과 없이 끝난 작업 프로세스(OOM, kill 등)가 있으면 무한 대기하지 않음
+                    dead = [process for process in processes if not process.is_alive()]
+                    if not dead:
+                        continue
+                    try:
+                        # 종료 직전에 넣은 결과가 있을 수 있으므로 한 번 더 확인
+                        proof = results.get(timeout=self.poll_interval)
+                    except queue.Empty:
+                        print(f"Mining worker exited unexpectedly (exit codes "
+                              f"{[process.exitcode for process in dead]}), falling back to serial proof of work")
+                        break
+        finally:
+            stop_event.set()
+            for process in processes:
+                process.join(self.join_timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        tried = attempts.value
+        if proof is None:
+            # 남은 작업 프로세스를 모두 정리한 뒤 현재 프로세스에서 처음부터 순차 탐색
+            workers = 1
+            start = 1
+            while proof is None:
+                proof, count = search_proof(previous_proof, index, data, start, self.chunk_size)
+                tried += count
+                start += count
+
+        elapsed = time.perf_counter() - start_time
+        self.last_stats = {
+            "workers": workers,
+            "attempts": tried,
+            "elapsed": elapsed,
+            "hashrate": tried / elapsed if elapsed > 0 else 0.0
+        }
+        return proof
+
+class LRUCache:
+    """히트/미스 카운터가 있는 크기 제한 LRU 캐시"""
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses}
+
+class VerificationCache:
+    """서명 검증 캐시 (공개키 파싱, 주소 계산, 서명 검증 결과)"""
+    def __init__(self, key_size: int = 10000, signature_size: int = 100000):
+        self.verifying_keys = LRUCache(key_size)   # pubkey hex -> VerifyingKey
+        self.addresses = LRUCache(key_size)        # pubkey hex -> Base58 주소
+        self.signatures = LRUCache(signature_size)  # (sighash, pubkey, signature) -> bool
+
+    def clear(self):
+        self.verifying_keys.clear()
+        self.addresses.clear()
+        self.signatures.clear()
+
+    def stats(self) -> dict:
+        return {
+            "verifying_keys": self.verifying_keys.stats(),
+            "addresses": self.addresses.stats(),
+            "signatures": self.signatures.stats()
+        }
+
+# 프로세스 전역 검증 캐시
+verification_cache = VerificationCache()
+
+# 최근 포함 증명을 요청받은 블록의 트랜잭션과 머클 트리 층 ((높이, 머클 루트) -> (트랜잭션, 층 목록))
+merkle_tree_cache = LRUCache(32)
+
+# 핫 패스 지표 (/metrics, 프로세스마다 따로 집계)
+pow_seconds = registry.histogram("bitcoin_pow_seconds", "Proof-of-work search time in seconds",
+                                 buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+pow_attempts = registry.counter("bitcoin_pow_attempts_total", "Nonces tried by proof-of-work searches")
+pow_hashrate = registry.gauge("bitcoin_pow_hashrate", "Hashrate of the last proof-of-work search (hashes/s)")
+validate_seconds = registry.histogram("bitcoin_validate_transaction_seconds",
+                                      "Transaction validation time in seconds", ("result",))
+signature_checks = registry.counter("bitcoin_signature_checks_total",
+                                    "Input signature checks run in this process", ("result",))
+# 캐시 적중은 가장 빈번한 경로이므로 따로 세지 않고 캐시의 카운터를 수집 시점에 읽음
+registry.counter("bitcoin_signature_cache_hits_total", "Signature checks answered from the verification cache",
+                 callback=lambda: verification_cache.signatures.hits)
+utxo_update_seconds = registry.histogram("bitcoin_utxo_update_seconds",
+                                         "UTXO set update time per block in seconds")
 
 @dataclass
 class UTXO:
@@ -54,10 +287,54 @@ class TransactionOutput:
 class Wallet:
     def __init__(self):
         """새로운 비트코인 월렛 생성"""
+        self._signing_key: Optional[ecdsa.SigningKey] = None
         self.private_key = self._generate_private_key()
         self.public_key = self._generate_public_key(self.private_key)
         self.address = self._generate_address(self.public_key)
 
+    @classmethod
+    def from_keys(cls, private_key_hex: str, public_key_hex: Optional[str] = None,
+                  address: Optional[str] = None) -> "Wallet":
+        """저장된 키로 지갑 복원 (타원 곡선 연산 없이, 빠진 값과 서명 키는 처음 필요할 때 계산)"""
+        wallet = cls.__new__(cls)
+        wallet._signing_key = None
+        wallet.private_key = bytes.fromhex(private_key_hex)
+        wallet._public_key = bytes.fromhex(public_key_hex) if public_key_hex else None
+        wallet._address = address
+        return wallet
+
+    @property
+    def signing_key(self) -> ecdsa.SigningKey:
+        """서명 키 (처음 서명할 때 한 번 생성)"""
+        if self._signing_key is None:
+            self._signing_key = ecdsa.SigningKey.from_string(self.private_key, curve=ecdsa.SECP256k1)
+        return self._signing_key
+
+    @property
+    def public_key(self) -> bytes:
+        if self._public_key is None:
+            self._public_key = b'\x04' + self.signing_key.verifying_key.to_string()
+        return self._public_key
+
+    @public_key.setter
+    def public_key(self, value: bytes):
+        self._public_key = value
+
+    @property
+    def address(self) -> str:
+        if self._address is None:
+            self._address = self._generate_address(self.public_key)
+        return self._address
+
+    @address.setter
+    def address(self, value: str):
+        self._address = value
+
+    def check_keys(self) -> bool:
+        """저장된 공개키/주소가 개인키에서 계산한 값과 일치하는지 확인"""
+        public_key = self._generate_public_key(self.private_key)
+        return public_key == self.public_key and self._generate_address(public_key) == self.address
+
     def _generate_private_key(self) -> bytes:
         """32바이트 랜덤 개인 키 생성"""
         return os.urandom(32)
@@ -102,6 +379,15 @@ class Transaction:
         message = json.dumps(tx_data, sort_keys=True).encode()
         return hashlib.sha256(message).hexdigest()
 
+    def unsigned_tx_id(self) -> str:
+        """서명을 비운 내용으로 계산한 tx_id (트랜잭션 생성 시 서명보다 먼저 정해짐)"""
+        tx_data = {
+            "inputs": [dict(inp.to_dict(), signature="") for inp in self.inputs],
+            "outputs": [out.to_dict() for out in self.outputs]
+        }
+        message = json.dumps(tx_data, sort_keys=True).encode()
+        return hashlib.sha256(message).hexdigest()
+
     def to_dict(self):
         return {
             "tx_id": self.tx_id,
@@ -109,83 +395,97 @@ class Transaction:
             "outputs": [out.to_dict() for out in self.outputs]
         }
 
-    def sign_input(self, input_index: int, private_key_hex: str):
-        """특정 입력에 대해 서명"""
-        if input_index >= len(self.inputs):
-            raise ValueError("Invalid input index")
-            
-        # 서명할 데이터 준비 (해당 입력의 서명 필드를 제외한 트랜잭션 데이터)
-        temp_inputs = []
-        for i, inp in enumerate(self.inputs):
-            if i == input_index:
-                temp_input = TransactionInput(
-                    prev_tx_id=inp.prev_tx_id,
-                    output_index=inp.output_index,
-                    signature="",  # 서명 필드는 빈 문자열
-                    public_key=inp.public_key
-                )
-            else:
-                temp_input = inp
-            temp_inputs.append(temp_input)
-        
+    @classmethod
+    def from_dict(cls, data: dict) -> "Transaction":
+        """to_dict 형식에서 복원 (저장된 tx_id를 그대로 사용, 코인베이스 포함)"""
+        tx = cls.__new__(cls)
+        tx.inputs = [TransactionInput(**inp) for inp in data["inputs"]]
+        tx.outputs = [TransactionOutput(**out) for out in data["outputs"]]
+        tx.tx_id = data["tx_id"]
+        return tx
+
+    def signing_digest(self) -> bytes:
+        """서명 대상 다이제스트 (모든 입력이 공유하므로 트랜잭션당 한 번만 직렬화)
+
+        모든 입력의 서명 필드를 빈 문자열로 둔 트랜잭션 데이터를 직렬화한다.
+        입력이 하나인 트랜잭션은 기존 메시지와 동일하므로 저장된 서명이 그대로 검증된다.
+        """
         temp_tx_data = {
-            "inputs": [inp.to_dict() for inp in temp_inputs],
+            "inputs": [dict(inp.to_dict(), signature="") for inp in self.inputs],
             "outputs": [out.to_dict() for out in self.outputs]
         }
-        
         message = json.dumps(temp_tx_data, sort_keys=True).encode()
+        # ecdsa 기본 해시 함수(SHA-1)로 미리 다이제스트 계산 (sign/verify 와 동일)
+        return hashlib.sha1(message).digest()
+
+    def sign_input(self, input_index: int, private_key_hex: str, digest: Optional[bytes] = None):
+        """특정 입력에 대해 서명"""
+        if input_index >= len(self.inputs):
+            raise ValueError("Invalid input index")
+        
+        if digest is None:
+            digest = self.signing_digest()
         
         # 서명 생성
         private_key_bytes = bytes.fromhex(private_key_hex)
         sk = ecdsa.SigningKey.from_string(private_key_bytes, curve=ecdsa.SECP256k1)
-        signature = sk.sign(message).hex()
         
         # 서명을 해당 입력에 저장
-        self.inputs[input_index].signature = signature
+        self.inputs[input_index].signature = sk.sign_digest(digest).hex()
+
+    def sign_inputs(self, private_key_hex: Optional[str] = None,
+                    signing_key: Optional[ecdsa.SigningKey] = None):
+        """모든 입력에 서명 (다이제스트와 서명 키를 한 번만 준비, 지갑의 서명 키를 넘기면 재사용)"""
+        digest = self.signing_digest()
+        sk = signing_key or ecdsa.SigningKey.from_string(bytes.fromhex(private_key_hex), curve=ecdsa.SECP256k1)
+        for inp in self.inputs:
+            inp.signature = sk.sign_digest(digest).hex()
 
-    def verify_input(self, input_index: int, utxo: UTXO) -> bool:
+    def verify_input(self, input_index: int, utxo: UTXO, digest: Optional[bytes] = None) -> bool:
         """특정 입력의 서명 검증"""
         if input_index >= len(self.inputs):
             return False
             
         inp = self.inputs[input_index]
         
-        # 서명할 데이터 재구성
-        temp_inputs = []
-        for i, current_inp in enumerate(self.inputs):
-            if i == input_index:
-                temp_input = TransactionInput(
-                    prev_tx_id=current_inp.prev_tx_id,
-                    output_index=current_inp.output_index,
-                    signature="",
-                    public_key=current_inp.public_key
-                )
-            else:
-                temp_input = current_inp
-            temp_inputs.append(temp_input)
-        
-        temp_tx_data = {
-            "inputs": [inp_temp.to_dict() for inp_temp in temp_inputs],
-            "outputs": [out.to_dict() for out in self.outputs]
-        }
-        
-        message = json.dumps(temp_tx_data, sort_keys=True).encode()
+        if digest is None:
+            digest = self.signing_digest()
         
         try:
             # 공개키에서 주소 계산하여 UTXO 소유자와 일치하는지 확인
-            public_key_bytes = bytes.fromhex(inp.public_key)
-            calculated_address = self._public_key_to_address(public_key_bytes)
+            calculated_address = verification_cache.addresses.get(inp.public_key)
+            if calculated_address is None:
+                calculated_address = self._public_key_to_address(bytes.fromhex(inp.public_key))
+                verification_cache.addresses.put(inp.public_key, calculated_address)
             
             if calculated_address != utxo.address:
+                signature_checks.inc(labels=("wrong_owner",))
                 return False
             
+            # 같은 (메시지, 공개키, 서명) 조합은 이전 검증 결과 재사용
+            cache_key = (digest, inp.public_key, inp.signature)
+            cached = verification_cache.signatures.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # 서명 검증
-            if len(public_key_bytes) == 65 and public_key_bytes[0] == 0x04:
-                public_key_bytes = public_key_bytes[1:]
+            vk = verification_cache.verifying_keys.get(inp.public_key)
+            if vk is None:
+                public_key_bytes = bytes.fromhex(inp.public_key)
+                if len(public_key_bytes) == 65 and public_key_bytes[0] == 0x04:
+                    public_key_bytes = public_key_bytes[1:]
+                vk = ecdsa.VerifyingKey.from_string(public_key_bytes, curve=ecdsa.SECP256k1)
+                verification_cache.verifying_keys.put(inp.public_key, vk)
             
-            vk = ecdsa.VerifyingKey.from_string(public_key_bytes, curve=ecdsa.SECP256k1)
-            return vk.verify(bytes.fromhex(inp.signature), message)
+            try:
+                valid = vk.verify_digest(bytes.fromhex(inp.signature), digest)
+            except ecdsa.BadSignatureError:
+                valid = False
+            verification_cache.signatures.put(cache_key, valid)
+            signature_checks.inc(labels=("valid" if valid else "invalid",))
+            return valid
         except:
+            signature_checks.inc(labels=("error",))
             return False
 
     def _public_key_to_address(self, public_key: bytes) -> str:
@@ -196,21 +496,103 @@ class Transaction:
         checksum = hashlib.sha256(hashlib.sha256(network_byte).digest()).digest()[:4]
         return base58.b58encode(network_byte + checksum).decode()
 
+def _verify_inputs_job(job: Tuple["Transaction", List[Tuple[int, "UTXO"]]]) -> List[bool]:
+    """프로세스 풀 작업 단위: 한 트랜잭션의 여러 입력 서명 검증"""
+    transaction, checks = job
+    digest = transaction.signing_digest()
+    return [transaction.verify_input(i, utxo, digest) for i, utxo in checks]
+
+class SignatureVerifier:
+    """트랜잭션 입력 서명을 프로세스 풀에 나눠 일괄 검증"""
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 16,
+                 executor: Optional[ProcessPoolExecutor] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size  # 작업 하나에 묶는 입력 수 (트랜잭션 전송 비용 분산)
+        self._executor = executor  # 다른 작업과 같은 프로세스 풀을 공유할 때 전달
+
+    def verify(self, checks: List[Tuple["Transaction", int, "UTXO"]]) -> List[bool]:
+        """(트랜잭션, 입력 인덱스, UTXO) 목록의 검증 결과를 같은 순서로 반환"""
+        jobs: List[Tuple[Transaction, List[Tuple[int, UTXO]]]] = []
+        for transaction, input_index, utxo in checks:
+            if jobs and jobs[-1][0] is transaction and len(jobs[-1][1]) < self.chunk_size:
+                jobs[-1][1].append((input_index, utxo))
+            else:
+                jobs.append((transaction, [(input_index, utxo)]))
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            results = map(_verify_inputs_job, jobs)
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            results = self._executor.map(_verify_inputs_job, jobs)
+        return [valid for chunk in results for valid in chunk]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+def _check_wallet_keys_job(entries: List[Tuple[str, Optional[str], str]]) -> List[str]:
+    """(개인키, 공개키, 주소) 묶음을 검사해 일치하지 않는 주소 반환 (워커 프로세스에서 실행)"""
+    return [address for private_key_hex, public_key_hex, address in entries
+            if not Wallet.from_keys(private_key_hex, public_key_hex, address).check_keys()]
+
+def check_wallet_keys(wallets: Iterable[Wallet], workers: Optional[int] = None,
+                      chunk_size: int = 256) -> List[str]:
+    """지갑들의 저장된 공개키/주소를 병렬로 검증 (일치하지 않는 주소 목록)"""
+    # 공개키가 아직 계산되지 않은 지갑은 워커에서 계산 (여기서 타원 곡선 연산을 하지 않음)
+    entries = [(wallet.get_private_key_hex(), wallet._public_key.hex() if wallet._public_key else None,
+                wallet.get_address()) for wallet in wallets]
+    chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(chunks) <= 1:
+        return [address for chunk in chunks for address in _check_wallet_keys_job(chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [address for result in pool.map(_check_wallet_keys_job, chunks) for address in result]
+
 class UTXOPool:
     """UTXO 풀 관리"""
     def __init__(self):
         self.utxos: Dict[str, UTXO] = {}  # key: "tx_id:output_index"
+        self.address_index: Dict[str, Dict[str, UTXO]] = {}  # address -> {key: UTXO}
+        self.balances: Dict[str, float] = {}  # address -> 잔액 (증분 유지)
+        self.total_satoshi = 0  # 전체 UTXO 금액 합계 (증분 유지, 정수라 오차 누적 없음)
     
     def add_utxo(self, utxo: UTXO):
         """UTXO 추가"""
         key = f"{utxo.tx_id}:{utxo.output_index}"
+        if key in self.utxos:
+            # 같은 outpoint 덮어쓰기 시 기존 인덱스 항목 정리
+            self.remove_utxo(utxo.tx_id, utxo.output_index)
         self.utxos[key] = utxo
+        self.address_index.setdefault(utxo.address, {})[key] = utxo
+        self.balances[utxo.address] = self.balances.get(utxo.address, 0) + utxo.amount
+        self.total_satoshi += _to_satoshi(utxo.amount)
     
     def remove_utxo(self, tx_id: str, output_index: int):
         """UTXO 제거 (사용됨)"""
         key = f"{tx_id}:{output_index}"
-        if key in self.utxos:
-            del self.utxos[key]
+        utxo = self.utxos.pop(key, None)
+        if utxo is None:
+            return
+        self.total_satoshi -= _to_satoshi(utxo.amount)
+        
+        by_address = self.address_index.get(utxo.address)
+        if by_address is not None:
+            by_address.pop(key, None)
+            if not by_address:
+                # 마지막 UTXO가 빠지면 부동소수점 오차가 남지 않도록 항목 삭제
+                del self.address_index[utxo.address]
+                self.balances.pop(utxo.address, None)
+                return
+        self.balances[utxo.address] -= utxo.amount
+    
+    def clear(self):
+        """모든 UTXO 제거"""
+        self.utxos = {}
+        self.address_index = {}
+        self.balances = {}
+        self.total_satoshi = 0
     
     def get_utxo(self, tx_id: str, output_index: int) -> Optional[UTXO]:
         """UTXO 조회"""
@@ -218,30 +600,408 @@ class UTXOPool:
         return self.utxos.get(key)
     
     def get_utxos_by_address(self, address: str) -> List[UTXO]:
-        """특정 주소의 모든 UTXO 조회"""
-        return [utxo for utxo in self.utxos.values() if utxo.address == address]
+        """특정 주소의 모든 UTXO 조회 (주소 인덱스 사용)"""
+        return list(self.address_index.get(address, {}).values())
     
     def get_balance(self, address: str) -> float:
-        """주소의 잔액 계산"""
-        utxos = self.get_utxos_by_address(address)
-        return sum(utxo.amount for utxo in utxos)
+        """주소의 잔액 조회 (증분 유지된 값, O(1))"""
+        return self.balances.get(address, 0)
+    
+    def __len__(self) -> int:
+        return len(self.utxos)
+
+    def stats(self) -> dict:
+        """UTXO 수 / 금액 합계 / 보유 주소 수 (증분 유지된 값, O(1))"""
+        return {
+            "utxo_count": len(self.utxos),
+            "total_satoshi": self.total_satoshi,
+            "address_count": len(self.address_index)
+        }
+
+    def check_index(self) -> bool:
+        """주소 인덱스/잔액이 전체 UTXO와 일치하는지 처음부터 재계산하여 확인"""
+        expected_index: Dict[str, Dict[str, UTXO]] = {}
+        for key, utxo in self.utxos.items():
+            expected_index.setdefault(utxo.address, {})[key] = utxo
+        
+        if expected_index.keys() != self.address_index.keys():
+            return False
+        
+        for address, entries in expected_index.items():
+            if entries.keys() != self.address_index[address].keys():
+                return False
+            expected_balance = sum(utxo.amount for utxo in entries.values())
+            if abs(expected_balance - self.balances.get(address, 0)) > 1e-6:
+                return False
+        return self.total_satoshi == sum(_to_satoshi(utxo.amount) for utxo in self.utxos.values())
+
+def apply_transactions(utxo_pool, transactions: List[Transaction]):
+    """트랜잭션의 입력을 UTXO 풀에서 제거하고 출력을 추가"""
+    for tx in transactions:
+        # 사용된 UTXO 제거
+        for inp in tx.inputs:
+            utxo_pool.remove_utxo(inp.prev_tx_id, inp.output_index)
+        
+        # 새로운 UTXO 추가
+        for i, output in enumerate(tx.outputs):
+            utxo_pool.add_utxo(UTXO(tx_id=tx.tx_id, output_index=i, amount=output.amount, address=output.address))
+
+def check_block_rules(transactions: List[Transaction], height: int) -> Optional[Tuple[str, str]]:
+    """블록 구조 규칙 확인, 실패 시 (tx_id, 사유) (Blockchain.is_chain_valid와 ChainVerifier가 공유)
+
+    제네시스가 아닌 블록은 코인베이스(tx_id coinbase_{height}, 보상 이하)를 마지막에 정확히 하나
+    가지며, 나머지 트랜잭션의 tx_id는 내용과 일치해야 한다.
+    """
+    if height == 1 and not transactions:
+        return None
+    coinbases = [position for position, tx in enumerate(transactions) if not tx.inputs]
+    if coinbases != [len(transactions) - 1]:
+        tx_id = transactions[coinbases[0]].tx_id if coinbases else f"coinbase_{height}"
+        return tx_id, "Block must end with exactly one coinbase transaction"
+    for transaction in transactions[:-1]:
+        if transaction.tx_id != transaction.unsigned_tx_id():
+            return transaction.tx_id, "tx_id does not match contents"
+    coinbase = transactions[-1]
+    if coinbase.tx_id != f"coinbase_{height}":
+        return coinbase.tx_id, f"Unexpected coinbase transaction (expected coinbase_{height})"
+    if sum(_to_satoshi(output.amount) for output in coinbase.outputs) > _to_satoshi(BLOCK_REWARD):
+        return coinbase.tx_id, "Coinbase exceeds block reward"
+    return None
+
+# ---- 코인 선택 전략: (보유 UTXO, 보낼 금액) -> 선택한 UTXO 목록, 부족하면 None ----
+
+SATOSHI = 10 ** 8
+BNB_MAX_TRIES = 10000       # branch-and-bound 탐색 노드 상한 (넘으면 바로 largest-first)
+CONSOLIDATE_MAX_INPUTS = 50  # 통합 모드에서 한 트랜잭션에 담을 최대 입력 수
+MAX_MEMPOOL_ANCESTORS = 25   # 대기 트랜잭션 하나가 가질 수 있는 미확정 조상 수 (자신 포함)
+
+def _to_satoshi(amount: float) -> int:
+    return int(round(amount * SATOSHI))
+
+def select_first_fit(utxos: List[UTXO], amount: float) -> Optional[List[UTXO]]:
+    """조회 순서대로 합계가 금액을 넘을 때까지 선택 (기존 방식)"""
+    target = _to_satoshi(amount)
+    selected = []
+    total = 0
+    for utxo in utxos:
+        selected.append(utxo)
+        total += _to_satoshi(utxo.amount)
+        if total >= target:
+            return selected
+    return None
+
+def select_largest_first(utxos: List[UTXO], amount: float) -> Optional[List[UTXO]]:
+    """큰 UTXO부터 선택 (입력 수 최소화)"""
+    return select_first_fit(sorted(utxos, key=lambda utxo: utxo.amount, reverse=True), amount)
+
+def select_branch_and_bound(utxos: List[UTXO], amount: float) -> Optional[List[UTXO]]:
+    """거스름돈 없이 금액과 정확히 일치하는 조합 탐색, 없으면 largest-first"""
+    target = _to_satoshi(amount)
+    ordered = sorted(utxos, key=lambda utxo: utxo.amount, reverse=True)
+    values = [_to_satoshi(utxo.amount) for utxo in ordered]
+    # remaining[i]: i번째 이후 UTXO 합계 (더해도 목표에 못 미치면 가지치기)
+    remaining = [0] * (len(values) + 1)
+    for i in range(len(values) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + values[i]
+    if remaining[0] < target:
+        return None
+
+    # 깊이 우선 탐색 (포함하는 쪽을 먼저, 큰 값부터라 입력 수가 적은 조합을 먼저 찾음)
+    chosen: List[int] = []
+    total = 0
+    i = 0
+    for _ in range(BNB_MAX_TRIES):
+        if total == target:
+            return [ordered[k] for k in chosen]
+        if total > target or i >= len(values) or total + remaining[i] < target:
+            # 마지막으로 포함한 UTXO를 빼고 다음 금액으로 진행
+            if not chosen:
+                break
+            k = chosen.pop()
+            total -= values[k]
+            i = k + 1
+            # 같은 금액의 UTXO는 하나만 시도해도 충분
+            while i < len(values) and values[i] == values[k]:
+                i += 1
+            continue
+        chosen.append(i)
+        total += values[i]
+        i += 1
+    return select_largest_first(utxos, amount)
+
+def select_consolidate(utxos: List[UTXO], amount: float) -> Optional[List[UTXO]]:
+    """필요한 UTXO에 더해 작은 UTXO를 최대 CONSOLIDATE_MAX_INPUTS개까지 함께 사용 (UTXO 수 감소)"""
+    selected = select_largest_first(utxos, amount)
+    if selected is None:
+        return None
+    used = {(utxo.tx_id, utxo.output_index) for utxo in selected}
+    for utxo in sorted(utxos, key=lambda utxo: utxo.amount):
+        if len(selected) >= CONSOLIDATE_MAX_INPUTS:
+            break
+        if (utxo.tx_id, utxo.output_index) not in used:
+            selected.append(utxo)
+    return selected
+
+COIN_SELECTION_STRATEGIES: Dict[str, Callable[[List[UTXO], float], Optional[List[UTXO]]]] = {
+    "first_fit": select_first_fit,
+    "largest_first": select_largest_first,
+    "branch_and_bound": select_branch_and_bound,
+    "consolidate": select_consolidate,
+}
+# 요청 경로 기본값은 탐색 없는 largest-first (branch_and_bound는 strategy로 지정할 때만)
+DEFAULT_COIN_SELECTION = "largest_first"
+
+@dataclass
+class MempoolEntry:
+    """대기 트랜잭션과 수수료 정보"""
+    transaction: Transaction
+    fee: float
+    size: int           # 직렬화 크기 (바이트)
+    fee_rate: float     # 바이트당 수수료
+    sequence: int       # 도착 순서 (같은 수수료율이면 먼저 온 트랜잭션 우선)
+    parents: Set[str] = field(default_factory=set)  # 이 트랜잭션이 출력을 사용하는 대기 트랜잭션
+
+class Mempool:
+    """대기 트랜잭션 풀 (이중 지불 인덱스, 수수료율 우선순위, 크기 제한)"""
+    def __init__(self, max_bytes: int = 5_000_000):
+        self.max_bytes = max_bytes
+        self.entries: Dict[str, MempoolEntry] = {}  # tx_id -> 항목 (도착 순서 유지)
+        self.spent: Dict[str, str] = {}  # "tx_id:output_index" -> 그 출력을 사용하는 대기 tx_id
+        self.children: Dict[str, Set[str]] = {}  # tx_id -> 그 출력을 사용하는 대기 tx_id들
+        self.by_address: Dict[str, Set[str]] = {}  # 주소 -> 그 주소로 출력을 보내는 대기 tx_id들
+        self.total_bytes = 0
+        self.version = 0  # 추가/제거될 때마다 증가 (블록 템플릿 갱신 감지용)
+        self._sequence = 0
+        self._by_fee_desc: List[Tuple[float, int, str]] = []  # 블록 선택용 (지연 삭제 힙)
+        self._by_fee_asc: List[Tuple[float, int, str]] = []   # 축출용 (지연 삭제 힙)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self.entries
+
+    def get(self, tx_id: str) -> Optional[Transaction]:
+        entry = self.entries.get(tx_id)
+        return entry.transaction if entry else None
+
+    def transactions(self) -> List[Transaction]:
+        """도착 순서대로 대기 트랜잭션 목록"""
+        # values()를 먼저 한 번에 복사 (다른 스레드가 변경해도 순회 중 오류가 나지 않도록)
+        return [entry.transaction for entry in list(self.entries.values())]
+
+    def find_conflict(self, transaction: Transaction) -> Optional[str]:
+        """이미 다른 대기 트랜잭션이 사용 중인 출력을 쓰면 그 tx_id 반환 (O(입력 수))"""
+        for inp in transaction.inputs:
+            spender = self.spent.get(f"{inp.prev_tx_id}:{inp.output_index}")
+            if spender is not None:
+                return spender
+        return None
+
+    def is_spent(self, tx_id: str, output_index: int) -> bool:
+        return f"{tx_id}:{output_index}" in self.spent
+
+    def get_output(self, tx_id: str, output_index: int) -> Optional[UTXO]:
+        """아직 확정되지 않은 대기 트랜잭션의 출력 (연쇄 미확정 지불용)"""
+        entry = self.entries.get(tx_id)
+        if entry is None or output_index >= len(entry.transaction.outputs):
+            return None
+        output = entry.transaction.outputs[output_index]
+        return UTXO(tx_id=tx_id, output_index=output_index, amount=output.amount, address=output.address)
+
+    def get_outputs_by_address(self, address: str) -> List[UTXO]:
+        """주소로 가는 대기 트랜잭션 출력 중 아직 다른 대기 트랜잭션이 사용하지 않은 것 (미확정 거스름돈 등)"""
+        outputs = []
+        for tx_id in list(self.by_address.get(address, ())):
+            entry = self.entries.get(tx_id)
+            if entry is None:
+                continue
+            for i, output in enumerate(entry.transaction.outputs):
+                if output.address == address and not self.is_spent(tx_id, i):
+                    outputs.append(UTXO(tx_id=tx_id, output_index=i, amount=output.amount, address=address))
+        return outputs
+
+    def ancestors(self, tx_ids: Iterable[str]) -> Set[str]:
+        """주어진 대기 트랜잭션들과 그 미확정 조상 전체"""
+        found: Set[str] = set()
+        stack = [tx_id for tx_id in tx_ids if tx_id in self.entries]
+        while stack:
+            current = stack.pop()
+            if current in found:
+                continue
+            found.add(current)
+            stack.extend(parent for parent in self.entries[current].parents if parent in self.entries)
+        return found
+
+    def add(self, transaction: Transaction, fee: float) -> bool:
+        """대기 트랜잭션 추가 (가득 차면 수수료율이 더 낮은 트랜잭션을 축출, 불가능하면 False)"""
+        size = len(json.dumps(transaction.to_dict()))
+        fee_rate = fee / size
+        if size > self.max_bytes:
+            return False
+        while self.total_bytes + size > self.max_bytes:
+            lowest = self._lowest()
+            if lowest is None or lowest.fee_rate >= fee_rate:
+                return False
+            self.remove(lowest.transaction.tx_id)
+
+        self._sequence += 1
+        parents = {inp.prev_tx_id for inp in transaction.inputs if inp.prev_tx_id in self.entries}
+        entry = MempoolEntry(transaction, fee, size, fee_rate, self._sequence, parents)
+        tx_id = transaction.tx_id
+        self.entries[tx_id] = entry
+        self.total_bytes += size
+        for inp in transaction.inputs:
+            self.spent[f"{inp.prev_tx_id}:{inp.output_index}"] = tx_id
+        for parent in parents:
+            self.children.setdefault(parent, set()).add(tx_id)
+        for output in transaction.outputs:
+            self.by_address.setdefault(output.address, set()).add(tx_id)
+        heapq.heappush(self._by_fee_desc, (-fee_rate, entry.sequence, tx_id))
+        heapq.heappush(self._by_fee_asc, (fee_rate, -entry.sequence, tx_id))
+        self.version += 1
+        return True
+
+    def _lowest(self) -> Optional[MempoolEntry]:
+        """수수료율이 가장 낮은 (같으면 가장 늦게 온) 항목"""
+        while self._by_fee_asc:
+            _, _, tx_id = self._by_fee_asc[0]
+            if tx_id in self.entries:
+                return self.entries[tx_id]
+            heapq.heappop(self._by_fee_asc)
+        return None
+
+    def remove(self, tx_id: str, with_descendants: bool = True) -> List[str]:
+        """대기 트랜잭션 제거 (기본적으로 그 출력을 사용하는 후손도 함께 제거)"""
+        removed = []
+        stack = [tx_id]
+        while stack:
+            current = stack.pop()
+            entry = self.entries.pop(current, None)
+            if entry is None:
+                continue
+            removed.append(current)
+            self.total_bytes -= entry.size
+            for inp in entry.transaction.inputs:
+                key = f"{inp.prev_tx_id}:{inp.output_index}"
+                if self.spent.get(key) == current:
+                    del self.spent[key]
+            for output in entry.transaction.outputs:
+                pending = self.by_address.get(output.address)
+                if pending is not None:
+                    pending.discard(current)
+                    if not pending:
+                        del self.by_address[output.address]
+            for parent in entry.parents:
+                siblings = self.children.get(parent)
+                if siblings is not None:
+                    siblings.discard(current)
+                    if not siblings:
+                        del self.children[parent]
+            children = self.children.pop(current, set())
+            if with_descendants:
+                stack.extend(children)
+            else:
+                # 부모가 확정된 경우: 자식은 남기고 부모 관계만 끊음
+                for child in children:
+                    if child in self.entries:
+                        self.entries[child].parents.discard(current)
+        if removed:
+            self.version += 1
+        self._compact()
+        return removed
+
+    def remove_confirmed(self, transactions: List[Transaction]) -> List[str]:
+        """블록에 포함된 트랜잭션 제거, 같은 출력을 쓰던 충돌 트랜잭션(및 후손)도 제거"""
+        removed = []
+        for transaction in transactions:
+            if transaction.tx_id in self.entries:
+                self.remove(transaction.tx_id, with_descendants=False)
+                continue
+            for inp in transaction.inputs:
+                spender = self.spent.get(f"{inp.prev_tx_id}:{inp.output_index}")
+                if spender is not None:
+                    removed.extend(self.remove(spender))
+        return removed
+
+    def select(self, max_count: Optional[int] = None) -> List[Transaction]:
+        """블록에 담을 트랜잭션 선택 (수수료율 순, 부모가 자식보다 먼저 오도록)"""
+        heap = list(self._by_fee_desc)
+        selected: List[Transaction] = []
+        included: Set[str] = set()
+        waiting: Dict[str, List[Tuple[float, int, str]]] = {}  # 대기 중인 부모 -> 자식 힙 항목
+        while heap and (max_count is None or len(selected) < max_count):
+            item = heapq.heappop(heap)
+            tx_id = item[2]
+            entry = self.entries.get(tx_id)
+            if entry is None or tx_id in included:
+                continue
+            missing = [parent for parent in entry.parents if parent not in included]
+            if missing:
+                waiting.setdefault(missing[0], []).append(item)
+                continue
+            selected.append(entry.transaction)
+            included.add(tx_id)
+            for child_item in waiting.pop(tx_id, []):
+                heapq.heappush(heap, child_item)
+        return selected
+
+    def _compact(self):
+        """지연 삭제로 쌓인 힙 항목 정리"""
+        if len(self._by_fee_desc) > 2 * len(self.entries) + 64:
+            self._by_fee_desc = [item for item in self._by_fee_desc if item[2] in self.entries]
+            heapq.heapify(self._by_fee_desc)
+            self._by_fee_asc = [item for item in self._by_fee_asc if item[2] in self.entries]
+            heapq.heapify(self._by_fee_asc)
 
 class Blockchain:
-    def __init__(self):
-        self.chain = []
-        self.pending_transactions = []
-        self.utxo_pool = UTXOPool()
+    def __init__(self, miner: Optional[ParallelMiner] = None,
+                 verifier: Optional[SignatureVerifier] = None, store=None):
+        self.store = store  # None이면 메모리, SQLiteStore면 여러 워커 프로세스가 공유
+        self.max_block_transactions: Optional[int] = None  # None이면 대기 트랜잭션 전체
+        self.miner = miner  # None이면 단일 스레드 작업 증명
+        self.verifier = verifier  # None이면 서명을 순차 검증
+        self.parallel_verify_threshold = 8  # 입력 수가 이 이상인 트랜잭션은 일괄 검증
+        self.block_version = BLOCK_VERSION
+        self.validate_blocks = True  # False면 채굴 시 트랜잭션 재검증 생략 (서명 없는 합성 트랜잭션 벤치마크용)
+        self.last_mining_stats: Dict[str, float] = {}
+        self._mempool_snapshot: Optional[Mempool] = None  # 잠금 없는 읽기용 대기 풀 사본 (SQLite 저장소)
+        self._genesis_time: Optional[float] = None  # 평균 블록 시간 계산용 (제네시스는 바뀌지 않음)
+        # 동시성 모델: 체인/UTXO/대기 풀 변경은 모두 lock 안에서만 수행 (쓰기 1개씩)
+        # 읽기는 잠금 없이 단일 조회(GIL 하에서 원자적인 dict 조회/복사)로 처리하고,
+        # 여러 값을 서로 맞춰 읽어야 할 때만 read_lock으로 같은 시점의 상태를 복사
+        if store is None:
+            self.chain = []
+            self.mempool = Mempool()
+            self.utxo_pool = UTXOPool()
+            self.tx_index: Dict[str, Tuple[int, int]] = {}  # tx_id -> (블록 높이, 블록 내 위치)
+            self.block_hash_index: Dict[str, int] = {}  # 블록 해시 -> 블록 높이
+            self.lock = threading.RLock()
+            self.read_lock = self.lock
+        else:
+            # 같은 인터페이스의 테이블 뷰 (쓰기 잠금은 프로세스 간 쓰기 트랜잭션)
+            self.chain = store.chain
+            self.mempool = store.load_mempool()
+            self.utxo_pool = store.utxo_pool
+            self.tx_index = store.tx_index
+            self.block_hash_index = store.block_hash_index
+            self.lock = store.write_lock
+            self.read_lock = store.read_lock
         
-        # Genesis 블록 생성
-        genesis_block = self._create_block(
-            data="genesis block",
-            proof=1,
-            previous_hash="0",
-            index=1
-        )
-        self.chain.append(genesis_block)
-
-    def _create_block(self, data: str, proof: int, previous_hash: str, index: int) -> dict:
+        # Genesis 블록 생성 (저장소에 이미 체인이 있으면 그대로 사용)
+        with self.lock:
+            if len(self.chain) == 0:
+                genesis_block = self._create_block(
+                    data="genesis block",
+                    proof=1,
+                    previous_hash="0",
+                    index=1
+                )
+                self.chain.append(genesis_block)
+                self.block_hash_index[self._hash(genesis_block)] = 1
+
+    def _create_block(self, data: str, proof: int, previous_hash: str, index: int,
+                      merkle_root_hash: Optional[str] = None) -> dict:
         block = {
             "index": index,
             "timestamp": str(_dt.datetime.now()),
@@ -249,6 +1009,10 @@ class Blockchain:
             "proof": proof,
             "previous_hash": previous_hash
         }
+        # 버전 2 블록은 헤더 필드를 추가로 가짐 (레거시 블록은 그대로)
+        if merkle_root_hash is not None:
+            block["version"] = BLOCK_VERSION
+            block["merkle_root"] = merkle_root_hash
         return block
 
     def get_previous_block(self) -> dict:
@@ -258,126 +1022,674 @@ class Blockchain:
         encoded_block = json.dumps(block, sort_keys=True).encode()
         return hashlib.sha256(encoded_block).hexdigest()
 
+    @property
+    def pending_transactions(self) -> List[Transaction]:
+        """대기 트랜잭션 목록 (도착 순서)"""
+        return self._read_mempool().transactions()
+
+    @property
+    def mempool_version(self) -> int:
+        """대기 트랜잭션이 바뀔 때마다 증가 (블록 템플릿 갱신 감지용)"""
+        return self._read_mempool().version
+
+    def _sync_mempool(self):
+        """다른 워커 프로세스가 바꾼 대기 풀 반영 (SQLite 저장소 사용 시, 쓰기 잠금 안에서만 self.mempool 교체)"""
+        if self.store is None:
+            return
+        with self.lock:
+            if self.store.mempool_version() != self.mempool.version:
+                self.mempool = self.store.load_mempool()
+
+    def _read_mempool(self) -> Mempool:
+        """잠금 없는 읽기용 대기 풀 (호출자는 반환된 객체 하나만 사용)
+
+        self.mempool은 쓰기 잠금 안에서만 바뀌므로, 다른 워커 프로세스가 대기 풀을 바꿨으면
+        self.mempool을 교체하지 않고 저장소에서 읽은 읽기 전용 사본(버전별로 재사용)을 돌려준다.
+        """
+        mempool = self.mempool
+        if self.store is None:
+            return mempool
+        version = self.store.mempool_version()
+        if version == mempool.version:
+            return mempool
+        snapshot = self._mempool_snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = self.store.load_mempool()
+            self._mempool_snapshot = snapshot
+        return snapshot
+
+    def get_pending_transaction(self, tx_id: str) -> Optional[Transaction]:
+        return self._read_mempool().get(tx_id)
+
+    def get_block(self, height: int) -> Optional[dict]:
+        """블록 높이로 조회 (잠금 없음, 체인은 뒤에만 추가됨)"""
+        chain = self.chain
+        if 1 <= height <= len(chain):
+            return chain[height - 1]
+        return None
+
+    def get_utxos(self, address: str) -> List[UTXO]:
+        """주소의 UTXO 목록 복사본 (잠금 없음)"""
+        return self.utxo_pool.get_utxos_by_address(address)
+
+    def get_address_snapshot(self, address: str) -> Tuple[float, List[UTXO]]:
+        """같은 시점의 잔액과 UTXO 목록 (블록 반영 도중의 중간 상태를 보지 않음)"""
+        with self.read_lock:
+            return self.utxo_pool.get_balance(address), self.utxo_pool.get_utxos_by_address(address)
+
+    def read_snapshot(self) -> dict:
+        """같은 시점의 체인 끝/대기 풀/UTXO 상태 (잠금은 복사하는 동안만 잡음)"""
+        with self.read_lock:
+            mempool = self._read_mempool()
+            return {
+                "height": len(self.chain),
+                "tip_hash": self._hash(self.chain[-1]),
+                "mempool_version": mempool.version,
+                "pending_transactions": len(mempool),
+                "utxos": list(self.utxo_pool.utxos.values())
+            }
+
+    @staticmethod
+    def _block_time(block: dict) -> float:
+        return _dt.datetime.fromisoformat(block["timestamp"]).timestamp()
+
+    def chain_stats(self) -> dict:
+        """/api/stats 집계 (블록 반영 때 증분 유지된 값과 체인 양 끝 블록만 읽음, O(1))"""
+        with self.read_lock:
+            height = len(self.chain)
+            utxo_stats = self.utxo_pool.stats()
+            total_transactions = len(self.tx_index)
+            pending = len(self._read_mempool())
+            tip_time = self._block_time(self.chain[-1])
+        if self._genesis_time is None:
+            self._genesis_time = self._block_time(self.chain[0])
+        return {
+            "height": height,
+            "pending_transactions": pending,
+            "total_transactions": total_transactions,
+            "utxo_count": utxo_stats["utxo_count"],
+            "total_supply": utxo_stats["total_satoshi"] / SATOSHI,
+            "address_count": utxo_stats["address_count"],
+            # 제네시스 이후 블록 사이 평균 간격 (초)
+            "average_block_time": (tip_time - self._genesis_time) / (height - 1) if height > 1 else 0.0
+        }
+
+    def recompute_chain_stats(self) -> dict:
+        """chain_stats와 같은 값을 체인 전체를 처음부터 재생하여 계산 (일관성 확인용, O(체인))"""
+        with self.read_lock:
+            pool = UTXOPool()
+            tx_ids = set()
+            blocks = 0
+            for block in self.chain:
+                transactions = self._parse_block(block)
+                apply_transactions(pool, transactions)
+                tx_ids.update(tx.tx_id for tx in transactions)
+                if blocks == 0:
+                    genesis_time = self._block_time(block)
+                tip_time = self._block_time(block)
+                blocks += 1
+            pending = len(self._read_mempool())
+        return {
+            "height": blocks,
+            "pending_transactions": pending,
+            "total_transactions": len(tx_ids),
+            "utxo_count": len(pool.utxos),
+            "total_supply": sum(_to_satoshi(utxo.amount) for utxo in pool.utxos.values()) / SATOSHI,
+            "address_count": len({utxo.address for utxo in pool.utxos.values()}),
+            "average_block_time": (tip_time - genesis_time) / (blocks - 1) if blocks > 1 else 0.0
+        }
+
+    def check_chain_stats(self) -> bool:
+        """증분 유지된 통계가 처음부터 다시 계산한 값과 같은지 확인 (다르면 항목 출력)"""
+        with self.read_lock:
+            expected = self.recompute_chain_stats()
+            actual = self.chain_stats()
+        mismatched = [key for key, value in expected.items() if abs(actual[key] - value) > 1e-6]
+        for key in mismatched:
+            print(f"Chain stats mismatch: {key} = {actual[key]} (expected {expected[key]})")
+        return not mismatched
+
     def add_transaction(self, transaction: Transaction) -> bool:
         """트랜잭션 유효성 검증 후 추가"""
-        if not self._validate_transaction(transaction):
-            return False
-        
-        self.pending_transactions.append(transaction)
-        return True
+        with self.lock:
+            self._sync_mempool()
+            if transaction.tx_id in self.mempool:
+                print(f"Transaction already pending: {transaction.tx_id}")
+                return False
+            
+            # 다른 대기 트랜잭션과 같은 출력을 사용하면 즉시 거부 (O(입력 수))
+            conflict = self.mempool.find_conflict(transaction)
+            if conflict is not None:
+                print(f"Double spend: conflicts with pending transaction {conflict}")
+                return False
+            
+            # 미확정 출력을 쓰는 경우 조상 사슬 길이 제한 (블록 선택/제거 비용이 사슬 길이에 비례)
+            ancestors = self.mempool.ancestors(inp.prev_tx_id for inp in transaction.inputs)
+            if len(ancestors) >= MAX_MEMPOOL_ANCESTORS:
+                print(f"Too many unconfirmed ancestors: {len(ancestors)} (max {MAX_MEMPOOL_ANCESTORS - 1})")
+                return False
+            
+            if not self._validate_transaction(transaction):
+                return False
+            
+            total_input = sum(_to_satoshi(self._lookup_utxo(inp.prev_tx_id, inp.output_index).amount)
+                              for inp in transaction.inputs)
+            fee = (total_input - sum(_to_satoshi(output.amount) for output in transaction.outputs)) / SATOSHI
+            if not self.mempool.add(transaction, fee):
+                print(f"Mempool full: fee rate too low for {transaction.tx_id}")
+                return False
+            return True
+
+    def _lookup_utxo(self, tx_id: str, output_index: int) -> Optional[UTXO]:
+        """확정된 UTXO 또는 대기 트랜잭션의 출력 조회"""
+        utxo = self.utxo_pool.get_utxo(tx_id, output_index)
+        if utxo is None:
+            utxo = self.mempool.get_output(tx_id, output_index)
+        return utxo
 
     def _validate_transaction(self, transaction: Transaction) -> bool:
         """트랜잭션 유효성 검증"""
+        start_time = time.perf_counter()
+        if self.verifier is not None and len(transaction.inputs) >= self.parallel_verify_threshold:
+            reason = self.check_transactions([transaction])[0]
+        else:
+            reason = self._check_transaction(transaction)
+        validate_seconds.observe(time.perf_counter() - start_time, ("accepted" if reason is None else "rejected",))
+        
+        if reason is not None:
+            print(reason)
+            return False
+        return True
+
+    def _check_transaction(self, transaction: Transaction) -> Optional[str]:
+        """트랜잭션 순차 검증, 실패 시 첫 번째 실패 사유 반환"""
+        # 금액 비교는 사토시 정수로 (float 합계 오차로 정확한 금액이 거부되지 않도록)
         total_input = 0
-        total_output = sum(output.amount for output in transaction.outputs)
+        total_output = sum(_to_satoshi(output.amount) for output in transaction.outputs)
+        
+        digest = transaction.signing_digest() if transaction.inputs else None
         
         # 각 입력 검증
         for i, inp in enumerate(transaction.inputs):
-            # UTXO 존재 확인
-            utxo = self.utxo_pool.get_utxo(inp.prev_tx_id, inp.output_index)
+            # UTXO 존재 확인 (대기 트랜잭션의 출력 포함)
+            utxo = self._lookup_utxo(inp.prev_tx_id, inp.output_index)
             if not utxo:
-                print(f"UTXO not found: {inp.prev_tx_id}:{inp.output_index}")
-                return False
+                return f"UTXO not found: {inp.prev_tx_id}:{inp.output_index}"
             
             # 서명 검증
-            if not transaction.verify_input(i, utxo):
-                print(f"Invalid signature for input {i}")
-                return False
+            if not transaction.verify_input(i, utxo, digest):
+                return f"Invalid signature for input {i}"
             
-            total_input += utxo.amount
+            total_input += _to_satoshi(utxo.amount)
         
         # 입력 >= 출력 확인 (수수료 고려)
         if total_input < total_output:
-            print(f"Insufficient funds: input={total_input}, output={total_output}")
-            return False
+            return f"Insufficient funds: input={total_input / SATOSHI}, output={total_output / SATOSHI}"
         
-        return True
+        return None
 
-    def mine_block(self, miner_address: str) -> dict:
-        """블록 채굴"""
-        previous_block = self.get_previous_block()
-        previous_proof = previous_block["proof"]
-        index = len(self.chain) + 1
-        
-        # 채굴 보상 트랜잭션 생성
-        reward_tx = Transaction(
-            inputs=[],  # 코인베이스는 입력이 없음
-            outputs=[TransactionOutput(amount=10.0, address=miner_address)]
-        )
-        reward_tx.tx_id = f"coinbase_{index}"
-        
-        # 대기 중인 트랜잭션들과 보상 트랜잭션 포함
-        all_transactions = self.pending_transactions + [reward_tx]
+    def check_transactions(self, transactions: List[Transaction],
+                           lookup: Optional[Callable[[str, int], Optional[UTXO]]] = None) -> List[Optional[str]]:
+        """여러 트랜잭션의 서명을 한 번에 일괄 검증 (순차 검증과 같은 판정/첫 실패 사유)"""
+        lookup = lookup or self._lookup_utxo
+        resolved = []
+        checks = []
+        for transaction in transactions:
+            # 순차 경로는 없는 UTXO를 만나면 멈추므로 그 앞 입력까지만 서명 검증
+            utxos = []
+            missing = None
+            for inp in transaction.inputs:
+                utxo = lookup(inp.prev_tx_id, inp.output_index)
+                if not utxo:
+                    missing = f"UTXO not found: {inp.prev_tx_id}:{inp.output_index}"
+                    break
+                utxos.append(utxo)
+            resolved.append((utxos, missing))
+            checks.extend((transaction, i, utxo) for i, utxo in enumerate(utxos))
         
-        data = json.dumps({
-            "transactions": [tx.to_dict() for tx in all_transactions]
-        })
+        verifier = self.verifier or SignatureVerifier(workers=1)
+        results = iter(verifier.verify(checks))
         
-        proof = self._proof_of_work(previous_proof, index, data)
-        previous_hash = self._hash(previous_block)
-        
-        block = self._create_block(data, proof, previous_hash, index)
+        reasons = []
+        for transaction, (utxos, missing) in zip(transactions, resolved):
+            valid = [next(results) for _ in utxos]
+            reasons.append(self._first_failure(transaction, utxos, valid, missing))
+        return reasons
+
+    def _first_failure(self, transaction: Transaction, utxos: List[UTXO],
+                       valid: List[bool], missing: Optional[str]) -> Optional[str]:
+        """일괄 검증 결과를 입력 순서대로 훑어 순차 경로와 같은 실패 사유 결정"""
+        total_input = 0
+        for i, utxo in enumerate(utxos):
+            if not valid[i]:
+                return f"Invalid signature for input {i}"
+            total_input += _to_satoshi(utxo.amount)
+        if missing is not None:
+            return missing
         
-        # 블록을 체인에 추가
-        self.chain.append(block)
+        total_output = sum(_to_satoshi(output.amount) for output in transaction.outputs)
+        if total_input < total_output:
+            return f"Insufficient funds: input={total_input / SATOSHI}, output={total_output / SATOSHI}"
+        return None
+
+    def validate_block_transactions(self, transactions: List[Transaction], utxo_pool=None) -> Optional[str]:
+        """블록에 담길 트랜잭션 전체를 UTXO 풀(기본: 현재 풀) 기준으로 일괄 검증 (코인베이스 제외)"""
+        failures = self._block_transaction_failures(transactions, utxo_pool)
+        return None if not failures else f"{failures[0][0]}: {failures[0][1]}"
+
+    def _block_transaction_failures(self, transactions: List[Transaction],
+                                    utxo_pool=None) -> List[Tuple[str, str]]:
+        """블록 트랜잭션을 블록 순서대로 일괄 검증, 실패한 (tx_id, 사유) 목록 (블록 순서)
+
+        UTXO 풀은 바꾸지 않고 그 위에 이 블록에서 사용한 출력/만든 출력을 겹쳐 본다.
+        출력은 입력이 모두 확인된 뒤에만 이후 트랜잭션에 제공하고, 코인베이스 출력은
+        같은 블록 안에서 사용할 수 없다.
+        """
+        utxo_pool = self.utxo_pool if utxo_pool is None else utxo_pool
+        spent: Set[Tuple[str, int]] = set()
+        created: Dict[Tuple[str, int], UTXO] = {}   # 앞선 트랜잭션이 이 블록에서 만든 출력
+        resolved: Dict[Tuple[str, int], UTXO] = {}  # 입력이 가리키는 UTXO (서명 일괄 검증용)
+        regular: List[Tuple[int, Transaction]] = []
+        failures: List[Tuple[int, str, str]] = []
+        for position, transaction in enumerate(transactions):
+            if not transaction.inputs:
+                continue
+            if transaction.tx_id != transaction.unsigned_tx_id():
+                failures.append((position, transaction.tx_id, "tx_id does not match contents"))
+                continue
+            outpoints = [(inp.prev_tx_id, inp.output_index) for inp in transaction.inputs]
+            double_spent = next((outpoint for outpoint in outpoints if outpoint in spent), None)
+            if double_spent is not None:
+                failures.append((position, transaction.tx_id,
+                                 f"Double spend in block: {double_spent[0]}:{double_spent[1]}"))
+                continue
+            spent.update(outpoints)
+            regular.append((position, transaction))
+            
+            for outpoint in outpoints:
+                utxo = created.get(outpoint) or utxo_pool.get_utxo(*outpoint)
+                if utxo is None:
+                    break
+                resolved[outpoint] = utxo
+            else:
+                for i, output in enumerate(transaction.outputs):
+                    created[(transaction.tx_id, i)] = UTXO(transaction.tx_id, i, output.amount, output.address)
         
-        # UTXO 풀 업데이트
-        self._update_utxo_pool(all_transactions)
+        reasons = self.check_transactions([transaction for _, transaction in regular],
+                                          lambda tx_id, output_index: resolved.get((tx_id, output_index)))
+        for (position, transaction), reason in zip(regular, reasons):
+            if reason is not None:
+                failures.append((position, transaction.tx_id, reason))
+        return [(tx_id, reason) for _, tx_id, reason in sorted(failures)]
+
+    def _drop_invalid(self, transactions: List[Transaction], block_index: int) -> bool:
+        """블록에 넣을 트랜잭션을 검증해 실패한 것(과 그 자식)을 대기 풀에서 제거, 제거했으면 True"""
+        failures = self._block_transaction_failures(transactions)
+        for tx_id, reason in failures:
+            print(f"Dropped transaction for block {block_index}: {tx_id}: {reason}")
+            self.mempool.remove(tx_id)
+        return bool(failures)
+
+    def mine_block(self, miner_address: str) -> dict:
+        """블록 채굴"""
+        while True:
+            template = self.create_block_template(miner_address)
+            proof = self._proof_of_work(template["previous_proof"], template["index"], template["pow_input"])
+            block = self.commit_block(template, proof)
+            if block is not None:
+                return block
+            # 채굴 도중 다른 블록이 먼저 추가됨 -> 새 템플릿으로 재시도
+
+    def create_block_template(self, miner_address: str) -> dict:
+        """현재 대기 트랜잭션을 스냅샷하여 채굴할 블록 템플릿 생성"""
+        with self.lock:
+            self._sync_mempool()
+            previous_block = self.get_previous_block()
+            index = len(self.chain) + 1
+            
+            # 채굴 보상 트랜잭션 생성
+            reward_tx = Transaction(
+                inputs=[],  # 코인베이스는 입력이 없음
+                outputs=[TransactionOutput(amount=BLOCK_REWARD, address=miner_address)]
+            )
+            reward_tx.tx_id = f"coinbase_{index}"
+            
+            # 작업 증명 전에 검증해 무효한 트랜잭션을 한 번에 걸러냄 (제거 후 다시 선택)
+            selected = self.mempool.select(self.max_block_transactions)
+            while self.validate_blocks and self._drop_invalid(selected, index):
+                selected = self.mempool.select(self.max_block_transactions)
+            
+            # 대기 중인 트랜잭션들과 보상 트랜잭션 포함
+            all_transactions = selected + [reward_tx]
+            mempool_version = self.mempool.version
+            previous_hash = self._hash(previous_block)
         
-        # 대기 중인 트랜잭션 초기화
-        self.pending_transactions = []
+        tx_dicts = [tx.to_dict() for tx in all_transactions]
+        data = json.dumps({"transactions": tx_dicts})
         
-        return block
+        template = {
+            "index": index,
+            "previous_proof": previous_block["proof"],
+            "previous_hash": previous_hash,
+            "transactions": all_transactions,
+            "data": data,
+            "merkle_root": None,
+            "pow_input": data,
+            "mempool_version": mempool_version
+        }
+        if self.block_version >= 2:
+            # 머클 루트를 담은 고정 길이 헤더만 해싱 (블록 크기와 무관)
+            template["merkle_root"] = merkle_root(tx_dicts)
+            template["pow_input"] = block_header(BLOCK_VERSION, previous_hash, template["merkle_root"])
+        return template
+
+    def is_template_stale(self, template: dict) -> bool:
+        """템플릿 생성 이후 체인 끝이나 대기 트랜잭션이 바뀌었는지 확인"""
+        return (template["index"] != len(self.chain) + 1
+                or template["mempool_version"] != self.mempool_version)
+
+    def commit_block(self, template: dict, proof: int) -> Optional[dict]:
+        """채굴된 템플릿을 체인과 UTXO 풀에 원자적으로 반영 (체인 끝이 바뀌었으면 None)"""
+        with self.lock:
+            if template["index"] != len(self.chain) + 1 \
+                    or template["previous_hash"] != self._hash(self.get_previous_block()):
+                return None
+            
+            # 블록 수락 전 트랜잭션 일괄 재검증 (대기 풀에 들어온 뒤 UTXO가 바뀌었을 수 있음)
+            # 템플릿 이후 바뀐 것이 없으면 서명 캐시 덕분에 UTXO 조회 비용만 듦
+            self._sync_mempool()
+            if self.validate_blocks and self._drop_invalid(template["transactions"], template["index"]):
+                # 실패한 트랜잭션(과 그 자식)을 대기 풀에서 뺐으므로 None -> 호출자가 새 템플릿으로 재시도
+                return None
+            
+            block = self._create_block(template["data"], proof, template["previous_hash"],
+                                       template["index"], merkle_root_hash=template["merkle_root"])
+            
+            # 블록을 체인에 추가
+            self.chain.append(block)
+            self.block_hash_index[self._hash(block)] = len(self.chain)
+            
+            # UTXO 풀 / 트랜잭션 인덱스 업데이트
+            self._apply_block_transactions(len(self.chain), template["transactions"])
+            
+            # 블록에 포함된 트랜잭션과 충돌 트랜잭션만 대기 풀에서 제거 (채굴 중 도착한 트랜잭션은 유지)
+            self._sync_mempool()
+            self.mempool.remove_confirmed(template["transactions"])
+            
+            return block
 
     def _update_utxo_pool(self, transactions: List[Transaction]):
         """트랜잭션 처리 후 UTXO 풀 업데이트"""
-        for tx in transactions:
-            # 사용된 UTXO 제거
-            for inp in tx.inputs:
-                self.utxo_pool.remove_utxo(inp.prev_tx_id, inp.output_index)
-            
-            # 새로운 UTXO 추가
-            for i, output in enumerate(tx.outputs):
-                utxo = UTXO(
-                    tx_id=tx.tx_id,
-                    output_index=i,
-                    amount=output.amount,
-                    address=output.address
-                )
-                self.utxo_pool.add_utxo(utxo)
+        with utxo_update_seconds.time():
+            apply_transactions(self.utxo_pool, transactions)
+
+    def _apply_block_transactions(self, height: int, transactions: List[Transaction]):
+        """블록의 트랜잭션을 UTXO 풀과 tx_id 인덱스에 반영"""
+        self._update_utxo_pool(transactions)
+        for position, tx in enumerate(transactions):
+            self.tx_index[tx.tx_id] = (height, position)
+
+    def _parse_block(self, block: dict) -> List[Transaction]:
+        return [Transaction.from_dict(tx) for tx in self.get_block_transactions(block)]
+
+    def replay_block(self, block: dict):
+        """저장된 블록을 체인에 붙이고 UTXO 풀/인덱스에 반영 (검증 없이 재생)"""
+        with self.lock:
+            self.chain.append(block)
+            self.block_hash_index[self._hash(block)] = len(self.chain)
+            self._apply_block_transactions(len(self.chain), self._parse_block(block))
+
+    def rebuild_block_hash_index(self):
+        """블록 해시 인덱스 재구성 (다음 블록의 previous_hash를 사용하므로 끝 블록만 해싱)"""
+        self.block_hash_index.clear()
+        for height, block in enumerate(self.chain[1:], start=1):
+            self.block_hash_index[block["previous_hash"]] = height
+        if self.chain:
+            self.block_hash_index[self._hash(self.chain[-1])] = len(self.chain)
+
+    def rebuild_utxo_pool(self, blocks: Optional[Iterable[dict]] = None):
+        """블록을 하나씩 파싱하며 UTXO 풀과 tx_id 인덱스 전체 재구성 (파싱된 체인을 메모리에 쌓지 않음)"""
+        with self.lock:
+            self.utxo_pool.clear()
+            self.tx_index.clear()
+            for height, block in enumerate(self.chain if blocks is None else blocks, start=1):
+                self._apply_block_transactions(height, self._parse_block(block))
+            self.rebuild_block_hash_index()
+
+    def utxo_snapshot(self) -> dict:
+        """체인 끝(높이/해시)을 태그로 붙인 UTXO 스냅샷 (tx_id 인덱스 포함)"""
+        with self.lock:
+            return {
+                "version": UTXO_SNAPSHOT_VERSION,
+                "height": len(self.chain),
+                "tip_hash": self._hash(self.chain[-1]),
+                "utxos": [utxo.to_dict() for utxo in self.utxo_pool.utxos.values()],
+                "tx_index": dict(self.tx_index)
+            }
+
+    def load_utxo_snapshot(self, snapshot: dict) -> bool:
+        """스냅샷 적용 후 그 이후 블록만 재생 (스냅샷이 현재 체인과 맞지 않으면 False)"""
+        height = snapshot.get("height", 0)
+        if snapshot.get("version") != UTXO_SNAPSHOT_VERSION or not 0 < height <= len(self.chain):
+            return False
+        if self._hash(self.chain[height - 1]) != snapshot.get("tip_hash") or "tx_index" not in snapshot:
+            return False
+
+        with self.lock:
+            self.utxo_pool.clear()
+            for utxo in snapshot["utxos"]:
+                self.utxo_pool.add_utxo(UTXO(**utxo))
+            self.tx_index.clear()
+            self.tx_index.update((tx_id, tuple(location)) for tx_id, location in snapshot["tx_index"].items())
+            for block_height in range(height + 1, len(self.chain) + 1):
+                self._apply_block_transactions(block_height, self._parse_block(self.chain[block_height - 1]))
+            self.rebuild_block_hash_index()
+        return True
+
+    def find_transaction(self, tx_id: str) -> Optional[dict]:
+        """tx_id 인덱스로 확정된 트랜잭션 조회 (체인 길이와 무관하게 블록 하나만 파싱)"""
+        location = self.tx_index.get(tx_id)
+        if location is None:
+            return None
+        height, position = location
+        block = self.get_block(height)
+        if block is None:
+            return None
+        transactions = self.get_block_transactions(block)
+        if position >= len(transactions) or transactions[position]["tx_id"] != tx_id:
+            return None
+        return {
+            "transaction": transactions[position],
+            "block_height": height,
+            "position": position,
+            "confirmations": len(self.chain) - height + 1
+        }
+
+    def get_transaction_proof(self, tx_id: str) -> Optional[dict]:
+        """확정된 트랜잭션의 머클 포함 증명과 블록 헤더 (블록 전체 없이 검증 가능, 레거시 블록은 None)"""
+        location = self.tx_index.get(tx_id)
+        if location is None:
+            return None
+        height, position = location
+        block = self.get_block(height)
+        if block is None or block.get("version", 1) < 2 or height < 2:
+            return None
+
+        # 같은 블록의 증명 요청은 블록 파싱/트리 생성을 다시 하지 않음
+        cache_key = (height, block["merkle_root"])
+        cached = merkle_tree_cache.get(cache_key)
+        if cached is None:
+            transactions = self.get_block_transactions(block)
+            cached = (transactions, merkle_levels(transactions))
+            merkle_tree_cache.put(cache_key, cached)
+        transactions, levels = cached
+        if position >= len(transactions) or transactions[position]["tx_id"] != tx_id:
+            return None
+        transaction = transactions[position]
+
+        previous_block = self.get_block(height - 1)
+        return {
+            "transaction": transaction,
+            "block_height": height,
+            "position": position,
+            "proof": merkle_proof(levels, position),
+            "header": {
+                "index": block["index"],
+                "version": block["version"],
+                "previous_hash": block["previous_hash"],
+                "merkle_root": block["merkle_root"],
+                "proof": block["proof"],
+                "previous_proof": previous_block["proof"],
+                "timestamp": block["timestamp"]
+            },
+            "confirmations": len(self.chain) - height + 1
+        }
+
+    def find_block_by_hash(self, block_hash: str) -> Optional[Tuple[int, dict]]:
+        """블록 해시 인덱스로 블록 조회"""
+        height = self.block_hash_index.get(block_hash)
+        if height is None or height > len(self.chain):
+            return None
+        block = self.chain[height - 1]
+        # 인덱스는 previous_hash로 만들어지므로 실제 해시와 한 번 더 대조
+        if self._hash(block) != block_hash:
+            return None
+        return height, block
 
     def _proof_of_work(self, previous_proof: int, index: int, data: str) -> int:
         """작업 증명"""
+        if self.miner is not None and self.miner.workers > 1:
+            proof = self.miner.mine(previous_proof, index, data)
+            self.last_mining_stats = self.miner.last_stats
+            self._record_pow_stats()
+            return proof
+
+        start_time = time.perf_counter()
         new_proof = 1
         while True:
             to_digest = f"{new_proof**2 - previous_proof**2 + index}{data}"
             hash_operation = hashlib.sha256(to_digest.encode()).hexdigest()
             if hash_operation[:4] == "0000":
-                return new_proof
+                break
             new_proof += 1
 
+        elapsed = time.perf_counter() - start_time
+        self.last_mining_stats = {
+            "workers": 1,
+            "attempts": new_proof,
+            "elapsed": elapsed,
+            "hashrate": new_proof / elapsed if elapsed > 0 else 0.0
+        }
+        self._record_pow_stats()
+        return new_proof
+
+    def _record_pow_stats(self):
+        stats = self.last_mining_stats
+        pow_seconds.observe(stats["elapsed"])
+        pow_attempts.inc(stats["attempts"])
+        pow_hashrate.set(stats["hashrate"])
+
+    @staticmethod
+    def get_block_transactions(block: dict) -> List[dict]:
+        """블록 data 필드의 트랜잭션 목록 (Genesis 블록은 빈 목록)"""
+        try:
+            return json.loads(block["data"]).get("transactions", [])
+        except (ValueError, AttributeError):
+            return []
+
+    def _proof_input(self, block: dict) -> str:
+        """블록 버전에 맞는 작업 증명 해시 입력"""
+        version = block.get("version", 1)
+        if version >= 2:
+            return block_header(version, block["previous_hash"], block["merkle_root"])
+        return block["data"]
+
+    def check_block(self, block: dict, previous_block: dict) -> Optional[str]:
+        """레거시/버전 2 블록 모두 검증 (연결, 머클 루트, 작업 증명), 실패 시 사유 반환"""
+        if block["index"] != previous_block["index"] + 1:
+            return f"Unexpected index {block['index']} after {previous_block['index']}"
+        if block["previous_hash"] != self._hash(previous_block):
+            return "previous_hash does not match previous block"
+
+        version = block.get("version", 1)
+        if version > BLOCK_VERSION:
+            return f"Unknown block version {version}"
+        if version >= 2 and block["merkle_root"] != merkle_root(self.get_block_transactions(block)):
+            return "Merkle root mismatch"
+
+        to_digest = f"{block['proof']**2 - previous_block['proof']**2 + block['index']}{self._proof_input(block)}"
+        if hashlib.sha256(to_digest.encode()).hexdigest()[:4] != "0000":
+            return "Invalid proof of work"
+        return None
+
+    def is_valid_block(self, block: dict, previous_block: dict) -> bool:
+        """블록 검증 (연결, 머클 루트, 작업 증명)"""
+        return self.check_block(block, previous_block) is None
+
+    def is_chain_valid(self, chain: Optional[List[dict]] = None, check_transactions: bool = False) -> bool:
+        """체인 전체의 연결과 작업 증명 검증
+
+        check_transactions=True 이면 빈 UTXO 풀에 블록을 차례로 재생하며 블록마다
+        구조 규칙(check_block_rules, ChainVerifier와 동일)과 트랜잭션(서명/UTXO/금액)을
+        일괄 검증한다 (대용량 체인은 chain_verifier 사용).
+        """
+        chain = self.chain if chain is None else chain
+        utxo_pool = UTXOPool() if check_transactions else None
+        previous_block = None
+        for height, block in enumerate(chain, start=1):
+            reason = self.check_block(block, previous_block) if previous_block is not None else None
+            if reason is None and utxo_pool is not None:
+                transactions = self._parse_block(block)
+                failure = check_block_rules(transactions, height)
+                if failure is not None:
+                    reason = f"{failure[0]}: {failure[1]}"
+                else:
+                    reason = self.validate_block_transactions(transactions, utxo_pool)
+                apply_transactions(utxo_pool, transactions)
+            if reason is not None:
+                print(f"Invalid block {block.get('index')}: {reason}")
+                return False
+            previous_block = block
+        return True
+
     def get_balance(self, address: str) -> float:
         """주소의 잔액 조회"""
         return self.utxo_pool.get_balance(address)
 
     def create_transaction(self, sender_address: str, receiver_address: str, 
-                          amount: float, sender_wallet: Wallet) -> Optional[Transaction]:
+                          amount: float, sender_wallet: Wallet,
+                          strategy: str = DEFAULT_COIN_SELECTION) -> Optional[Transaction]:
         """트랜잭션 생성 도우미 함수"""
-        # 송신자의 UTXO 조회
-        utxos = self.utxo_pool.get_utxos_by_address(sender_address)
+        return self.create_batch_transaction(sender_address, [(receiver_address, amount)],
+                                             sender_wallet, strategy)
+
+    def create_batch_transaction(self, sender_address: str, payments: List[Tuple[str, float]],
+                                 sender_wallet: Wallet,
+                                 strategy: str = DEFAULT_COIN_SELECTION) -> Optional[Transaction]:
+        """여러 수신자에게 보내는 다중 출력 트랜잭션 생성 (UTXO 조회/선택/서명은 한 번)"""
+        select = COIN_SELECTION_STRATEGIES.get(strategy)
+        if select is None:
+            print(f"Unknown coin selection strategy: {strategy}")
+            return None
+        # 지급액 합계는 사토시 정수로 (0.1 + 0.2 같은 float 합계 오차 방지)
+        target_satoshi = sum(_to_satoshi(payment_amount) for _, payment_amount in payments)
+        amount = target_satoshi / SATOSHI
         
-        # 필요한 금액만큼 UTXO 선택
-        selected_utxos = []
-        total_selected = 0
-        for utxo in utxos:
-            selected_utxos.append(utxo)
-            total_selected += utxo.amount
-            if total_selected >= amount:
-                break
+        # 송신자의 UTXO 조회 (이미 대기 트랜잭션이 사용 중인 UTXO 제외)
+        mempool = self._read_mempool()
+        utxos = [utxo for utxo in self.utxo_pool.get_utxos_by_address(sender_address)
+                 if not mempool.is_spent(utxo.tx_id, utxo.output_index)]
         
-        if total_selected < amount:
-            print(f"Insufficient balance: need {amount}, have {total_selected}")
+        # 전략에 따라 필요한 금액만큼 UTXO 선택 (확정된 UTXO로 부족할 때만 미확정 거스름돈까지 사용)
+        selected_utxos = select(utxos, amount)
+        if selected_utxos is None:
+            utxos += [utxo for utxo in mempool.get_outputs_by_address(sender_address)
+                      if len(mempool.ancestors([utxo.tx_id])) < MAX_MEMPOOL_ANCESTORS]
+            selected_utxos = select(utxos, amount)
+        if selected_utxos is None:
+            print(f"Insufficient balance: need {amount}, have {sum(utxo.amount for utxo in utxos)}")
             return None
+        selected_satoshi = sum(_to_satoshi(utxo.amount) for utxo in selected_utxos)
         
         # 입력 생성
         inputs = []
@@ -390,19 +1702,19 @@ class Blockchain:
             )
             inputs.append(tx_input)
         
-        # 출력 생성
-        outputs = [TransactionOutput(amount=amount, address=receiver_address)]
+        # 출력 생성 (수신자마다 하나)
+        outputs = [TransactionOutput(amount=payment_amount, address=receiver_address)
+                   for receiver_address, payment_amount in payments]
         
-        # 거스름돈 처리
-        change = total_selected - amount
-        if change > 0:
-            outputs.append(TransactionOutput(amount=change, address=sender_address))
+        # 거스름돈 처리 (사토시 정수로 계산, 정확히 맞으면 거스름돈 출력 없음)
+        if selected_satoshi > target_satoshi:
+            outputs.append(TransactionOutput(amount=(selected_satoshi - target_satoshi) / SATOSHI,
+                                             address=sender_address))
         
         # 트랜잭션 생성
         transaction = Transaction(inputs, outputs)
         
-        # 각 입력에 서명
-        for i in range(len(inputs)):
-            transaction.sign_input(i, sender_wallet.get_private_key_hex())
+        # 각 입력에 서명 (지갑에 캐시된 서명 키 사용)
+        transaction.sign_inputs(signing_key=sender_wallet.signing_key)
         
-        return transaction
\ No newline at end of file
+        return transaction
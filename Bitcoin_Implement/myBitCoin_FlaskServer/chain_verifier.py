@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bitcoin_utxo import Blockchain, Transaction, UTXO, SignatureVerifier, SATOSHI, _to_satoshi, check_block_rules
+
+PROGRESS_VERSION = 1
+
+_checker: Optional[Blockchain] = None
+
+
+def _get_checker() -> Blockchain:
+    """블록 해시/헤더 검증용 빈 블록체인 (프로세스마다 하나)"""
+    global _checker
+    if _checker is None:
+        _checker = Blockchain()
+    return _checker
+
+
+def _check_headers_job(pairs: List[Tuple[dict, dict]]) -> List[Optional[str]]:
+    """(이전 블록, 블록) 묶음의 연결/머클 루트/작업 증명 검증 (워커 프로세스에서 실행)"""
+    checker = _get_checker()
+    return [checker.check_block(block, previous_block) for previous_block, block in pairs]
+
+
+def _check_links_job(pairs: List[Tuple[dict, dict]]) -> bool:
+    """(이전 블록, 블록) 묶음의 해시 연결만 확인 (이어서 검증할 때 이미 검증한 구간 재확인용)"""
+    checker = _get_checker()
+    return all(block["previous_hash"] == checker._hash(previous_block) for previous_block, block in pairs)
+
+
+class ChainVerifier:
+    """체인 전체 검증 (연결, 작업 증명, UTXO 재생, 모든 서명), 구간마다 진행 상황을 저장해 중단 후 이어서 검증"""
+    def __init__(self, workers: Optional[int] = None, checkpoint_every: int = 1000,
+                 progress_path: Optional[str] = None, header_chunk_size: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_every = checkpoint_every  # 이 블록 수마다 진행 상황 저장
+        self.progress_path = progress_path        # None이면 저장하지 않음
+        self.header_chunk_size = header_chunk_size  # 헤더 검증 작업 하나에 묶는 블록 수
+        self.last_stats: Dict[str, float] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._verifier: Optional[SignatureVerifier] = None
+
+    def verify(self, chain: Sequence[dict], on_progress=None) -> Optional[str]:
+        """체인 검증, 성공 시 None / 실패 시 첫 번째 실패 사유 ("block N: ...")"""
+        start_time = time.perf_counter()
+        length = len(chain)
+        self.last_stats = {"blocks": 0, "signatures": 0, "resumed_from": 0}
+        if length == 0:
+            return "Empty chain"
+
+        height, utxos = self._load_progress(chain, length)
+        self.last_stats["resumed_from"] = height
+        if height == 0:
+            genesis = chain[0]
+            if genesis.get("index") != 1 or genesis.get("previous_hash") != "0":
+                return "block 1: Invalid genesis block"
+            height = 1
+            self._replay([genesis], 1, utxos, [])
+
+        try:
+            while height < length:
+                end = min(length, height + self.checkpoint_every)
+                # 이전 블록 하나를 포함해 구간을 읽음 (연결 검증용)
+                reason = self._verify_segment(chain[height - 1:end], height, utxos)
+                if reason is not None:
+                    return reason
+                self.last_stats["blocks"] += end - height
+                height = end
+                self._save_progress(height, chain[height - 1], utxos)
+                if on_progress is not None:
+                    on_progress(height, length, self._rate(start_time))
+        finally:
+            self.last_stats["elapsed"] = time.perf_counter() - start_time
+            self.last_stats["blocks_per_second"] = self._rate(start_time)
+        return None
+
+    def _rate(self, start_time: float) -> float:
+        elapsed = time.perf_counter() - start_time
+        return self.last_stats["blocks"] / elapsed if elapsed > 0 else 0.0
+
+    def _verify_segment(self, blocks: List[dict], start_height: int, utxos: Dict[str, UTXO]) -> Optional[str]:
+        """구간 검증: 헤더 검증을 프로세스 풀에 먼저 보내고, 그동안 UTXO를 순서대로 재생한 뒤 서명을 일괄 검증"""
+        pairs = list(zip(blocks, blocks[1:]))
+        chunks = [pairs[i:i + self.header_chunk_size] for i in range(0, len(pairs), self.header_chunk_size)]
+        if self.workers <= 1 or len(chunks) <= 1:
+            header_results = map(_check_headers_job, chunks)
+        else:
+            header_results = self._get_executor().map(_check_headers_job, chunks)
+
+        # UTXO 재생은 블록 순서에 의존하므로 메인 프로세스에서 순차 처리 (서명 확인 목록만 수집)
+        checks: List[Tuple[Transaction, int, UTXO]] = []
+        check_heights: List[int] = []
+        failures: List[Tuple[int, str]] = []
+        replay_failure = self._replay(blocks[1:], start_height + 1, utxos, checks, check_heights)
+        if replay_failure is not None:
+            failures.append(replay_failure)
+
+        for height, reason in enumerate((r for chunk in header_results for r in chunk), start=start_height + 1):
+            if reason is not None:
+                failures.append((height, reason))
+                break
+
+        results = self._get_verifier().verify(checks)
+        self.last_stats["signatures"] += len(checks)
+        for (transaction, input_index, _), height, valid in zip(checks, check_heights, results):
+            if not valid:
+                failures.append((height, f"{transaction.tx_id}: Invalid signature for input {input_index}"))
+                break
+
+        if failures:
+            height, reason = min(failures, key=lambda failure: failure[0])
+            return f"block {height}: {reason}"
+        return None
+
+    def _replay(self, blocks: List[dict], start_height: int, utxos: Dict[str, UTXO],
+                checks: List[Tuple[Transaction, int, UTXO]],
+                check_heights: Optional[List[int]] = None) -> Optional[Tuple[int, str]]:
+        """블록 트랜잭션을 UTXO 집합에 반영하며 구조/금액 확인, 실패 시 (높이, 사유)"""
+        for height, block in enumerate(blocks, start=start_height):
+            try:
+                transactions = [Transaction.from_dict(tx_data) for tx_data in Blockchain.get_block_transactions(block)]
+            except (KeyError, TypeError) as e:
+                return height, f"Malformed transaction: {e}"
+            # 코인베이스/tx_id 규칙은 Blockchain.is_chain_valid와 같은 함수로 확인
+            failure = check_block_rules(transactions, height)
+            if failure is not None:
+                return height, f"{failure[0]}: {failure[1]}"
+
+            for transaction in transactions:
+                if transaction.inputs:
+                    total_input = 0
+                    for i, inp in enumerate(transaction.inputs):
+                        # 꺼내면서 사용 처리 (같은 블록/이후 블록의 이중 지불 검출)
+                        utxo = utxos.pop(f"{inp.prev_tx_id}:{inp.output_index}", None)
+                        if utxo is None:
+                            return height, f"{transaction.tx_id}: UTXO not found: {inp.prev_tx_id}:{inp.output_index}"
+                        checks.append((transaction, i, utxo))
+                        if check_heights is not None:
+                            check_heights.append(height)
+                        total_input += _to_satoshi(utxo.amount)
+                    total_output = sum(_to_satoshi(output.amount) for output in transaction.outputs)
+                    if total_input < total_output:
+                        return height, (f"{transaction.tx_id}: Insufficient funds: "
+                                        f"input={total_input / SATOSHI}, output={total_output / SATOSHI}")
+
+                for i, output in enumerate(transaction.outputs):
+                    utxos[f"{transaction.tx_id}:{i}"] = UTXO(transaction.tx_id, i, output.amount, output.address)
+        return None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _get_verifier(self) -> SignatureVerifier:
+        """서명 검증도 헤더 검증과 같은 프로세스 풀 사용"""
+        if self._verifier is None:
+            executor = self._get_executor() if self.workers > 1 else None
+            self._verifier = SignatureVerifier(workers=self.workers, executor=executor)
+        return self._verifier
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._verifier = None
+
+    def _load_progress(self, chain: Sequence[dict], length: int) -> Tuple[int, Dict[str, UTXO]]:
+        """저장된 진행 상황 복원 (체인의 같은 높이 블록 해시가 일치할 때만, 아니면 처음부터)"""
+        if self.progress_path is None or not os.path.exists(self.progress_path):
+            return 0, {}
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable verification progress: {e}")
+            return 0, {}
+
+        height = progress.get("height", 0)
+        if progress.get("version") != PROGRESS_VERSION or not 0 < height <= length:
+            return 0, {}
+        if _get_checker()._hash(chain[height - 1]) != progress.get("tip_hash"):
+            # 검증한 뒤로 체인이 바뀜
+            return 0, {}
+        if not self._prefix_linked(chain, height):
+            # 끝 블록은 같지만 앞쪽 블록이 바뀜 (해시 연결만 다시 확인하면 나머지 검증은 건너뛸 수 있음)
+            print(f"Chain changed below verified height {height}, verifying from scratch")
+            return 0, {}
+        utxos = {f"{utxo['tx_id']}:{utxo['output_index']}": UTXO(**utxo) for utxo in progress["utxos"]}
+        return height, utxos
+
+    def _prefix_linked(self, chain: Sequence[dict], height: int) -> bool:
+        """이미 검증한 구간의 해시 연결 재확인 (블록당 해시 한 번, 머클 루트/작업 증명/서명은 건너뜀)"""
+        for start in range(1, height, self.checkpoint_every):
+            blocks = chain[start - 1:min(height, start + self.checkpoint_every)]
+            pairs = list(zip(blocks, blocks[1:]))
+            chunks = [pairs[i:i + self.header_chunk_size] for i in range(0, len(pairs), self.header_chunk_size)]
+            if self.workers <= 1 or len(chunks) <= 1:
+                results = map(_check_links_job, chunks)
+            else:
+                results = self._get_executor().map(_check_links_job, chunks)
+            if not all(results):
+                return False
+        return True
+
+    def _save_progress(self, height: int, tip: dict, utxos: Dict[str, UTXO]):
+        """검증된 높이/끝 블록 해시/UTXO 집합을 원자적으로 기록"""
+        if self.progress_path is None:
+            return
+        progress = {
+            "version": PROGRESS_VERSION,
+            "height": height,
+            "tip_hash": _get_checker()._hash(tip),
+            "utxos": [utxo.to_dict() for utxo in utxos.values()]
+        }
+        tmp_path = f"{self.progress_path}.{os.getpid()}.tmp"  # 여러 워커 프로세스가 동시에 기록해도 충돌하지 않게
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(progress, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.progress_path)
+
+
+def load_chain_files(checkpoint_path: str, journal_path: str, legacy_path: str) -> List[dict]:
+    """서버 저장 파일에서 체인 읽기 (체크포인트 + 저널의 블록 이벤트, 없으면 레거시 파일), 파일은 수정하지 않음"""
+    if not os.path.exists(checkpoint_path):
+        with open(legacy_path, 'r') as f:
+            return json.load(f).get('chain', [])
+
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    chain = checkpoint.get('chain', [])
+    if os.path.exists(journal_path):
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 쓰기 도중 중단된 꼬리
+                event = json.loads(line)
+                if event["seq"] > checkpoint.get("seq", 0) and event["type"] == "block":
+                    chain.append(event["block"])
+    return chain
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="블록체인 전체 검증 (연결, 작업 증명, UTXO 재생, 서명)")
+    parser.add_argument("--sqlite", help="SQLite 저장소 경로 (지정하지 않으면 체크포인트/저널/레거시 파일)")
+    parser.add_argument("--checkpoint-file", default="blockchain_checkpoint.json")
+    parser.add_argument("--journal-file", default="blockchain_journal.log")
+    parser.add_argument("--legacy-file", default="blockchain_data.json")
+    parser.add_argument("--progress", default="chain_verify_progress.json", help="진행 상황 파일 (이어서 검증)")
+    parser.add_argument("--restart", action="store_true", help="저장된 진행 상황을 무시하고 처음부터 검증")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="진행 상황 저장 간격 (블록 수)")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_store import SQLiteStore
+        chain = SQLiteStore(args.sqlite).chain
+    else:
+        chain = load_chain_files(args.checkpoint_file, args.journal_file, args.legacy_file)
+    if args.restart and os.path.exists(args.progress):
+        os.remove(args.progress)
+
+    verifier = ChainVerifier(workers=args.workers, checkpoint_every=args.checkpoint_every,
+                             progress_path=args.progress)
+    print(f"🔎 Verifying {len(chain)} blocks with {verifier.workers} workers")
+    reason = verifier.verify(chain, on_progress=lambda height, length, rate:
+                             print(f"   {height}/{length} blocks ({rate:,.0f} blocks/s)"))
+    verifier.shutdown()
+
+    stats = verifier.last_stats
+    resumed = f", resumed from block {stats['resumed_from']}" if stats["resumed_from"] else ""
+    print(f"   {stats['blocks']} blocks, {stats['signatures']} signatures in {stats['elapsed']:.2f}s "
+          f"({stats['blocks_per_second']:,.0f} blocks/s{resumed})")
+    if reason is not None:
+        print(f"❌ Chain invalid: {reason}")
+        raise SystemExit(1)
+    print("✅ Chain valid")
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import threading
+from typing import List, Optional, Tuple
+
+
+class Journal:
+    """블록/지갑 이벤트를 추가 전용으로 기록하는 저널 + 주기적 체크포인트"""
+    def __init__(self, journal_path: str, checkpoint_path: str, fsync_every: int = 32,
+                 fsync_interval: float = 1.0, checkpoint_every: int = 1000):
+        self.journal_path = journal_path
+        self.checkpoint_path = checkpoint_path
+        self.fsync_every = fsync_every          # 이 개수만큼 쌓이면 fsync
+        self.fsync_interval = fsync_interval    # 마지막 fsync 이후 이 시간(초)이 지나면 fsync
+        self.checkpoint_every = checkpoint_every  # 저널 이벤트가 이만큼 쌓이면 체크포인트 권장
+        self.seq = 0                 # 마지막으로 기록된 이벤트 번호
+        self.events_since_checkpoint = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        return self._file
+
+    def append(self, event: dict):
+        """이벤트 한 줄 추가 (변경분만 기록)"""
+        with self._lock:
+            self.seq += 1
+            record = dict(event, seq=self.seq)
+            f = self._open()
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+            f.flush()
+            self._unsynced += 1
+            self.events_since_checkpoint += 1
+
+            # fsync는 일정 개수/시간 단위로 묶어서 수행
+            if self._unsynced >= self.fsync_every or \
+                    time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """대기 중인 기록을 디스크에 강제 반영"""
+        with self._lock:
+            self._sync_locked()
+
+    def should_checkpoint(self) -> bool:
+        return self.events_since_checkpoint >= self.checkpoint_every
+
+    def write_checkpoint(self, state: dict):
+        """전체 상태를 원자적으로 기록한 뒤 저널 비우기"""
+        with self._lock:
+            self._sync_locked()
+            tmp_path = self.checkpoint_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(state, seq=self.seq), f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.checkpoint_path)
+
+            # 체크포인트가 저널 내용을 모두 포함하므로 저널 초기화
+            # (초기화 전에 중단되어도 복구 시 seq로 중복 이벤트를 건너뜀)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self.events_since_checkpoint = 0
+
+    def recover(self) -> Tuple[Optional[dict], List[dict]]:
+        """체크포인트와 그 이후의 저널 이벤트 복구 (마지막 불완전한 줄은 잘라냄)"""
+        with self._lock:
+            checkpoint = None
+            if os.path.exists(self.checkpoint_path):
+                with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+            checkpoint_seq = checkpoint.get("seq", 0) if checkpoint else 0
+
+            events = []
+            valid_length = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'rb') as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        try:
+                            event = json.loads(line)
+                        except ValueError:
+                            break
+                        valid_length += len(line)
+                        if event["seq"] > checkpoint_seq:
+                            events.append(event)
+
+                # 쓰기 도중 중단된 꼬리 부분 제거
+                if valid_length != os.path.getsize(self.journal_path):
+                    print(f"Truncating torn journal tail at byte {valid_length}")
+                    with open(self.journal_path, 'r+b') as f:
+                        f.truncate(valid_length)
+
+            self.seq = events[-1]["seq"] if events else checkpoint_seq
+            self.events_since_checkpoint = len(events)
+            return checkpoint, events
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from bitcoin_utxo import Wallet
+
+
+def generate_key_triples(count: int) -> List[Tuple[str, str, str]]:
+    """(개인키, 공개키, 주소) 묶음 생성 (워커 프로세스에서도 실행)"""
+    triples = []
+    for _ in range(count):
+        wallet = Wallet()
+        triples.append((wallet.get_private_key_hex(), wallet.get_public_key_hex(), wallet.get_address()))
+    return triples
+
+
+class KeyPool:
+    """미리 생성한 키를 보관하여 지갑 생성 요청에서 타원 곡선 연산을 제거 (백그라운드 스레드가 채움)"""
+    def __init__(self, size: int = 100, workers: int = 1, batch_size: int = 16):
+        self.size = size
+        self.workers = workers
+        self.batch_size = batch_size
+        self.keys: "deque[Tuple[str, str, str]]" = deque()
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.refill_rate = 0.0  # 최근 배치의 초당 생성 키 수
+        self._condition = threading.Condition()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def start(self):
+        """채우기 스레드 시작 (fork 된 워커 프로세스에서는 처음 사용할 때 다시 시작)"""
+        if self.size <= 0:
+            return
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _after_fork(self):
+        """fork 된 자식 프로세스: 부모의 키를 버리고 (여러 워커가 같은 키를 나눠 주지 않도록) 상태 초기화"""
+        self._condition = threading.Condition()
+        self.keys.clear()
+        self.hits = self.misses = self.generated = 0
+        self.refill_rate = 0.0
+        self._executor = None
+        self._thread = None
+
+    def pop(self) -> Wallet:
+        """준비된 키로 지갑 생성 (비어 있으면 요청 스레드에서 직접 생성)"""
+        self.start()
+        with self._condition:
+            if self.keys:
+                private_key, public_key, address = self.keys.popleft()
+                self.hits += 1
+                self._condition.notify()
+                return Wallet.from_keys(private_key, public_key, address)
+            self.misses += 1
+            self._condition.notify()
+        return Wallet()
+
+    def stats(self) -> dict:
+        with self._condition:
+            requests = self.hits + self.misses
+            return {
+                "size": len(self.keys),
+                "target_size": self.size,
+                "workers": self.workers,
+                "generated": self.generated,
+                "refill_rate": self.refill_rate,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0
+            }
+
+    def _generate(self, count: int) -> List[Tuple[str, str, str]]:
+        """키 묶음 생성 (workers > 1 이면 프로세스 풀에 나눠서)"""
+        if self.workers <= 1:
+            return generate_key_triples(count)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunk = -(-count // self.workers)
+        counts = [min(chunk, count - start) for start in range(0, count, chunk)]
+        return [triple for triples in self._executor.map(generate_key_triples, counts) for triple in triples]
+
+    def _run(self):
+        """목표 크기보다 작아지면 배치 단위로 채움"""
+        while True:
+            with self._condition:
+                while len(self.keys) >= self.size:
+                    self._condition.wait()
+                count = min(self.batch_size, self.size - len(self.keys))
+            start_time = time.perf_counter()
+            try:
+                triples = self._generate(count)
+            except Exception as e:
+                print(f"Key pool refill failed: {e}")
+                time.sleep(1)
+                continue
+            elapsed = time.perf_counter() - start_time
+            with self._condition:
+                self.keys.extend(triples)
+                self.generated += len(triples)
+                self.refill_rate = len(triples) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,302 @@
+import argparse
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from test_client import BitcoinClient
+
+# 기본 요청 비율 (가중치)
+DEFAULT_MIX = {"balance": 50, "utxos": 10, "create_wallet": 10, "send": 25, "mine": 5}
+
+
+def _percentile(samples: list, ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """"balance=50,send=25" 형식의 요청 비율 파싱"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class EndpointStats:
+    """엔드포인트별 지연 시간과 오류 종류 집계"""
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+
+    def record(self, latency: float, error: Optional[str]):
+        self.latencies.append(latency)
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        requests = len(self.latencies)
+        error_count = sum(self.errors.values())
+        return {
+            "requests": requests,
+            "errors": error_count,
+            "error_rate": error_count / requests if requests else 0.0,
+            "throughput_per_s": requests / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": _percentile(self.latencies, 0.50) * 1000,
+            "p95_ms": _percentile(self.latencies, 0.95) * 1000,
+            "p99_ms": _percentile(self.latencies, 0.99) * 1000,
+            "max_ms": max(self.latencies) * 1000 if self.latencies else 0.0,
+            "error_breakdown": dict(sorted(self.errors.items(), key=lambda item: -item[1]))
+        }
+
+
+class LoadGenerator:
+    """여러 워커 스레드로 목표 초당 요청 수에 맞춰 API 호출 (스레드마다 연결을 재사용하는 세션)"""
+    def __init__(self, base_url: str = "http://localhost:5000/api", workers: int = 8,
+                 seed: Optional[int] = None, amount: float = 0.01):
+        self.base_url = base_url
+        self.workers = workers
+        self.amount = amount
+        self.rng = random.Random(seed)
+        self.addresses: List[str] = []  # 서버에 등록된 지갑
+        self.funded: List[str] = []     # 채굴 보상을 받은 지갑 (송금자 후보)
+        self.tx_ids: List[str] = []     # 전송 성공한 트랜잭션
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.operations = {
+            "create_wallet": self._create_wallet,
+            "balance": self._balance,
+            "utxos": self._utxos,
+            "send": self._send,
+            "mine": self._mine,
+            "stats": self._stats,
+            "blockchain": self._blockchain,
+            "transaction": self._transaction,
+            "proof": self._proof,
+        }
+
+    def _client(self) -> BitcoinClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = BitcoinClient(self.base_url, pool_size=1)
+        return client
+
+    def _call(self, endpoint: str, method: str = "GET", data=None) -> Tuple[Optional[dict], Optional[str]]:
+        """(응답 데이터, 오류 종류) 반환 (오류 종류는 상태 코드 + 메시지 또는 예외 이름)"""
+        try:
+            status, result = self._client().request(endpoint, method, data)
+        except Exception as e:
+            return None, type(e).__name__
+        if status >= 400 or not result.get("success", False):
+            return result, f"HTTP {status}: {str(result.get('error', 'Unknown error'))[:60]}"
+        return result, None
+
+    def _pick(self, items: List[str]) -> Optional[str]:
+        with self._lock:
+            return self.rng.choice(items) if items else None
+
+    # 각 요청: (엔드포인트 이름, 오류 종류) 반환, 보낼 수 없으면 None
+    def _create_wallet(self):
+        result, error = self._call("/wallet/create", "POST")
+        if error is None:
+            with self._lock:
+                self.addresses.append(result["data"]["address"])
+        return "POST /wallet/create", error
+
+    def _balance(self):
+        address = self._pick(self.addresses)
+        if address is None:
+            return None
+        return "GET /wallet/<address>/balance", self._call(f"/wallet/{address}/balance")[1]
+
+    def _utxos(self):
+        address = self._pick(self.addresses)
+        if address is None:
+            return None
+        return "GET /wallet/<address>/utxos", self._call(f"/wallet/{address}/utxos")[1]
+
+    def _send(self):
+        sender, receiver = self._pick(self.funded), self._pick(self.addresses)
+        if sender is None or receiver is None:
+            return None
+        result, error = self._call("/transaction/send", "POST", {
+            "sender_address": sender, "receiver_address": receiver, "amount": self.amount})
+        if error is None:
+            with self._lock:
+                self.tx_ids.append(result["data"]["transaction_id"])
+        return "POST /transaction/send", error
+
+    def _mine(self):
+        miner = self._pick(self.addresses)
+        if miner is None:
+            return None
+        error = self._call("/mine", "POST", {"miner_address": miner})[1]
+        if error is None:
+            with self._lock:
+                self.funded.append(miner)
+        return "POST /mine", error
+
+    def _stats(self):
+        return "GET /stats", self._call("/stats")[1]
+
+    def _blockchain(self):
+        return "GET /blockchain", self._call("/blockchain?order=desc&limit=10")[1]
+
+    def _transaction(self):
+        tx_id = self._pick(self.tx_ids)
+        if tx_id is None:
+            return None
+        return "GET /transaction/<tx_id>", self._call(f"/transaction/{tx_id}")[1]
+
+    def _proof(self):
+        tx_id = self._pick(self.tx_ids)
+        if tx_id is None:
+            return None
+        # 아직 채굴되지 않은 트랜잭션은 404 (대기 중)로 집계됨
+        return "GET /transaction/<tx_id>/proof", self._call(f"/transaction/{tx_id}/proof")[1]
+
+    def setup(self, wallets: int = 10, fund_blocks: int = 3) -> bool:
+        """부하 시작 전 지갑 생성 + 채굴로 송금할 잔액 준비"""
+        print(f"🧰 준비: 지갑 {wallets}개, 채굴 {fund_blocks}블록")
+        for _ in range(wallets):
+            endpoint, error = self._create_wallet()
+            if error is not None:
+                print(f"❌ 지갑 생성 실패: {error}")
+                return False
+        for i in range(fund_blocks):
+            miner = self.addresses[i % len(self.addresses)]
+            error = self._call("/mine", "POST", {"miner_address": miner})[1]
+            if error is not None:
+                print(f"❌ 채굴 실패: {error}")
+                return False
+            self.funded.append(miner)
+        return True
+
+    def run_phase(self, name: str = "load", duration: float = 10.0, rate: float = 10.0,
+                  mix: Optional[Dict[str, float]] = None, max_requests: Optional[int] = None) -> dict:
+        """duration초 동안 초당 rate건 (0이면 최대 속도) 요청, 요청 종류는 mix 가중치로 선택"""
+        mix = mix or DEFAULT_MIX
+        unknown = set(mix) - set(self.operations)
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))} "
+                             f"(choose from {', '.join(self.operations)})")
+        names, weights = list(mix), list(mix.values())
+        stats: Dict[str, EndpointStats] = {}
+        lags: List[float] = []
+        counters = {"next": 0, "skipped": 0}
+        start = time.perf_counter()
+        deadline = start + duration
+
+        def worker():
+            while True:
+                # 요청 순번과 종류를 정함 (종류 순서는 seed로 재현 가능)
+                with self._lock:
+                    index = counters["next"]
+                    if max_requests is not None and index >= max_requests:
+                        return
+                    counters["next"] += 1
+                    operation = self.rng.choices(names, weights)[0]
+                scheduled = start + index / rate if rate > 0 else time.perf_counter()
+                if scheduled >= deadline:
+                    return
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sent = time.perf_counter()
+                outcome = self.operations[operation]()
+                latency = time.perf_counter() - sent
+                with self._lock:
+                    if outcome is None:
+                        counters["skipped"] += 1
+                        continue
+                    endpoint, error = outcome
+                    stats.setdefault(endpoint, EndpointStats()).record(latency, error)
+                    # 예정 시각보다 늦게 보낸 시간 (서버/워커가 목표 속도를 못 따라가는 정도)
+                    lags.append(max(0.0, sent - scheduled))
+
+        print(f"🚦 {name}: {duration:.0f}초, 목표 {rate:g} req/s, 워커 {self.workers}개")
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        endpoints = {endpoint: entry.summary(elapsed) for endpoint, entry in sorted(stats.items())}
+        total = sum(entry["requests"] for entry in endpoints.values())
+        errors = sum(entry["errors"] for entry in endpoints.values())
+        report = {
+            "name": name,
+            "duration_s": elapsed,
+            "target_rate": rate,
+            "workers": self.workers,
+            "requests": total,
+            "errors": errors,
+            "skipped": counters["skipped"],
+            "throughput_per_s": total / elapsed if elapsed > 0 else 0.0,
+            "schedule_lag_p99_ms": _percentile(lags, 0.99) * 1000,
+            "endpoints": endpoints
+        }
+        print_report(report)
+        return report
+
+    def run_scenario(self, scenario: dict) -> List[dict]:
+        """시나리오 파일 내용 실행: 준비 후 단계(phase)를 차례로 실행"""
+        setup = scenario.get("setup", {})
+        if not self.setup(setup.get("wallets", 10), setup.get("fund_blocks", 3)):
+            return []
+        reports = []
+        for i, phase in enumerate(scenario.get("phases", [])):
+            self.workers = phase.get("workers", self.workers)
+            self.amount = phase.get("amount", self.amount)
+            reports.append(self.run_phase(phase.get("name", f"phase-{i + 1}"), phase.get("duration", 10.0),
+                                          phase.get("rate", 10.0), phase.get("mix"), phase.get("requests")))
+        return reports
+
+
+def print_report(report: dict):
+    print(f"   총 {report['requests']}건 ({report['throughput_per_s']:.1f} req/s, 목표 {report['target_rate']:g}) | "
+          f"오류 {report['errors']}건 | 건너뜀 {report['skipped']}건 | 예정 대비 지연 p99 {report['schedule_lag_p99_ms']:.1f}ms")
+    print(f"   {'엔드포인트':32s} {'요청':>6s} {'req/s':>7s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'오류':>5s}")
+    for endpoint, entry in report["endpoints"].items():
+        print(f"   {endpoint:32s} {entry['requests']:6d} {entry['throughput_per_s']:7.1f} "
+              f"{entry['p50_ms']:6.1f}ms {entry['p95_ms']:6.1f}ms {entry['p99_ms']:6.1f}ms {entry['errors']:5d}")
+        for error, count in entry["error_breakdown"].items():
+            print(f"      ❌ {count:5d}  {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitcoin UTXO API 부하 생성기")
+    parser.add_argument("--url", default="http://localhost:5000/api", help="API 기본 URL")
+    parser.add_argument("--scenario", help="시나리오 JSON 파일 (setup + phases, 지정하면 아래 옵션 대신 사용)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 워커 수")
+    parser.add_argument("--rate", type=float, default=10.0, help="목표 초당 요청 수 (0: 최대 속도)")
+    parser.add_argument("--duration", type=float, default=30.0, help="실행 시간 (초)")
+    parser.add_argument("--mix", default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+                        help="요청 비율 (예: balance=50,send=25,mine=5)")
+    parser.add_argument("--wallets", type=int, default=10, help="준비 단계에서 만들 지갑 수")
+    parser.add_argument("--fund-blocks", type=int, default=3, help="준비 단계에서 채굴할 블록 수")
+    parser.add_argument("--amount", type=float, default=0.01, help="송금 1건당 금액")
+    parser.add_argument("--seed", type=int, help="요청 순서 난수 seed (같은 seed면 같은 요청 순서)")
+    parser.add_argument("--json", help="결과를 기록할 JSON 파일")
+    args = parser.parse_args()
+
+    if args.scenario:
+        with open(args.scenario, 'r', encoding='utf-8') as f:
+            scenario = json.load(f)
+    else:
+        scenario = {
+            "setup": {"wallets": args.wallets, "fund_blocks": args.fund_blocks},
+            "phases": [{"name": "load", "duration": args.duration, "rate": args.rate, "mix": parse_mix(args.mix)}]
+        }
+
+    generator = LoadGenerator(args.url, scenario.get("workers", args.workers),
+                              scenario.get("seed", args.seed), scenario.get("amount", args.amount))
+    reports = generator.run_scenario(scenario)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "url": args.url,
+                       "scenario": scenario, "phases": reports}, f, indent=2)
+        print(f"📝 결과 기록: {args.json}")
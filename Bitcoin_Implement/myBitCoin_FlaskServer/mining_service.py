@@ -0,0 +1,116 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from bitcoin_utxo import Blockchain, search_proof
+
+
+class MiningJob:
+    """백그라운드 채굴 작업 상태"""
+    def __init__(self, miner_address: str):
+        self.job_id = uuid.uuid4().hex
+        self.miner_address = miner_address
+        self.status = "running"  # running / found / cancelled / failed
+        self.attempts = 0
+        self.template_builds = 0
+        self.index: Optional[int] = None
+        self.block: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+
+    def to_dict(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.job_id,
+            "miner_address": self.miner_address,
+            "status": self.status,
+            "index": self.index,
+            "attempts": self.attempts,
+            "elapsed": elapsed,
+            "hashrate": self.attempts / elapsed if elapsed > 0 else 0.0,
+            "template_builds": self.template_builds,
+            "block": self.block,
+            "error": self.error
+        }
+
+
+class MiningService:
+    """대기 트랜잭션을 블록 템플릿으로 스냅샷하여 별도 스레드에서 채굴"""
+    def __init__(self, blockchain: Blockchain, on_block: Optional[Callable[[dict], None]] = None,
+                 batch_size: int = 5000, max_jobs: int = 100):
+        self.blockchain = blockchain
+        self.on_block = on_block  # 블록 발견 시 호출 (예: 데이터 저장)
+        self.batch_size = batch_size
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, MiningJob]" = OrderedDict()
+        self.active_job: Optional[MiningJob] = None
+        self._lock = threading.Lock()
+
+    def start(self, miner_address: str) -> MiningJob:
+        """채굴 작업 시작 (동시에 하나의 작업만 실행)"""
+        with self._lock:
+            if self.active_job is not None and self.active_job.status == "running":
+                raise RuntimeError(f"Mining job already running: {self.active_job.job_id}")
+
+            job = MiningJob(miner_address)
+            self.jobs[job.job_id] = job
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+            self.active_job = job
+
+        thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[MiningJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[MiningJob]:
+        """실행 중인 채굴 작업 취소 요청"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+        return job
+
+    def _run(self, job: MiningJob):
+        """nonce를 batch 단위로 탐색하며 취소/템플릿 갱신 여부 확인"""
+        try:
+            template = None
+            nonce = 1
+            while not job.cancel_event.is_set():
+                # 새 트랜잭션 도착 또는 체인 끝 변경 시 템플릿 재생성
+                if template is None or self.blockchain.is_template_stale(template):
+                    template = self.blockchain.create_block_template(job.miner_address)
+                    job.index = template["index"]
+                    job.template_builds += 1
+                    nonce = 1
+
+                proof, tried = search_proof(template["previous_proof"], template["index"],
+                                            template["pow_input"], nonce, self.batch_size)
+                job.attempts += tried
+                nonce += tried
+
+                if proof is None:
+                    continue
+
+                block = self.blockchain.commit_block(template, proof)
+                if block is None:
+                    template = None
+                    continue
+
+                job.block = block
+                job.status = "found"
+                if self.on_block is not None:
+                    self.on_block(block)
+                return
+
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
@@ -0,0 +1,543 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bitcoin_utxo import UTXO, Mempool, Transaction, Wallet, SATOSHI, _to_satoshi
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    height INTEGER PRIMARY KEY,      -- 체인 위치 (1부터)
+    hash TEXT NOT NULL,
+    previous_hash TEXT NOT NULL,
+    block TEXT NOT NULL              -- 블록 JSON (API 응답과 같은 형태)
+);
+CREATE INDEX IF NOT EXISTS idx_blocks_hash ON blocks(hash);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_id TEXT PRIMARY KEY,
+    height INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS utxos (
+    tx_id TEXT NOT NULL,
+    output_index INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    address TEXT NOT NULL,
+    PRIMARY KEY (tx_id, output_index)
+);
+CREATE INDEX IF NOT EXISTS idx_utxos_address ON utxos(address);
+
+CREATE TABLE IF NOT EXISTS balances (
+    address TEXT PRIMARY KEY,        -- UTXO를 하나 이상 가진 주소만
+    satoshi INTEGER NOT NULL,        -- 잔액 (utxos와 같은 쓰기 트랜잭션에서 갱신)
+    utxo_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mempool (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,  -- 도착 순서
+    tx_id TEXT NOT NULL UNIQUE,
+    tx TEXT NOT NULL,
+    fee REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS wallets (
+    address TEXT PRIMARY KEY,
+    private_key TEXT NOT NULL,
+    public_key TEXT                  -- 없으면 처음 필요할 때 개인키에서 계산
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    hashed_password TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('mempool_version', '0');
+"""
+
+# 블록 반영 때 같은 쓰기 트랜잭션에서 갱신하는 통계 (meta 테이블, /api/stats가 테이블을 세지 않도록)
+STAT_KEYS = ("utxo_count", "utxo_total_satoshi", "address_count", "tx_count")
+
+
+def _block_hash(block: dict) -> str:
+    """Blockchain._hash와 같은 블록 해시"""
+    return hashlib.sha256(json.dumps(block, sort_keys=True).encode()).hexdigest()
+
+
+class _WriteLock:
+    """프로세스 내 RLock + SQLite 쓰기 트랜잭션(BEGIN IMMEDIATE)으로 프로세스 간 쓰기 직렬화"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        local = self.store._local_state()
+        if local.depth == 0:
+            try:
+                self.store.connection().execute("BEGIN IMMEDIATE")
+            except Exception:
+                self._lock.release()
+                raise
+            local.kind = "write"
+        elif local.kind != "write":
+            self._lock.release()
+            raise RuntimeError("Cannot start a write inside a read transaction")
+        local.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        local = self.store._local_state()
+        local.depth -= 1
+        try:
+            if local.depth == 0:
+                local.kind = None
+                self.store.connection().execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self._lock.release()
+        return False
+
+
+class _ReadTransaction:
+    """여러 조회를 같은 시점의 스냅샷으로 묶음 (WAL에서는 쓰기를 막지 않음)"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    def __enter__(self):
+        local = self.store._local_state()
+        if local.depth == 0:
+            self.store.connection().execute("BEGIN")
+            local.kind = "read"
+        local.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        local = self.store._local_state()
+        local.depth -= 1
+        if local.depth == 0:
+            local.kind = None
+            self.store.connection().execute("COMMIT")
+        return False
+
+
+class StoredChain:
+    """blocks 테이블을 list처럼 다루는 뷰 (len, 인덱싱, 슬라이스, 순회, append)"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.query_one("SELECT COALESCE(MAX(height), 0) FROM blocks")[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows = self.store.query_all(
+                "SELECT block FROM blocks WHERE height > ? AND height <= ? ORDER BY height", (start, stop))
+            return [json.loads(row[0]) for row in rows]
+        if key < 0:
+            key += len(self)
+        row = self.store.query_one("SELECT block FROM blocks WHERE height = ?", (key + 1,))
+        if row is None:
+            raise IndexError("chain index out of range")
+        return json.loads(row[0])
+
+    def __iter__(self) -> Iterator[dict]:
+        # 체인 전체를 한 번에 읽지 않고 페이지 단위로 순회
+        height = 0
+        while True:
+            rows = self.store.query_all(
+                "SELECT height, block FROM blocks WHERE height > ? ORDER BY height LIMIT 1000", (height,))
+            if not rows:
+                return
+            for height, block in rows:
+                yield json.loads(block)
+
+    def append(self, block: dict):
+        self.store.execute(
+            "INSERT INTO blocks (height, hash, previous_hash, block) VALUES (?, ?, ?, ?)",
+            (len(self) + 1, _block_hash(block), block["previous_hash"], json.dumps(block)))
+
+
+class StoredHashIndex:
+    """블록 해시 -> 높이 (해시는 blocks 행에 함께 저장됨)"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    def get(self, block_hash: str, default=None) -> Optional[int]:
+        row = self.store.query_one("SELECT height FROM blocks WHERE hash = ? LIMIT 1", (block_hash,))
+        return row[0] if row else default
+
+    def __setitem__(self, block_hash: str, height: int):
+        self.store.execute("UPDATE blocks SET hash = ? WHERE height = ?", (block_hash, height))
+
+    def clear(self):
+        # 해시는 블록을 추가할 때 계산되어 행에 남아 있으므로 비울 필요 없음
+        pass
+
+
+class StoredTxIndex(MutableMapping):
+    """transactions 테이블: tx_id -> (블록 높이, 블록 내 위치)"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    def __getitem__(self, tx_id: str) -> Tuple[int, int]:
+        row = self.store.query_one("SELECT height, position FROM transactions WHERE tx_id = ?", (tx_id,))
+        if row is None:
+            raise KeyError(tx_id)
+        return row[0], row[1]
+
+    def __setitem__(self, tx_id: str, location: Tuple[int, int]):
+        cursor = self.store.execute("INSERT OR IGNORE INTO transactions (tx_id, height, position) VALUES (?, ?, ?)",
+                                    (tx_id, location[0], location[1]))
+        if cursor.rowcount == 1:
+            self.store.adjust_stats(tx_count=1)
+        else:
+            self.store.execute("UPDATE transactions SET height = ?, position = ? WHERE tx_id = ?",
+                               (location[0], location[1], tx_id))
+
+    def __delitem__(self, tx_id: str):
+        cursor = self.store.execute("DELETE FROM transactions WHERE tx_id = ?", (tx_id,))
+        if cursor.rowcount == 1:
+            self.store.adjust_stats(tx_count=-1)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self.store.query_all("SELECT tx_id FROM transactions")])
+
+    def __len__(self) -> int:
+        """meta에 유지되는 개수 (COUNT(*)로 테이블을 세지 않음)"""
+        return self.store.stats()["tx_count"]
+
+    def clear(self):
+        self.store.execute("DELETE FROM transactions")
+        self.store.set_meta("tx_count", "0")
+
+
+class SQLiteUTXOPool:
+    """UTXOPool과 같은 인터페이스의 utxos 테이블 (주소 인덱스는 SQLite 인덱스가 유지)"""
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    @staticmethod
+    def _row_to_utxo(row) -> UTXO:
+        return UTXO(tx_id=row[0], output_index=row[1], amount=row[2], address=row[3])
+
+    def add_utxo(self, utxo: UTXO):
+        # 같은 outpoint 덮어쓰기 시 기존 행의 통계/잔액부터 되돌림
+        self.remove_utxo(utxo.tx_id, utxo.output_index)
+        satoshi = _to_satoshi(utxo.amount)
+        self.store.execute(
+            "INSERT INTO utxos (tx_id, output_index, amount, address) VALUES (?, ?, ?, ?)",
+            (utxo.tx_id, utxo.output_index, utxo.amount, utxo.address))
+        new_address = self.store.execute(
+            "INSERT OR IGNORE INTO balances (address, satoshi, utxo_count) VALUES (?, ?, 1)",
+            (utxo.address, satoshi)).rowcount == 1
+        if not new_address:
+            self.store.execute("UPDATE balances SET satoshi = satoshi + ?, utxo_count = utxo_count + 1 "
+                               "WHERE address = ?", (satoshi, utxo.address))
+        self.store.adjust_stats(utxo_count=1, utxo_total_satoshi=satoshi, address_count=1 if new_address else 0)
+
+    def remove_utxo(self, tx_id: str, output_index: int):
+        row = self.store.query_one("SELECT amount, address FROM utxos WHERE tx_id = ? AND output_index = ?",
+                                   (tx_id, output_index))
+        if row is None:
+            return
+        satoshi = _to_satoshi(row[0])
+        self.store.execute("DELETE FROM utxos WHERE tx_id = ? AND output_index = ?", (tx_id, output_index))
+        self.store.execute("UPDATE balances SET satoshi = satoshi - ?, utxo_count = utxo_count - 1 WHERE address = ?",
+                           (satoshi, row[1]))
+        # 마지막 UTXO가 빠진 주소는 행 삭제 (보유 주소 수 감소)
+        emptied = self.store.execute("DELETE FROM balances WHERE address = ? AND utxo_count = 0",
+                                     (row[1],)).rowcount == 1
+        self.store.adjust_stats(utxo_count=-1, utxo_total_satoshi=-satoshi, address_count=-1 if emptied else 0)
+
+    def get_utxo(self, tx_id: str, output_index: int) -> Optional[UTXO]:
+        row = self.store.query_one(
+            "SELECT tx_id, output_index, amount, address FROM utxos WHERE tx_id = ? AND output_index = ?",
+            (tx_id, output_index))
+        return self._row_to_utxo(row) if row else None
+
+    def get_utxos_by_address(self, address: str) -> List[UTXO]:
+        rows = self.store.query_all(
+            "SELECT tx_id, output_index, amount, address FROM utxos WHERE address = ?", (address,))
+        return [self._row_to_utxo(row) for row in rows]
+
+    def get_balance(self, address: str) -> float:
+        """balances 테이블에 유지된 잔액 (기본 키 조회 한 번, O(1))"""
+        row = self.store.query_one("SELECT satoshi FROM balances WHERE address = ?", (address,))
+        return row[0] / SATOSHI if row else 0
+
+    def __len__(self) -> int:
+        return self.store.stats()["utxo_count"]
+
+    def stats(self) -> dict:
+        """UTXO 수 / 금액 합계 / 보유 주소 수 (meta에 유지된 값, O(1))"""
+        stats = self.store.stats()
+        return {
+            "utxo_count": stats["utxo_count"],
+            "total_satoshi": stats["utxo_total_satoshi"],
+            "address_count": stats["address_count"]
+        }
+
+    @property
+    def utxos(self) -> Dict[str, UTXO]:
+        """전체 UTXO (key: "tx_id:output_index") - 스냅샷/통계용, 전체를 읽음"""
+        rows = self.store.query_all("SELECT tx_id, output_index, amount, address FROM utxos")
+        return {f"{row[0]}:{row[1]}": self._row_to_utxo(row) for row in rows}
+
+    def clear(self):
+        self.store.execute("DELETE FROM utxos")
+        self.store.execute("DELETE FROM balances")
+        for key in ("utxo_count", "utxo_total_satoshi", "address_count"):
+            self.store.set_meta(key, "0")
+
+    def check_index(self) -> bool:
+        """주소 인덱스 포함 테이블/인덱스 무결성 + meta 통계/balances 테이블이 utxos와 일치하는지 확인"""
+        if self.store.query_one("PRAGMA quick_check")[0] != "ok":
+            return False
+        with self.store.read_lock:
+            stored = {row[0]: (row[1], row[2]) for row in
+                      self.store.query_all("SELECT address, satoshi, utxo_count FROM balances")}
+            return self.store.stats() == self.store.recount_stats() and stored == self.store.recount_balances()
+
+
+class StoredMempool(Mempool):
+    """변경을 mempool 테이블에도 기록하는 대기 풀 (다른 워커는 버전이 바뀌면 다시 읽음)"""
+    def __init__(self, store: "SQLiteStore", max_bytes: int = 5_000_000):
+        super().__init__(max_bytes)
+        self.store = store
+        self._loading = False
+
+    def add(self, transaction: Transaction, fee: float) -> bool:
+        if not super().add(transaction, fee):
+            return False
+        if not self._loading:
+            self.store.execute("INSERT OR REPLACE INTO mempool (tx_id, tx, fee) VALUES (?, ?, ?)",
+                               (transaction.tx_id, json.dumps(transaction.to_dict()), fee))
+            self.version = self.store.bump_mempool_version()
+        return True
+
+    def remove(self, tx_id: str, with_descendants: bool = True) -> List[str]:
+        removed = super().remove(tx_id, with_descendants)
+        if removed and not self._loading:
+            self.store.executemany("DELETE FROM mempool WHERE tx_id = ?", [(tx,) for tx in removed])
+            self.version = self.store.bump_mempool_version()
+        return removed
+
+
+class StoredWallets(MutableMapping):
+    """wallets 테이블: 주소 -> Wallet (복원한 지갑은 프로세스 안에서 캐시)"""
+    def __init__(self, store: "SQLiteStore", restore: Callable[[str, dict], Wallet]):
+        self.store = store
+        self.restore = restore
+        self._cache: Dict[str, Wallet] = {}
+
+    def __getitem__(self, address: str) -> Wallet:
+        wallet = self._cache.get(address)
+        if wallet is None:
+            row = self.store.query_one("SELECT private_key, public_key FROM wallets WHERE address = ?",
+                                       (address,))
+            if row is None:
+                raise KeyError(address)
+            wallet = self._cache[address] = self.restore(address, {"private_key": row[0], "public_key": row[1]})
+        return wallet
+
+    def __setitem__(self, address: str, wallet: Wallet):
+        self.store.execute("INSERT OR REPLACE INTO wallets (address, private_key, public_key) VALUES (?, ?, ?)",
+                           (address, wallet.get_private_key_hex(), wallet.get_public_key_hex()))
+        self._cache[address] = wallet
+
+    def __delitem__(self, address: str):
+        self.store.execute("DELETE FROM wallets WHERE address = ?", (address,))
+        self._cache.pop(address, None)
+
+    def __contains__(self, address) -> bool:
+        return address in self._cache or \
+            self.store.query_one("SELECT 1 FROM wallets WHERE address = ?", (address,)) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self.store.query_all("SELECT address FROM wallets")])
+
+    def __len__(self) -> int:
+        return self.store.query_one("SELECT COUNT(*) FROM wallets")[0]
+
+
+class SQLiteStore:
+    """여러 워커 프로세스가 공유하는 SQLite(WAL) 저장소
+
+    읽기는 각 스레드의 연결에서 잠금 없이 병렬로 수행하고, 쓰기는 write_lock
+    (프로세스 내 RLock + BEGIN IMMEDIATE)으로 프로세스 사이에서도 하나씩 수행한다.
+    """
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pid = None
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # 공개키 열이 없던 이전 데이터베이스 갱신
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(wallets)")]
+            if "public_key" not in columns:
+                conn.execute("ALTER TABLE wallets ADD COLUMN public_key TEXT")
+
+        self.write_lock = _WriteLock(self)
+        self.read_lock = _ReadTransaction(self)
+        self.chain = StoredChain(self)
+        self.block_hash_index = StoredHashIndex(self)
+        self.tx_index = StoredTxIndex(self)
+        self.utxo_pool = SQLiteUTXOPool(self)
+
+        # 통계/잔액 테이블이 없던 이전 데이터베이스는 한 번만 테이블을 세어 채움
+        with self.write_lock:
+            if self.get_meta(STAT_KEYS[-1]) is None or (
+                    self.query_one("SELECT 1 FROM balances LIMIT 1") is None
+                    and self.query_one("SELECT 1 FROM utxos LIMIT 1") is not None):
+                self.reset_stats()
+
+    def _local_state(self):
+        # fork로 만들어진 워커는 부모의 연결을 쓰지 않고 새로 연결
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+        local = self._local
+        if not hasattr(local, "conn"):
+            local.conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            local.conn.execute("PRAGMA synchronous=NORMAL")
+            local.depth = 0
+            local.kind = None
+        return local
+
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 (자동 커밋 모드, 트랜잭션은 write_lock/read_lock으로 명시)"""
+        return self._local_state().conn
+
+    def execute(self, sql: str, params: tuple = ()):
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql: str, rows):
+        return self.connection().executemany(sql, rows)
+
+    def query_one(self, sql: str, params: tuple = ()):
+        return self.connection().execute(sql, params).fetchone()
+
+    def query_all(self, sql: str, params: tuple = ()) -> list:
+        return self.connection().execute(sql, params).fetchall()
+
+    # ---- 메타데이터 ----
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.query_one("SELECT value FROM meta WHERE key = ?", (key,))
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ---- 통계 ----
+
+    def stats(self) -> Dict[str, int]:
+        rows = self.query_all(f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(STAT_KEYS))})",
+                              STAT_KEYS)
+        values = dict(rows)
+        return {key: int(values.get(key, 0)) for key in STAT_KEYS}
+
+    def adjust_stats(self, **deltas: int):
+        """통계 증감 (write_lock 안에서 호출)"""
+        for key, delta in deltas.items():
+            if delta:
+                self.execute("UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE key = ?", (delta, key))
+
+    def recount_stats(self) -> Dict[str, int]:
+        """테이블 전체를 세어 통계 계산 (O(테이블 크기), 일관성 확인/이전 데이터베이스 갱신용)"""
+        with self.read_lock:
+            amounts = self.query_all("SELECT amount FROM utxos")
+            return {
+                "utxo_count": len(amounts),
+                "utxo_total_satoshi": sum(_to_satoshi(row[0]) for row in amounts),
+                "address_count": self.query_one("SELECT COUNT(DISTINCT address) FROM utxos")[0],
+                "tx_count": self.query_one("SELECT COUNT(*) FROM transactions")[0]
+            }
+
+    def reset_stats(self):
+        """통계와 balances 테이블을 utxos 내용으로 다시 채움 (write_lock 안에서 호출)"""
+        for key, value in self.recount_stats().items():
+            self.set_meta(key, str(value))
+        self.execute("DELETE FROM balances")
+        self.executemany("INSERT INTO balances (address, satoshi, utxo_count) VALUES (?, ?, ?)",
+                         [(address, satoshi, count) for address, (satoshi, count) in self.recount_balances().items()])
+
+    def recount_balances(self) -> Dict[str, Tuple[int, int]]:
+        """utxos 전체를 읽어 주소별 (잔액 사토시, UTXO 수) 계산 (O(테이블 크기))"""
+        balances: Dict[str, Tuple[int, int]] = {}
+        for amount, address in self.query_all("SELECT amount, address FROM utxos"):
+            satoshi, count = balances.get(address, (0, 0))
+            balances[address] = (satoshi + _to_satoshi(amount), count + 1)
+        return balances
+
+    # ---- 대기 풀 ----
+
+    def mempool_version(self) -> int:
+        return int(self.get_meta("mempool_version"))
+
+    def bump_mempool_version(self) -> int:
+        self.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'mempool_version'")
+        return self.mempool_version()
+
+    def load_mempool(self) -> StoredMempool:
+        """mempool 테이블에서 대기 풀 구성 (도착 순서대로)"""
+        mempool = StoredMempool(self)
+        with self.read_lock:
+            version = self.mempool_version()
+            rows = self.query_all("SELECT tx, fee FROM mempool ORDER BY seq")
+        mempool._loading = True
+        for tx, fee in rows:
+            mempool.add(Transaction.from_dict(json.loads(tx)), fee)
+        mempool._loading = False
+        mempool.version = version
+        return mempool
+
+    # ---- 사용자 ----
+
+    def load_users(self) -> List[dict]:
+        rows = self.query_all("SELECT username, hashed_password FROM users ORDER BY rowid")
+        return [{"username": row[0], "hashed_password": row[1]} for row in rows]
+
+    def add_user(self, username: str, hashed_password: str) -> bool:
+        """사용자 추가 (이미 있으면 False)"""
+        cursor = self.execute("INSERT OR IGNORE INTO users (username, hashed_password) VALUES (?, ?)",
+                              (username, hashed_password))
+        return cursor.rowcount == 1
+
+    # ---- 가져오기 ----
+
+    def import_state(self, chain: List[dict], utxos: List[UTXO], tx_index: Dict[str, Tuple[int, int]],
+                     wallets: Dict[str, dict], users: List[dict]):
+        """파일 기반 상태를 통째로 가져오기 (write_lock 안에서 호출)"""
+        for table in ("blocks", "transactions", "utxos", "mempool"):
+            self.execute(f"DELETE FROM {table}")
+        self.executemany(
+            "INSERT INTO blocks (height, hash, previous_hash, block) VALUES (?, ?, ?, ?)",
+            [(height, _block_hash(block), block["previous_hash"], json.dumps(block))
+             for height, block in enumerate(chain, start=1)])
+        self.executemany(
+            "INSERT INTO utxos (tx_id, output_index, amount, address) VALUES (?, ?, ?, ?)",
+            [(utxo.tx_id, utxo.output_index, utxo.amount, utxo.address) for utxo in utxos])
+        self.executemany(
+            "INSERT INTO transactions (tx_id, height, position) VALUES (?, ?, ?)",
+            [(tx_id, height, position) for tx_id, (height, position) in tx_index.items()])
+        self.executemany("INSERT OR REPLACE INTO wallets (address, private_key, public_key) VALUES (?, ?, ?)",
+                         [(address, entry["private_key"], entry.get("public_key"))
+                          for address, entry in wallets.items()])
+        self.executemany("INSERT OR IGNORE INTO users (username, hashed_password) VALUES (?, ?)",
+                         [(user["username"], user["hashed_password"]) for user in users])
+        self.reset_stats()
+        self.bump_mempool_version()
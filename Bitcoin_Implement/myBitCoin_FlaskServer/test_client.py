@@ -1,22 +1,74 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+import hashlib
+
+def _double_sha256(data):
+    return hashlib.sha256(hashlib.sha256(data.encode('utf-8')).digest()).hexdigest()
+
+def _transaction_id(transaction, block_index):
+    """트랜잭션 내용으로 tx_id 재계산 (서명은 비움, 코인베이스는 블록 번호로 정해짐)"""
+    if not transaction["inputs"]:
+        return f"coinbase_{block_index}"
+    tx_data = {
+        "inputs": [dict(inp, signature="") for inp in transaction["inputs"]],
+        "outputs": transaction["outputs"]
+    }
+    return hashlib.sha256(json.dumps(tx_data, sort_keys=True).encode()).hexdigest()
+
+def verify_transaction_proof(proof_data, tx_id=None):
+    """포함 증명 검증 (블록 전체 없이 트랜잭션 + 형제 해시 + 블록 헤더만 사용)
+
+    1. 받은 트랜잭션이 요청한 tx_id이고, 그 tx_id가 내용과 일치하는지 확인
+    2. 트랜잭션 내용으로 리프 해시 계산
+    3. 형제 해시를 차례로 결합해 머클 루트 재계산 후 헤더의 머클 루트와 비교
+    4. 헤더의 작업 증명 확인 (머클 루트가 작업 증명에 포함되어 있으므로 위조 불가)
+    """
+    header = proof_data["header"]
+    transaction = proof_data["transaction"]
+    # 다른 트랜잭션의 유효한 증명이나 tx_id만 바꾼 트랜잭션을 받아들이지 않음
+    if tx_id is not None and transaction.get("tx_id") != tx_id:
+        return False
+    if transaction.get("tx_id") != _transaction_id(transaction, header["index"]):
+        return False
+
+    current = _double_sha256(json.dumps(transaction, sort_keys=True))
+    for step in proof_data["proof"]:
+        if step["side"] == "left":
+            current = _double_sha256(step["hash"] + current)
+        else:
+            current = _double_sha256(current + step["hash"])
+    if current != header["merkle_root"]:
+        return False
+
+    header_data = f"{header['version']}:{header['previous_hash']}:{header['merkle_root']}"
+    to_digest = f"{header['proof']**2 - header['previous_proof']**2 + header['index']}{header_data}"
+    return hashlib.sha256(to_digest.encode()).hexdigest()[:4] == "0000"
 
 class BitcoinClient:
-    def __init__(self, base_url="http://localhost:5000/api"):
+    def __init__(self, base_url="http://localhost:5000/api", pool_size=10, timeout=30):
         self.base_url = base_url
+        self.timeout = timeout
+        # 연결을 재사용하는 세션 (요청마다 TCP 연결을 새로 맺지 않음)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
-    def api_call(self, endpoint, method="GET", data=None):
-        """API 호출 헬퍼 함수"""
+    def request(self, endpoint, method="GET", data=None):
+        """API 호출 후 (상태 코드, 응답 JSON) 반환 (네트워크 오류는 예외로 전달)"""
         url = f"{self.base_url}{endpoint}"
+        response = self.session.request(method, url, json=data, timeout=self.timeout)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, {"success": False, "error": f"Non-JSON response ({response.status_code})"}
         
+    def api_call(self, endpoint, method="GET", data=None):
+        """API 호출 헬퍼 함수"""
         try:
-            if method == "GET":
-                response = requests.get(url)
-            elif method == "POST":
-                response = requests.post(url, json=data)
-            
-            return response.json()
+            return self.request(endpoint, method, data)[1]
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -84,7 +136,40 @@ class BitcoinClient:
         else:
             print(f"❌ 트랜잭션 전송 실패: {result.get('error', 'Unknown error')}")
             return None
-    
+
+    def send_batch(self, sender_address, payments):
+        """일괄 송금 (payments: [(수신자 주소, 금액), ...])"""
+        print(f"📨 일괄 송금 중... (수신자 {len(payments)}명)")
+
+        result = self.api_call("/transaction/batch", "POST", {
+            "sender_address": sender_address,
+            "payments": [{"receiver_address": receiver, "amount": amount} for receiver, amount in payments]
+        })
+
+        if "data" in result:
+            data = result["data"]
+            print(f"{'✅' if result['success'] else '❌'} 성공 {data['accepted']}건 / 실패 {data['failed']}건 "
+                  f"(트랜잭션 {len(data['transaction_ids'])}개)")
+            return data["results"]
+        else:
+            print(f"❌ 일괄 송금 실패: {result.get('error', 'Unknown error')}")
+            return None
+
+    def verify_transaction(self, tx_id):
+        """포함 증명을 받아 트랜잭션이 블록에 들어갔는지 직접 검증 (SPV)"""
+        print(f"🧾 포함 증명 검증 중... (TX: {tx_id[:10]}...)")
+        result = self.api_call(f"/transaction/{tx_id}/proof")
+        
+        if result["success"]:
+            data = result["data"]
+            valid = verify_transaction_proof(data, tx_id)
+            print(f"{'✅' if valid else '❌'} 블록 {data['block_height']} 포함 증명 "
+                  f"{'유효' if valid else '무효'} (형제 해시 {len(data['proof'])}개, 확인 {data['confirmations']}회)")
+            return valid
+        else:
+            print(f"❌ 포함 증명 조회 실패: {result.get('error', 'Unknown error')}")
+            return False
+
     def mine_block(self, miner_address):
         """블록 채굴"""
         print(f"⛏️  블록 채굴 시작... (채굴자: {miner_address[:10]}...)")
@@ -111,7 +196,7 @@ class BitcoinClient:
     def get_blockchain_info(self):
         """블록체인 정보 조회"""
         print("📊 블록체인 정보 조회 중...")
-        result = self.api_call("/blockchain")
+        result = self.api_call("/blockchain?order=desc&limit=1&headers=1")
         
         if result["success"]:
             chain_length = result["data"]["length"]
@@ -179,8 +264,9 @@ def run_demo():
     
     # 6. Alice → Bob 트랜잭션
     print("\n🚀 6. Alice → Bob 트랜잭션 (3 BTC)")
+    tx_id = None
     if alice_balance >= 3:
-        client.send_transaction(alice_address, bob_address, 3.0)
+        tx_id = client.send_transaction(alice_address, bob_address, 3.0)
     else:
         print("❌ Alice의 잔액이 부족합니다.")
     
@@ -188,6 +274,10 @@ def run_demo():
     print("\n⛏️  7. 두 번째 블록 채굴 (Miner 보상)")
     client.mine_block(miner_address)
     
+    # Bob은 블록 전체 대신 포함 증명으로 입금 확인
+    if tx_id:
+        client.verify_transaction(tx_id)
+    
     # 8. 최종 잔액 확인
     print("\n💰 8. 최종 잔액 확인")
     print(f"Alice ({alice_address[:10]}...): {client.get_balance(alice_address)} BTC")
@@ -218,8 +308,9 @@ def interactive_mode():
     print("  5. mine <miner_address> - 블록 채굴")
     print("  6. blockchain - 블록체인 정보")
     print("  7. stats - 시스템 통계")
-    print("  8. demo - 자동 데모 실행")
-    print("  9. exit - 종료")
+    print("  8. proof <tx_id> - 포함 증명 검증")
+    print("  9. demo - 자동 데모 실행")
+    print("  10. exit - 종료")
     print()
     
     while True:
@@ -252,6 +343,9 @@ def interactive_mode():
             elif cmd == "stats":
                 client.get_stats()
                 
+            elif cmd == "proof" and len(command) == 2:
+                client.verify_transaction(command[1])
+                
             elif cmd == "demo":
                 run_demo()
                 
@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+from benchmark import SCALES, _direction, _flatten, bench_chain_stats, bench_core, compare_with_baseline
+
+# 작은 설정의 실제 측정 (수 초 이내), 무거운 UTXO 100만 개 실행은 benchmark.py core로만 수행
+SMALL_CORE = {"utxo_counts": (200,), "block_tx_counts": (1, 10), "iterations": 5, "lookups": 200, "pow_blocks": 1}
+SMALL_CHAIN_STATS = {"utxo_counts": (200,), "sqlite_utxo_counts": (200,), "reads": 5}
+
+
+@pytest.fixture(scope="module")
+def metrics():
+    """작은 설정으로 측정한 core/chain_stats 지표 (chain_stats는 통계 재계산 확인 포함)"""
+    return _flatten({"core": bench_core(**SMALL_CORE), "chain_stats": bench_chain_stats(**SMALL_CHAIN_STATS)})
+
+
+def test_per_unit_metrics_are_gated(metrics):
+    for metric in ("core.pow_us_per_attempt", "core.block_1.pow_us_per_attempt", "core.block_10.mine_overhead_ms",
+                   "core.utxos_200.add_us", "core.utxos_200.address_lookup_us",
+                   "chain_stats.memory_200.build_ms_per_block", "chain_stats.sqlite_200.incremental_us"):
+        assert metric in metrics
+        assert _direction(metric) == "lower", metric
+    assert _direction("workers.1.requests_per_s") == "higher"
+    assert _direction("chain_verify.resumed_from") is None
+
+
+def test_same_results_pass(metrics):
+    assert compare_with_baseline(metrics, metrics, 0.25) == []
+
+
+def test_slower_per_unit_metrics_fail(metrics):
+    slower = {metric: value * 2 if _direction(metric) == "lower" else value for metric, value in metrics.items()}
+    regressions = {metric for metric, _, _, _ in compare_with_baseline(slower, metrics, 0.25)}
+    assert regressions == {metric for metric, value in metrics.items() if _direction(metric) == "lower" and value > 0}
+
+    # 허용 범위 안의 저하나 개선, 비교 대상이 아닌 지표는 통과
+    within = {metric: value * 1.2 for metric, value in metrics.items()}
+    faster = {metric: value / 2 for metric, value in metrics.items()}
+    assert compare_with_baseline(within, metrics, 0.25) == []
+    assert compare_with_baseline(faster, metrics, 0.25) == []
+
+
+def test_lower_throughput_fails():
+    baseline = {"workers.1.requests_per_s": 1000.0, "chain_verify.resumed_from": 30.0}
+    current = {"workers.1.requests_per_s": 700.0, "chain_verify.resumed_from": 1.0}
+    assert [metric for metric, _, _, _ in compare_with_baseline(current, baseline, 0.25)] == ["workers.1.requests_per_s"]
+
+
+@pytest.mark.skipif(not os.environ.get("BENCHMARK_BASELINE"),
+                    reason="BENCHMARK_BASELINE (benchmark.py core --scale quick --json 결과) 지정 시에만 실행")
+def test_quick_core_against_recorded_baseline():
+    """기록된 기준 결과와 같은 quick 규모로 core를 다시 측정해 회귀 검사 (BENCHMARK_MAX_REGRESSION, 기본 0.25)"""
+    with open(os.environ["BENCHMARK_BASELINE"], 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    assert baseline.get("scale") == "quick", "기준 결과는 --scale quick으로 기록해야 함"
+    current = _flatten({"core": bench_core(**SCALES["quick"]["core"])})
+    max_regression = float(os.environ.get("BENCHMARK_MAX_REGRESSION", "0.25"))
+    assert compare_with_baseline(current, baseline["metrics"], max_regression) == []
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from bitcoin_utxo import (Blockchain, Transaction, TransactionInput, TransactionOutput, Wallet,
+                          BLOCK_REWARD, BLOCK_VERSION, block_header, merkle_root)
+from chain_verifier import ChainVerifier
+
+
+def _coinbase(index: int, address: str, amount: float = BLOCK_REWARD) -> Transaction:
+    tx = Transaction(inputs=[], outputs=[TransactionOutput(amount=amount, address=address)])
+    tx.tx_id = f"coinbase_{index}"
+    return tx
+
+
+def _payment(wallet: Wallet, prev_tx_id: str, output_index: int, amount: float, address: str) -> Transaction:
+    tx = Transaction([TransactionInput(prev_tx_id, output_index, "", wallet.get_public_key_hex())],
+                     [TransactionOutput(amount=amount, address=address)])
+    tx.sign_inputs(signing_key=wallet.signing_key)
+    return tx
+
+
+def _block(blockchain: Blockchain, transactions) -> dict:
+    """체인 끝에 붙일 작업 증명까지 맞는 블록 (트랜잭션 검증 없이 조립)"""
+    previous = blockchain.chain[-1]
+    index = len(blockchain.chain) + 1
+    tx_dicts = [tx.to_dict() for tx in transactions]
+    previous_hash = blockchain._hash(previous)
+    root = merkle_root(tx_dicts)
+    proof = blockchain._proof_of_work(previous["proof"], index, block_header(BLOCK_VERSION, previous_hash, root))
+    return blockchain._create_block(json.dumps({"transactions": tx_dicts}), proof, previous_hash, index,
+                                    merkle_root_hash=root)
+
+
+def _verdicts(chain):
+    """(Blockchain.is_chain_valid, ChainVerifier) 판정"""
+    verifier = ChainVerifier(workers=1)
+    try:
+        return Blockchain().is_chain_valid(chain, check_transactions=True), verifier.verify(chain) is None
+    finally:
+        verifier.shutdown()
+
+
+@pytest.fixture
+def funded():
+    """블록 2의 코인베이스를 가진 지갑과 체인"""
+    blockchain = Blockchain()
+    wallet = Wallet()
+    blockchain.mine_block(wallet.get_address())
+    return blockchain, wallet
+
+
+def test_mined_chain_is_valid(funded):
+    blockchain, wallet = funded
+    tx = blockchain.create_transaction(wallet.get_address(), Wallet().get_address(), 3.0, wallet)
+    assert blockchain.add_transaction(tx)
+    blockchain.mine_block(wallet.get_address())
+    assert _verdicts(blockchain.chain) == (True, True)
+
+
+def test_block_spending_its_own_coinbase_is_rejected(funded):
+    blockchain, wallet = funded
+    # 코인베이스는 블록 마지막이므로 앞선 송금이 그 출력을 쓰면 블록 안에서 코인이 생겨남
+    payment = _payment(wallet, "coinbase_3", 0, BLOCK_REWARD, Wallet().get_address())
+    chain = blockchain.chain + [_block(blockchain, [payment, _coinbase(3, wallet.get_address())])]
+    assert _verdicts(chain) == (False, False)
+
+    # 코인베이스를 앞에 두어 순서상 먼저 만들어도 같은 블록 안에서는 사용할 수 없음
+    chain = blockchain.chain + [_block(blockchain, [_coinbase(3, wallet.get_address()), payment])]
+    assert _verdicts(chain) == (False, False)
+
+
+def test_block_spending_later_output_is_rejected(funded):
+    blockchain, wallet = funded
+    receiver = Wallet()
+    parent = _payment(wallet, "coinbase_2", 0, BLOCK_REWARD, receiver.get_address())
+    child = _payment(receiver, parent.tx_id, 0, BLOCK_REWARD, wallet.get_address())
+    coinbase = _coinbase(3, wallet.get_address())
+
+    assert _verdicts(blockchain.chain + [_block(blockchain, [parent, child, coinbase])]) == (True, True)
+    assert _verdicts(blockchain.chain + [_block(blockchain, [child, parent, coinbase])]) == (False, False)
+    assert blockchain.validate_block_transactions([child, parent]) is not None
+
+
+@pytest.mark.parametrize("case", ["missing_coinbase", "two_coinbases", "reward_exceeded",
+                                  "wrong_coinbase_id", "tx_id_mismatch"])
+def test_validators_agree_on_block_rules(funded, case):
+    blockchain, wallet = funded
+    address = wallet.get_address()
+    payment = _payment(wallet, "coinbase_2", 0, 1.0, Wallet().get_address())
+    transactions = {
+        "missing_coinbase": [payment],
+        "two_coinbases": [payment, _coinbase(3, address, 5.0), _coinbase(3, address, 5.0)],
+        "reward_exceeded": [payment, _coinbase(3, address, BLOCK_REWARD + 0.1)],
+        "wrong_coinbase_id": [payment, _coinbase(4, address)],
+        "tx_id_mismatch": [payment, _coinbase(3, address)],
+    }[case]
+    if case == "tx_id_mismatch":
+        payment.tx_id = "ab" * 32  # 서명은 그대로 유효하지만 tx_id가 내용과 다름
+    chain = blockchain.chain + [_block(blockchain, transactions)]
+    assert _verdicts(chain) == (False, False)
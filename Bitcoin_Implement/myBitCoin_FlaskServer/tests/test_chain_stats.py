@@ -0,0 +1,52 @@
+import pytest
+
+from bitcoin_utxo import Blockchain, Wallet, BLOCK_REWARD
+from sqlite_store import SQLiteStore
+
+
+def _build_chain(blockchain: Blockchain, rounds: int = 3):
+    """채굴 보상과 송금이 섞인 블록 몇 개 (송금/거스름돈으로 UTXO와 주소가 생기고 사라짐)"""
+    wallets = [Wallet() for _ in range(3)]
+    for wallet in wallets:
+        blockchain.mine_block(wallet.get_address())
+    for round_number in range(rounds):
+        for source, target in zip(wallets, wallets[1:] + wallets[:1]):
+            tx = blockchain.create_transaction(source.get_address(), target.get_address(),
+                                               1.25 + round_number, source)
+            assert tx is not None and blockchain.add_transaction(tx)
+        blockchain.mine_block(wallets[round_number % len(wallets)].get_address())
+    return wallets
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def blockchain(request, tmp_path):
+    store = SQLiteStore(str(tmp_path / "chain.db")) if request.param == "sqlite" else None
+    return Blockchain(store=store)
+
+
+def test_incremental_stats_match_recomputed(blockchain):
+    _build_chain(blockchain)
+    assert blockchain.check_chain_stats()
+
+    stats = blockchain.chain_stats()
+    assert stats == pytest.approx(blockchain.recompute_chain_stats())
+    assert stats["height"] == 7
+    assert stats["total_supply"] == pytest.approx(BLOCK_REWARD * 6)
+    assert stats["total_transactions"] == 6 + 9
+    assert blockchain.utxo_pool.check_index()
+
+
+def test_stats_include_pending_transactions(blockchain):
+    wallets = _build_chain(blockchain, rounds=1)
+    tx = blockchain.create_transaction(wallets[0].get_address(), wallets[1].get_address(), 0.5, wallets[0])
+    assert blockchain.add_transaction(tx)
+    assert blockchain.chain_stats()["pending_transactions"] == 1
+    assert blockchain.check_chain_stats()
+
+
+def test_sqlite_stats_survive_reopen(tmp_path):
+    path = str(tmp_path / "chain.db")
+    _build_chain(Blockchain(store=SQLiteStore(path)), rounds=2)
+    reopened = Blockchain(store=SQLiteStore(path))
+    assert reopened.check_chain_stats()
+    assert reopened.utxo_pool.check_index()
@@ -0,0 +1,30 @@
+import random
+
+from bitcoin_utxo import (BNB_MAX_TRIES, COIN_SELECTION_STRATEGIES, DEFAULT_COIN_SELECTION, UTXO,
+                          _to_satoshi, select_branch_and_bound, select_largest_first)
+
+
+def _utxos(amounts):
+    return [UTXO(tx_id=f"tx{i}", output_index=0, amount=amount, address="a")
+            for i, amount in enumerate(amounts)]
+
+
+def test_default_strategy_is_largest_first():
+    """요청 경로 기본값은 탐색 없는 largest-first"""
+    assert COIN_SELECTION_STRATEGIES[DEFAULT_COIN_SELECTION] is select_largest_first
+
+
+def test_branch_and_bound_finds_exact_match():
+    """branch_and_bound를 지정하면 거스름돈 없는 조합을 찾는다"""
+    selected = select_branch_and_bound(_utxos([5.0, 3.0, 2.0, 0.7]), 5.7)
+    assert sum(_to_satoshi(utxo.amount) for utxo in selected) == _to_satoshi(5.7)
+
+
+def test_branch_and_bound_falls_back_when_search_limit_reached():
+    """정확한 조합이 없으면 탐색 상한 안에서 멈추고 largest-first 결과를 쓴다"""
+    rng = random.Random(0)
+    # 모두 짝수 사토시라 홀수 목표는 정확히 맞출 수 없음
+    utxos = _utxos([rng.randrange(1, 10 ** 6) * 2 / 10 ** 8 for _ in range(200)])
+    amount = (sum(_to_satoshi(utxo.amount) for utxo in utxos) // 2 | 1) / 10 ** 8
+    assert BNB_MAX_TRIES <= 10000
+    assert select_branch_and_bound(utxos, amount) == select_largest_first(utxos, amount)
@@ -0,0 +1,96 @@
+import random
+import threading
+import time
+
+from bitcoin_utxo import Blockchain, Wallet, BLOCK_REWARD
+
+
+def _run_concurrently(blockchain: Blockchain, wallets, duration: float, readers: int = 3, senders: int = 2,
+                      seed: int = 42) -> dict:
+    """채굴 1개 + 송금/조회 스레드를 duration초 동안 돌리고 (횟수, 스레드 오류) 반환
+
+    조회 스레드는 같은 시점의 잔액/UTXO 목록이 서로 맞는지, 블록의 트랜잭션이 tx_id 인덱스에 있는지 확인한다.
+    """
+    stop = threading.Event()
+    errors = []
+    counts = {"reads": 0, "sends": 0, "blocks": 0}
+
+    def guarded(fn):
+        def run(*args):
+            try:
+                fn(*args)
+            except Exception as e:
+                errors.append(f"{fn.__name__}: {type(e).__name__}: {e}")
+                stop.set()
+        return run
+
+    @guarded
+    def miner():
+        rng = random.Random(seed)
+        while not stop.is_set():
+            blockchain.mine_block(rng.choice(wallets).get_address())
+            counts["blocks"] += 1
+
+    @guarded
+    def sender(n):
+        rng = random.Random(seed + n)
+        while not stop.is_set():
+            source, target = rng.sample(wallets, 2)
+            tx = blockchain.create_transaction(source.get_address(), target.get_address(),
+                                               round(rng.uniform(0.1, 5), 2), source)
+            if tx is not None and blockchain.add_transaction(tx):
+                counts["sends"] += 1
+            else:
+                time.sleep(0.05)
+
+    @guarded
+    def reader(n):
+        rng = random.Random(seed + 100 + n)
+        while not stop.is_set():
+            address = rng.choice(wallets).get_address()
+            balance, utxos = blockchain.get_address_snapshot(address)
+            assert abs(balance - sum(utxo.amount for utxo in utxos)) < 1e-6, "잔액과 UTXO 합계 불일치"
+            for tx in blockchain.pending_transactions[:5]:
+                blockchain.get_pending_transaction(tx.tx_id)
+            snapshot = blockchain.read_snapshot()
+            block = blockchain.get_block(rng.randint(1, snapshot["height"]))
+            for tx in blockchain.get_block_transactions(block)[:3]:
+                assert blockchain.find_transaction(tx["tx_id"]) is not None, "tx_id 인덱스 누락"
+            counts["reads"] += 1
+
+    threads = [threading.Thread(target=miner)]
+    threads += [threading.Thread(target=sender, args=(i,)) for i in range(senders)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return dict(counts, errors=errors)
+
+
+def test_reads_stay_consistent_while_mining_and_sending():
+    blockchain = Blockchain()
+    wallets = [Wallet() for _ in range(4)]
+    for wallet in wallets:
+        blockchain.mine_block(wallet.get_address())
+
+    result = _run_concurrently(blockchain, wallets, duration=2.0)
+    assert not result["errors"], "\n".join(result["errors"])
+    assert result["blocks"] > 0 and result["sends"] > 0 and result["reads"] > 0
+
+    # 수수료가 없으므로 UTXO 합계 = 블록당 코인베이스 * 블록 수
+    total_supply = sum(utxo.amount for utxo in blockchain.utxo_pool.utxos.values())
+    assert abs(total_supply - BLOCK_REWARD * (len(blockchain.chain) - 1)) < 1e-6
+    assert blockchain.utxo_pool.check_index()
+    assert blockchain.check_chain_stats()
+    assert blockchain.is_chain_valid(check_transactions=True)
+
+    rebuilt = Blockchain()
+    rebuilt.chain = list(blockchain.chain)
+    rebuilt.rebuild_utxo_pool()
+    assert rebuilt.utxo_pool.utxos == blockchain.utxo_pool.utxos
+    for tx in blockchain.pending_transactions:
+        for inp in tx.inputs:
+            assert blockchain._lookup_utxo(inp.prev_tx_id, inp.output_index) is not None
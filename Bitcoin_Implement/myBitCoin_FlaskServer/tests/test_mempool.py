@@ -0,0 +1,76 @@
+import pytest
+
+from bitcoin_utxo import Blockchain, Transaction, TransactionInput, TransactionOutput, Wallet, MAX_MEMPOOL_ANCESTORS
+from sqlite_store import SQLiteStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def blockchain(request, tmp_path):
+    store = SQLiteStore(str(tmp_path / "chain.db")) if request.param == "sqlite" else None
+    return Blockchain(store=store)
+
+
+def test_back_to_back_sends_spend_pending_change(blockchain):
+    alice, bob, carol = Wallet(), Wallet(), Wallet()
+    blockchain.mine_block(alice.get_address())  # 코인베이스 하나 (10)
+
+    first = blockchain.create_transaction(alice.get_address(), bob.get_address(), 3.0, alice)
+    assert blockchain.add_transaction(first)
+    # 확정된 UTXO는 첫 송금이 사용 중이므로 미확정 거스름돈(7)에서 보냄
+    second = blockchain.create_transaction(alice.get_address(), carol.get_address(), 4.0, alice)
+    assert second is not None
+    assert {inp.prev_tx_id for inp in second.inputs} == {first.tx_id}
+    assert blockchain.add_transaction(second)
+    assert blockchain.mempool.get_outputs_by_address(alice.get_address())[0].amount == 3.0
+
+    blockchain.mine_block(bob.get_address())
+    assert len(blockchain.mempool) == 0
+    assert blockchain.get_balance(alice.get_address()) == 3.0
+    assert blockchain.get_balance(bob.get_address()) == 13.0
+    assert blockchain.get_balance(carol.get_address()) == 4.0
+    assert blockchain.is_chain_valid(check_transactions=True)
+
+
+def test_pending_change_is_not_spent_twice(blockchain):
+    alice, bob = Wallet(), Wallet()
+    blockchain.mine_block(alice.get_address())
+    assert blockchain.add_transaction(blockchain.create_transaction(alice.get_address(), bob.get_address(), 3.0, alice))
+    second = blockchain.create_transaction(alice.get_address(), bob.get_address(), 4.0, alice)
+    conflicting = blockchain.create_transaction(alice.get_address(), bob.get_address(), 5.0, alice)
+    assert blockchain.add_transaction(second)
+    assert not blockchain.add_transaction(conflicting)
+    # 남은 미확정 거스름돈(3)보다 많이 보낼 수 없음
+    assert blockchain.create_transaction(alice.get_address(), bob.get_address(), 3.5, alice) is None
+
+
+def test_removing_parent_drops_pending_change(blockchain):
+    alice, bob = Wallet(), Wallet()
+    blockchain.mine_block(alice.get_address())
+    first = blockchain.create_transaction(alice.get_address(), bob.get_address(), 3.0, alice)
+    assert blockchain.add_transaction(first)
+    assert blockchain.add_transaction(blockchain.create_transaction(alice.get_address(), bob.get_address(), 1.0, alice))
+
+    assert len(blockchain.mempool.remove(first.tx_id)) == 2
+    assert blockchain.mempool.get_outputs_by_address(alice.get_address()) == []
+    assert blockchain.mempool.by_address == {}
+
+
+def test_unconfirmed_chain_length_is_limited():
+    blockchain = Blockchain()
+    alice, bob = Wallet(), Wallet()
+    blockchain.mine_block(alice.get_address())
+    for _ in range(MAX_MEMPOOL_ANCESTORS):
+        assert blockchain.add_transaction(blockchain.create_transaction(alice.get_address(), bob.get_address(),
+                                                                        0.1, alice))
+    # 조상 사슬이 한도에 닿은 거스름돈은 코인 선택에서 제외
+    assert blockchain.create_transaction(alice.get_address(), bob.get_address(), 0.1, alice) is None
+    assert len(blockchain.mempool) == MAX_MEMPOOL_ANCESTORS
+    # 직접 만든 트랜잭션도 add_transaction에서 같은 한도로 거부
+    change = blockchain.mempool.get_outputs_by_address(alice.get_address())[0]
+    tx = Transaction([TransactionInput(change.tx_id, change.output_index, "", alice.get_public_key_hex())],
+                     [TransactionOutput(change.amount, bob.get_address())])
+    tx.sign_inputs(signing_key=alice.signing_key)
+    assert not blockchain.add_transaction(tx)
+    blockchain.mine_block(bob.get_address())
+    assert blockchain.is_chain_valid(check_transactions=True)
+    assert blockchain.get_balance(bob.get_address()) == pytest.approx(10.0 + 0.1 * MAX_MEMPOOL_ANCESTORS)
@@ -0,0 +1,54 @@
+import copy
+import json
+
+import pytest
+
+from bitcoin_utxo import Blockchain, Wallet, BLOCK_REWARD, BLOCK_VERSION, block_header, merkle_root
+from test_client import verify_transaction_proof
+
+
+@pytest.fixture
+def mined():
+    """송금 하나와 코인베이스가 담긴 블록 3까지 채굴한 체인"""
+    blockchain = Blockchain()
+    wallet = Wallet()
+    blockchain.mine_block(wallet.get_address())
+    tx = blockchain.create_transaction(wallet.get_address(), Wallet().get_address(), 1.5, wallet)
+    assert blockchain.add_transaction(tx)
+    blockchain.mine_block(wallet.get_address())
+    return blockchain, tx.tx_id
+
+
+def test_proof_verifies_for_requested_transaction(mined):
+    blockchain, tx_id = mined
+    assert verify_transaction_proof(blockchain.get_transaction_proof(tx_id), tx_id)
+    assert verify_transaction_proof(blockchain.get_transaction_proof("coinbase_3"), "coinbase_3")
+
+
+def test_proof_for_another_transaction_is_rejected(mined):
+    blockchain, tx_id = mined
+    # 같은 블록의 코인베이스에 대한 유효한 증명을 송금 증명으로 돌려주는 서버
+    other = blockchain.get_transaction_proof("coinbase_3")
+    assert verify_transaction_proof(other)
+    assert not verify_transaction_proof(other, tx_id)
+
+
+def test_forged_transaction_contents_are_rejected(mined):
+    blockchain, tx_id = mined
+    forged = copy.deepcopy(blockchain.get_transaction_proof(tx_id)["transaction"])
+    forged["outputs"][0]["amount"] = 1000.0
+    # 요청한 tx_id를 붙인 다른 내용의 트랜잭션으로 머클 루트/작업 증명까지 맞춘 블록을 내놓는 서버
+    previous = blockchain.chain[-1]
+    index = len(blockchain.chain) + 1
+    coinbase = {"tx_id": f"coinbase_{index}", "inputs": [],
+                "outputs": [{"amount": BLOCK_REWARD, "address": forged["outputs"][0]["address"]}]}
+    tx_dicts = [forged, coinbase]
+    previous_hash = blockchain._hash(previous)
+    root = merkle_root(tx_dicts)
+    proof = blockchain._proof_of_work(previous["proof"], index, block_header(BLOCK_VERSION, previous_hash, root))
+    blockchain.replay_block(blockchain._create_block(json.dumps({"transactions": tx_dicts}), proof,
+                                                     previous_hash, index, merkle_root_hash=root))
+
+    proof_data = blockchain.get_transaction_proof(tx_id)
+    assert proof_data["transaction"]["outputs"][0]["amount"] == 1000.0
+    assert not verify_transaction_proof(proof_data, tx_id)
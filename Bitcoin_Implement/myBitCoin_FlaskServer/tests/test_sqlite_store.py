@@ -0,0 +1,78 @@
+import pytest
+
+from bitcoin_utxo import Blockchain, UTXO, Wallet
+from sqlite_store import SQLiteStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "chain.db")
+
+
+def test_balances_table_tracks_utxo_changes(path):
+    store = SQLiteStore(path)
+    pool = store.utxo_pool
+    with store.write_lock:
+        pool.add_utxo(UTXO("a" * 64, 0, 0.1, "1Alice"))
+        pool.add_utxo(UTXO("a" * 64, 1, 0.2, "1Alice"))
+        pool.add_utxo(UTXO("b" * 64, 0, 5.0, "1Bob"))
+        pool.add_utxo(UTXO("b" * 64, 0, 4.0, "1Bob"))  # 같은 outpoint 덮어쓰기
+    assert pool.get_balance("1Alice") == 0.3  # 사토시 정수 합계라 0.1 + 0.2 오차 없음
+    assert pool.get_balance("1Bob") == 4.0
+    assert pool.stats()["address_count"] == 2
+
+    with store.write_lock:
+        pool.remove_utxo("b" * 64, 0)
+        pool.remove_utxo("a" * 64, 0)
+    assert pool.get_balance("1Bob") == 0 and pool.get_balance("1Alice") == 0.2
+    assert store.query_all("SELECT address, satoshi, utxo_count FROM balances") == [("1Alice", 20000000, 1)]
+    assert pool.stats()["address_count"] == 1
+    assert pool.check_index()
+
+
+def test_balances_match_memory_pool_after_mining(path):
+    memory, stored = Blockchain(), Blockchain(store=SQLiteStore(path))
+    alice, bob = Wallet(), Wallet()
+    for blockchain in (memory, stored):
+        blockchain.mine_block(alice.get_address())
+        for amount in (1.1, 2.2, 0.3):
+            assert blockchain.add_transaction(blockchain.create_transaction(alice.get_address(), bob.get_address(),
+                                                                            amount, alice))
+        blockchain.mine_block(bob.get_address())
+    for address in (alice.get_address(), bob.get_address()):
+        assert stored.get_balance(address) == pytest.approx(memory.get_balance(address))
+    assert stored.utxo_pool.check_index()
+
+
+def test_balances_rebuilt_for_old_database(path):
+    blockchain = Blockchain(store=SQLiteStore(path))
+    wallet = Wallet()
+    blockchain.mine_block(wallet.get_address())
+    store = blockchain.store
+    store.execute("DELETE FROM balances")  # 잔액 테이블이 없던 이전 데이터베이스
+    assert not store.utxo_pool.check_index()
+
+    reopened = SQLiteStore(path)
+    assert reopened.utxo_pool.get_balance(wallet.get_address()) == 10.0
+    assert reopened.utxo_pool.check_index()
+
+
+def test_readers_do_not_replace_mempool_of_other_worker(path):
+    """다른 워커가 바꾼 대기 풀은 읽기용 사본으로 보고, self.mempool은 쓰기 잠금 안에서만 교체"""
+    writer, reader = Blockchain(store=SQLiteStore(path)), Blockchain(store=SQLiteStore(path))
+    alice, bob = Wallet(), Wallet()
+    writer.mine_block(alice.get_address())
+    tx = writer.create_transaction(alice.get_address(), bob.get_address(), 1.0, alice)
+    conflicting = writer.create_transaction(alice.get_address(), bob.get_address(), 2.0, alice)
+    assert writer.add_transaction(tx)
+
+    original = reader.mempool
+    assert [pending.tx_id for pending in reader.pending_transactions] == [tx.tx_id]
+    assert reader.get_pending_transaction(tx.tx_id) is not None
+    assert reader.chain_stats()["pending_transactions"] == 1
+    assert reader.read_snapshot()["pending_transactions"] == 1
+    assert reader.mempool is original and len(original) == 0
+
+    # 쓰기 경로는 잠금 안에서 최신 대기 풀로 교체한 뒤 이중 지불을 확인
+    assert not reader.add_transaction(conflicting)
+    assert reader.mempool is not original and tx.tx_id in reader.mempool
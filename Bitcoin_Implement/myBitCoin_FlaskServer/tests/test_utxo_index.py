@@ -0,0 +1,65 @@
+import random
+
+from bitcoin_utxo import Blockchain, Transaction, TransactionInput, TransactionOutput, UTXO, UTXOPool, Wallet
+
+
+def _scan(pool: UTXOPool, address: str):
+    """인덱스 없이 전체 UTXO를 훑은 (잔액, outpoint 집합)"""
+    utxos = [utxo for utxo in pool.utxos.values() if utxo.address == address]
+    return sum(utxo.amount for utxo in utxos), {(utxo.tx_id, utxo.output_index) for utxo in utxos}
+
+
+def test_index_consistent_through_update_utxo_pool():
+    """합성 트랜잭션으로 UTXO를 만들고 일부를 소비해도 주소 인덱스/잔액이 전체 스캔과 같음"""
+    rng = random.Random(7)
+    blockchain = Blockchain()
+    addresses = [f"1Address{i}" for i in range(200)]
+    transactions = []
+    for i in range(0, 20000, 10):
+        tx = Transaction(inputs=[], outputs=[TransactionOutput(float(rng.randint(1, 100)), rng.choice(addresses))
+                                             for _ in range(10)])
+        tx.tx_id = f"synthetic_{i}"
+        transactions.append(tx)
+    blockchain._update_utxo_pool(transactions)
+
+    pool = blockchain.utxo_pool
+    spent = rng.sample(list(pool.utxos), len(pool.utxos) * 3 // 10)
+    transactions = []
+    for i in range(0, len(spent), 5):
+        inputs = [TransactionInput(key.rsplit(":", 1)[0], int(key.rsplit(":", 1)[1]), "", "") for key in spent[i:i + 5]]
+        total = sum(pool.utxos[key].amount for key in spent[i:i + 5])
+        transactions.append(Transaction(inputs, [TransactionOutput(total, rng.choice(addresses))]))
+    blockchain._update_utxo_pool(transactions)
+
+    assert len(pool) == 20000 - len(spent) + len(transactions)
+    assert pool.check_index()
+    for address in addresses:
+        balance, outpoints = _scan(pool, address)
+        assert abs(blockchain.get_balance(address) - balance) < 1e-6
+        assert {(utxo.tx_id, utxo.output_index) for utxo in pool.get_utxos_by_address(address)} == outpoints
+    assert sum(pool.get_balance(address) for address in addresses) == \
+        sum(utxo.amount for utxo in pool.utxos.values())
+
+
+def test_index_drops_empty_addresses_and_overwrites():
+    pool = UTXOPool()
+    pool.add_utxo(UTXO("a" * 64, 0, 1.5, "1Alice"))
+    pool.add_utxo(UTXO("a" * 64, 0, 2.5, "1Bob"))  # 같은 outpoint 덮어쓰기
+    assert pool.get_balance("1Alice") == 0 and pool.get_utxos_by_address("1Alice") == []
+    assert pool.get_balance("1Bob") == 2.5
+    pool.remove_utxo("a" * 64, 0)
+    assert pool.address_index == {} and pool.balances == {}
+    assert pool.check_index()
+
+
+def test_index_consistent_after_mining_and_sends():
+    blockchain = Blockchain()
+    alice, bob = Wallet(), Wallet()
+    blockchain.mine_block(alice.get_address())
+    tx = blockchain.create_transaction(alice.get_address(), bob.get_address(), 3.0, alice)
+    assert blockchain.add_transaction(tx)
+    blockchain.mine_block(bob.get_address())
+
+    assert blockchain.utxo_pool.check_index()
+    assert blockchain.get_balance(alice.get_address()) == 7.0
+    assert blockchain.get_balance(bob.get_address()) == 13.0